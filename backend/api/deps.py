@@ -1,5 +1,6 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import math
+from typing import Generator, Hashable, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
@@ -8,10 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core import security
 from core.config import settings
+from core.rate_limit import RateLimiter, login_ip_limiter
 from db.session import get_db
 from models.user import User
 from schemas import TokenPayload
-from sqlalchemy import select
+from services import user_cache
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -21,19 +23,22 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db),
     token: str = Depends(reusable_oauth2)
 ) -> User:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
+    subject = user_cache.get_token_subject(token)
+    if subject is None:
+        try:
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+            )
+            token_data = TokenPayload(**payload)
+        except (jwt.JWTError, ValidationError):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        subject = token_data.sub
+        user_cache.remember_token(token, subject, payload.get("exp"))
     
-    result = await db.execute(select(User).where(User.id == int(token_data.sub)))
-    user = result.scalars().first()
+    user = await user_cache.get_user(db, int(subject))
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -45,3 +50,34 @@ async def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+async def get_current_active_user_from_db(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    """
+    The current user re-read from the database, for endpoints that read or
+    change credentials: the cached user has no password hash and may be up
+    to USER_CACHE_TTL_SECONDS old.
+    """
+    user = await user_cache.load_user(db, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+def check_rate_limit(limiter: RateLimiter, key: Hashable, consume: bool = True) -> None:
+    allowed, retry_after = limiter.hit(key) if consume else limiter.peek(key)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+def login_rate_limit(request: Request) -> None:
+    """
+    Per-IP limit for endpoints that hash passwords (login, signup).
+    """
+    check_rate_limit(login_ip_limiter, request.client.host if request.client else "unknown")
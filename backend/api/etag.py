@@ -0,0 +1,30 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak ETag from a row's version columns (id, updated_at, ...), so it can be
+    computed without loading the heavy columns.
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(",")}
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
@@ -0,0 +1,70 @@
+"""
+ASGI middleware recording per-route request latency and unhandled errors,
+and the time from process start to the first request.
+
+Written as plain ASGI rather than BaseHTTPMiddleware, which wraps every
+response in extra tasks and queues. Routes are labelled by their template
+(/api/v1/jobs/{id}), never by the raw path, so label cardinality stays bounded.
+"""
+import time
+
+from core.metrics import http_request_seconds, record_error
+from services import startup
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's full path template. Rebuilt from the request path and
+    its path parameters, because an included router's route only knows its
+    own part of the path.
+    """
+    if scope.get("route") is None:
+        return "unmatched"
+    params = {str(value): name for name, value in (scope.get("path_params") or {}).items()}
+    if not params:
+        return scope["path"]
+    return "/".join(f"{{{params[segment]}}}" if segment in params else segment for segment in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            record_error("http", e)
+            raise
+        finally:
+            # Streamed responses count until their last byte
+            http_request_seconds.observe(time.perf_counter() - started, scope["method"], route_template(scope), status)
+
+
+class FirstRequestMiddleware:
+    """
+    Reports when the first HTTP request arrives, then only checks a flag.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.seen = False
+
+    async def __call__(self, scope, receive, send):
+        if not self.seen and scope["type"] == "http":
+            self.seen = True
+            startup.record_first_request()
+        await self.app(scope, receive, send)
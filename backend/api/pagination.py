@@ -0,0 +1,112 @@
+import base64
+import json
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import String, cast, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def _encode(payload: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(payload, dict):
+            raise ValueError(cursor)
+        return payload
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_cursor(row_id: int, created_at: Optional[str] = None) -> str:
+    """
+    `created_at` is the value as the database returns it cast to text, so it
+    compares exactly against the stored column (SQLite keeps timestamps as text).
+    """
+    return _encode({"id": row_id, "created_at": created_at})
+
+
+def decode_cursor(cursor: str, key: str = "id") -> int:
+    try:
+        return int(_decode(cursor)[key])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """
+    Cursor for result sets ordered by relevance, which have no stable key to page on.
+    """
+    return _encode({"offset": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    return decode_cursor(cursor, key="offset")
+
+
+def _created_at_value(db: AsyncSession, model: Any, created_at: str):
+    if db.bind.dialect.name == "sqlite":
+        return literal(created_at, String)
+    return cast(literal(created_at, String), model.created_at.type)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    include_total: bool = False,
+) -> List[Any]:
+    """
+    Keyset pagination, newest first, on (created_at, id) within the filters
+    already applied to `query`. The position is a row-value comparison,
+    (created_at, id) < (:created_at, :id), which the (user_id, created_at, id)
+    indexes seek to directly, so every page costs the same however deep it
+    is. The next page's cursor, carrying the last row's created_at and id,
+    is returned in the X-Next-Cursor header (absent on the last page). With
+    include_total, the first page also gets an X-Total-Count header.
+
+    Cursors without created_at (issued before it was added) are resolved by
+    looking the row up once; if it was deleted, paging carries on by id.
+    """
+    if include_total and cursor is None:
+        count_query = query.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+        response.headers[TOTAL_COUNT_HEADER] = str(await db.scalar(count_query))
+
+    if cursor is not None:
+        position = _decode(cursor)
+        last_id = decode_cursor(cursor)
+        created_at = position.get("created_at")
+        if created_at is None:
+            created_at = await db.scalar(select(cast(model.created_at, String)).where(model.id == last_id))
+        if created_at is None:
+            query = query.where(model.id < last_id)
+        else:
+            query = query.where(
+                tuple_(model.created_at, model.id) < tuple_(_created_at_value(db, model, created_at), last_id)
+            )
+    elif skip:
+        # Deprecated offset paging, kept for existing clients
+        query = query.offset(skip)
+
+    query = (
+        query.add_columns(cast(model.created_at, String).label("cursor_created_at"))
+        .order_by(model.created_at.desc(), model.id.desc())
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1][0].id, rows[-1][1])
+    return [row[0] for row in rows]
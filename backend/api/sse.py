@@ -0,0 +1,28 @@
+import json
+from typing import Any, AsyncIterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+
+def format_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def event_stream(events: AsyncIterator[Tuple[str, Any]]) -> StreamingResponse:
+    """
+    Serve (event, data) pairs as Server-Sent Events. Failures after the
+    stream has started are reported as a final "error" event.
+    """
+    async def body():
+        try:
+            async for event, data in events:
+                yield format_event(event, data)
+        except Exception as e:
+            print(f"Error while streaming: {e}")
+            yield format_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
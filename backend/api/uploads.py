@@ -0,0 +1,130 @@
+"""
+Streaming multipart file uploads.
+
+With UploadFile, Starlette reads the whole request into a temporary file
+before the endpoint runs, and storage then copies it again. open_upload()
+parses the body as it arrives from request.stream() instead, so the file
+part is hashed and written to storage in a single pass. Oversized requests
+are refused from Content-Length before any of the body is read, and
+otherwise as soon as more than the limit has arrived.
+"""
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+
+from core.config import settings
+
+# Room for the boundaries, part headers and small fields around the file
+FORM_OVERHEAD_BYTES = 16 * 1024
+
+# OpenAPI request body for endpoints that take one file field named "file"
+FILE_FORM_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File exceeds the {max_bytes} byte limit")
+
+
+class StreamedUpload:
+    """
+    One file field of a multipart request, read as the request body arrives.
+    """
+
+    def __init__(self, request: Request, boundary: bytes, field: str, max_bytes: int):
+        self.field = field
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self._max_body = max_bytes + FORM_OVERHEAD_BYTES
+        self._max_bytes = max_bytes
+        self._body = request.stream().__aiter__()
+        self._received = 0
+        self._events: Deque[Tuple[str, bytes]] = deque()
+        header: Dict[str, bytearray] = {"field": bytearray(), "value": bytearray()}
+
+        def on_header_end() -> None:
+            self._events.append(("header", bytes(header["field"]).lower() + b":" + bytes(header["value"])))
+            header["field"].clear()
+            header["value"].clear()
+
+        self._parser = MultipartParser(boundary, {
+            "on_header_field": lambda data, start, end: header["field"].extend(data[start:end]),
+            "on_header_value": lambda data, start, end: header["value"].extend(data[start:end]),
+            "on_header_end": on_header_end,
+            "on_headers_finished": lambda: self._events.append(("headers", b"")),
+            "on_part_data": lambda data, start, end: self._events.append(("data", bytes(data[start:end]))),
+            "on_part_end": lambda: self._events.append(("end", b"")),
+        })
+
+    async def _next_event(self) -> Tuple[str, bytes]:
+        while not self._events:
+            try:
+                chunk = await self._body.__anext__()
+            except StopAsyncIteration:
+                raise HTTPException(status_code=400, detail=f"Missing file field '{self.field}'")
+            self._received += len(chunk)
+            if self._received > self._max_body:
+                raise _too_large(self._max_bytes)
+            try:
+                if chunk:
+                    self._parser.write(chunk)
+                else:
+                    self._parser.finalize()
+            except MultipartParseError:
+                raise HTTPException(status_code=400, detail="Malformed multipart body")
+        return self._events.popleft()
+
+    async def open(self) -> "StreamedUpload":
+        """
+        Read up to the start of the file field's data.
+        """
+        headers: Dict[bytes, bytes] = {}
+        while True:
+            kind, data = await self._next_event()
+            if kind == "header":
+                name, _, value = data.partition(b":")
+                headers[name] = value.strip()
+            elif kind == "headers":
+                _, options = parse_options_header(headers.get(b"content-disposition", b""))
+                if options.get(b"name", b"").decode() == self.field and b"filename" in options:
+                    self.filename = options[b"filename"].decode("utf-8", "replace")
+                    content_type = headers.get(b"content-type")
+                    self.content_type = content_type.decode("latin-1") if content_type else None
+                    return self
+            elif kind == "end":
+                headers = {}  # Some other field; its data is skipped
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """
+        The file's content, in the pieces it arrived in.
+        """
+        while True:
+            kind, data = await self._next_event()
+            if kind == "end":
+                return
+            if kind == "data" and data:
+                yield data
+
+
+async def open_upload(request: Request, field: str = "file", max_bytes: int = settings.UPLOAD_MAX_BYTES) -> StreamedUpload:
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+    return await StreamedUpload(request, options[b"boundary"], field, max_bytes).open()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from api.v1.endpoints import login, users, resumes, jobs, interviews
+from api.v1.endpoints import login, users, resumes, jobs, interviews, search
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -8,3 +8,4 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(resumes.router, prefix="/resumes", tags=["resumes"])
 api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(interviews.router, prefix="/interviews", tags=["interviews"])
+api_router.include_router(search.router, tags=["search"])
@@ -1,8 +1,20 @@
-from typing import Any, List
-from fastapi import APIRouter, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
+from api import deps
+from api.pagination import paginate
+from api.sse import event_stream
+from db.session import get_db
+from models.interview import InterviewSession
+from models.job import Job
+from models.user import User
+from schemas import InterviewAnswers, InterviewSession as InterviewSessionSchema, InterviewSessionCreate, InterviewSessionSummary
 from services import ai_service
+from services.llm_client import LLMError
 
 router = APIRouter()
 
@@ -27,3 +39,199 @@ async def evaluate_answer(request: AnswerRequest) -> Any:
     Evaluate an interview answer
     """
     return await ai_service.evaluate_interview_answer(request.question, request.answer)
+
+@router.post("/evaluate/stream")
+async def evaluate_answer_stream(
+    request: AnswerRequest,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Evaluate an interview answer, streaming model output as Server-Sent Events
+    """
+    return event_stream(ai_service.stream_interview_evaluation(request.question, request.answer))
+
+
+SUMMARY_COLUMNS = (
+    InterviewSession.user_id, InterviewSession.job_id, InterviewSession.job_title, InterviewSession.status,
+    InterviewSession.overall_score, InterviewSession.created_at, InterviewSession.updated_at,
+)
+
+async def get_session(db: AsyncSession, id: int, user: User) -> InterviewSession:
+    result = await db.execute(
+        select(InterviewSession).where(InterviewSession.id == id, InterviewSession.user_id == user.id)
+    )
+    session = result.scalars().first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Interview session not found")
+    return session
+
+def apply_answers(session: InterviewSession, answers_in: InterviewAnswers) -> None:
+    """
+    Store answers by question index. A changed answer drops its evaluation.
+    """
+    answers = list(session.answers or [None] * len(session.questions))
+    evaluations = list(session.evaluations or [None] * len(session.questions))
+    for item in answers_in.answers:
+        if item.question_index >= len(session.questions):
+            raise HTTPException(status_code=422, detail=f"No question at index {item.question_index}")
+        answer = item.answer.strip() or None
+        if answer != answers[item.question_index]:
+            answers[item.question_index] = answer
+            evaluations[item.question_index] = None
+    session.answers = answers
+    session.evaluations = evaluations
+    if any(answer and evaluation is None for answer, evaluation in zip(answers, evaluations)):
+        session.status = "IN_PROGRESS"
+
+@router.post("/sessions", response_model=InterviewSessionSchema)
+async def create_session(
+    *,
+    db: AsyncSession = Depends(get_db),
+    session_in: InterviewSessionCreate,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Start a mock interview: generate questions for a role (or one of your tracked jobs) and save them.
+    """
+    job_title, job_description = session_in.job_title, session_in.job_description
+    if session_in.job_id is not None:
+        result = await db.execute(
+            select(Job.title, Job.description).where(Job.id == session_in.job_id, Job.user_id == current_user.id)
+        )
+        job = result.first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        job_title = job_title or job.title
+        job_description = job_description or job.description or ""
+    if not job_title:
+        raise HTTPException(status_code=422, detail="job_title or job_id is required")
+
+    questions = await ai_service.generate_interview_questions(job_title, job_description)
+    questions = [q["question"] if isinstance(q, dict) else q for q in questions]
+    session = InterviewSession(
+        user_id=current_user.id,
+        job_id=session_in.job_id,
+        job_title=job_title,
+        job_description=job_description,
+        questions=questions,
+        answers=[None] * len(questions),
+        evaluations=[None] * len(questions),
+        status="IN_PROGRESS",
+    )
+    db.add(session)
+    await db.commit()
+    await db.refresh(session)
+    return session
+
+@router.get("/sessions", response_model=List[InterviewSessionSummary])
+async def read_sessions(
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    include_total: bool = False,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve your interview sessions (without questions and answers), newest first.
+    """
+    query = (
+        select(InterviewSession)
+        .options(load_only(*SUMMARY_COLUMNS))
+        .where(InterviewSession.user_id == current_user.id)
+    )
+    return await paginate(
+        db, query, InterviewSession, response, cursor=cursor, skip=skip, limit=limit, include_total=include_total
+    )
+
+@router.get("/sessions/{id}", response_model=InterviewSessionSchema)
+async def read_session(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get an interview session with its questions, answers and evaluations.
+    """
+    return await get_session(db, id, current_user)
+
+@router.put("/sessions/{id}/answers", response_model=InterviewSessionSchema)
+async def save_answers(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    answers_in: InterviewAnswers,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Save answers without evaluating them.
+    """
+    session = await get_session(db, id, current_user)
+    apply_answers(session, answers_in)
+    await db.commit()
+    await db.refresh(session)
+    return session
+
+@router.post("/sessions/{id}/evaluate", response_model=InterviewSessionSchema)
+async def evaluate_session(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    answers_in: Optional[InterviewAnswers] = None,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Evaluate all answered questions at once (answers in the body are saved first).
+    Answers are scored in batched LLM calls; unchanged answers keep their evaluation.
+    If some answers could not be evaluated, the others are saved, the session
+    stays IN_PROGRESS and the response is a 502; calling again retries them.
+    """
+    session = await get_session(db, id, current_user)
+    if answers_in is not None:
+        apply_answers(session, answers_in)
+
+    answers = list(session.answers or [None] * len(session.questions))
+    evaluations = list(session.evaluations or [None] * len(session.questions))
+    pending = [i for i, answer in enumerate(answers) if answer and evaluations[i] is None]
+    if not pending and not any(answers):
+        raise HTTPException(status_code=422, detail="No answers to evaluate")
+
+    failed = 0
+    if pending:
+        try:
+            results = await ai_service.evaluate_interview_answers(
+                [(session.questions[i], answers[i]) for i in pending]
+            )
+        except LLMError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        for i, evaluation in zip(pending, results):
+            evaluations[i] = evaluation
+        failed = sum(1 for evaluation in results if evaluation is None)
+
+    scores = [e["score"] for e in evaluations if e]
+    session.evaluations = evaluations
+    session.overall_score = round(sum(scores) / len(scores)) if scores else None
+    if not failed:
+        session.status = "EVALUATED"
+    await db.commit()
+    if failed:
+        raise HTTPException(status_code=502, detail=f"Could not evaluate {failed} answer(s); try again")
+    await db.refresh(session)
+    return session
+
+@router.delete("/sessions/{id}", response_model=InterviewSessionSchema)
+async def delete_session(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete an interview session.
+    """
+    session = await get_session(db, id, current_user)
+    await db.delete(session)
+    await db.commit()
+    return session
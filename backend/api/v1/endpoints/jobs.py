@@ -1,28 +1,220 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
 from api import deps
+from api.etag import make_etag, not_modified, not_modified_response, set_etag
+from api.pagination import paginate
+from core.config import settings
 from db.session import get_db
 from models.job import Job
+from models.resume import Resume
 from models.user import User
-from schemas import Job as JobSchema, JobCreate, JobUpdate
+from schemas import Job as JobSchema, JobCreate, JobUpdate, JobImportResult, JobMatch, JobScore, JobStats, JobSummary
+from services import job_io, job_stats, job_terms
+from services.embedding_service import embed_missing_jobs, embed_texts
+from services.match_service import get_engine, resume_skills
+from services.vector_index import invalidate_job_index, search_jobs
 
 router = APIRouter()
 
-@router.get("/", response_model=List[JobSchema])
+SUMMARY_COLUMNS = (
+    Job.user_id, Job.title, Job.company, Job.location, Job.status,
+    Job.salary_range, Job.job_url, Job.created_at, Job.updated_at,
+)
+
+@router.get("/", response_model=List[JobSummary])
 async def read_jobs(
+    response: Response,
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    include_total: bool = False,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve job summaries (no description), newest first. Pass the X-Next-Cursor response header back
+    as `cursor` to get the next page.
+    """
+    query = (
+        select(Job)
+        .options(load_only(*SUMMARY_COLUMNS))
+        .where(Job.user_id == current_user.id)
+    )
+    if status:
+        query = query.where(Job.status == status)
+    if company:
+        query = query.where(Job.company == company)
+    return await paginate(db, query, Job, response, cursor=cursor, skip=skip, limit=limit, include_total=include_total)
+
+@router.get("/match", response_model=List[JobMatch])
+async def match_jobs(
+    *,
+    db: AsyncSession = Depends(get_db),
+    resume_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Rank the user's jobs by embedding similarity to a resume.
+    """
+    result = await db.execute(select(Resume).where(Resume.id == resume_id, Resume.user_id == current_user.id))
+    resume = result.scalars().first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if resume.embedding is None:
+        if not resume.raw_text:
+            raise HTTPException(status_code=409, detail="Resume has not been analyzed yet")
+        resume.embedding = (await embed_texts([resume.raw_text]))[0]
+        
+    if await embed_missing_jobs(db, current_user.id):
+        invalidate_job_index(current_user.id)
+    await db.commit()
+    
+    matches = await search_jobs(db, current_user.id, resume.embedding, limit)
+    return [{"job": job, "score": score} for job, score in matches]
+
+@router.get("/scores", response_model=List[JobScore])
+async def score_jobs(
+    *,
+    db: AsyncSession = Depends(get_db),
+    resume_id: List[int] = Query(...),
+    job_id: List[int] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Score resumes against jobs by skill overlap (local TF-IDF, no AI calls).
+    Pass one resume_id to rank all your jobs (or the given job_ids), or many
+    resume_ids with one job_id to rank resumes for a job. Returns the top
+    `limit` jobs per resume.
+    """
+    result = await db.execute(
+        select(Resume.id, Resume.parsed_content)
+        .where(Resume.id.in_(resume_id), Resume.user_id == current_user.id)
+    )
+    resumes = result.all()
+    if not resumes:
+        raise HTTPException(status_code=404, detail="Resume not found")
+        
+    if await job_terms.index_missing_jobs(db, current_user.id):
+        await db.commit()
+        
+    query = select(Job.id, Job.skill_terms).where(Job.user_id == current_user.id)
+    if job_id:
+        query = query.where(Job.id.in_(job_id))
+    jobs = (await db.execute(query)).all()
+    if not jobs:
+        return []
+        
+    engine = get_engine()
+    idf = await job_terms.load_idf(db, current_user.id, engine)
+    skills = [resume_skills(r.parsed_content) for r in resumes]
+    scores = engine.score(skills, [job.skill_terms for job in jobs], idf)
+    
+    results = []
+    for row, resume in enumerate(resumes):
+        for col in scores[row].argsort()[::-1][:limit]:
+            matched, missing = engine.explain(skills[row], jobs[col].skill_terms)
+            results.append({
+                "resume_id": resume.id,
+                "job_id": jobs[col].id,
+                "score": round(float(scores[row, col]), 4),
+                "matched_skills": matched,
+                "missing_skills": missing,
+            })
+    return results
+
+@router.post("/bulk", response_model=JobImportResult)
+async def bulk_import_jobs(
+    *,
+    db: AsyncSession = Depends(get_db),
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Retrieve jobs.
+    Import many jobs from a CSV (with a header row of JobCreate fields) or
+    NDJSON request body. The format defaults from Content-Type. Valid rows
+    are inserted in one transaction; invalid ones are reported by row number.
     """
-    result = await db.execute(select(Job).where(Job.user_id == current_user.id).offset(skip).limit(limit))
-    return result.scalars().all()
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > settings.JOB_IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Imports are limited to {settings.JOB_IMPORT_MAX_BYTES} bytes")
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import must be UTF-8 encoded")
+        
+    fmt = format or job_io.detect_format(request.headers.get("content-type"))
+    try:
+        result = await job_io.import_jobs(db, current_user.id, text, fmt)
+    except job_io.ImportTooLargeError as e:
+        await db.rollback()
+        raise HTTPException(status_code=413, detail=str(e))
+    await db.commit()
+    return result
+
+@router.get("/export")
+async def export_jobs(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Download all jobs as CSV or NDJSON, streamed as rows are read.
+    """
+    return StreamingResponse(
+        job_io.export_jobs(current_user.id, format),
+        media_type=job_io.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{format}"'},
+    )
+
+@router.get("/stats", response_model=JobStats)
+async def read_job_stats(
+    db: AsyncSession = Depends(get_db),
+    weeks: int = Query(12, ge=1, le=104),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Pipeline analytics: jobs per status, the SAVED -> APPLIED -> INTERVIEWING
+    -> OFFER funnel, average days spent in each status and applications per
+    week over the last `weeks` weeks. Read from per-user aggregates kept up
+    to date on every job change.
+    """
+    return await job_stats.get_stats(db, current_user.id, weeks=weeks)
+
+@router.get("/{id}", response_model=JobSchema)
+async def read_job(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get a job including its description. Supports If-None-Match.
+    """
+    result = await db.execute(select(Job.updated_at).where(Job.id == id, Job.user_id == current_user.id))
+    version = result.first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    etag = make_etag("job", id, *version)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    job = await db.get(Job, id)
+    set_etag(response, etag)
+    return job
 
 @router.post("/", response_model=JobSchema)
 async def create_job(
@@ -34,8 +226,11 @@ async def create_job(
     """
     Create new job.
     """
-    db_obj = Job(**job_in.dict(), user_id=current_user.id)
+    db_obj = Job(**job_in.model_dump(), user_id=current_user.id)
     db.add(db_obj)
+    await job_terms.index_job(db, db_obj)
+    await db.flush()
+    await job_stats.job_created(db, db_obj)
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -56,9 +251,14 @@ async def update_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
         
-    update_data = job_in.dict(exclude_unset=True)
+    old_status = job.status
+    update_data = job_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(job, field, value)
+    if {"title", "company", "description"} & update_data.keys():
+        job.embedding = None
+        await job_terms.index_job(db, job)
+    await job_stats.job_status_changed(db, job, old_status)
         
     db.add(job)
     await db.commit()
@@ -80,6 +280,8 @@ async def delete_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
         
+    await job_stats.job_deleted(db, job)
+    await job_terms.job_deleted(db, job)
     await db.delete(job)
     await db.commit()
     return job
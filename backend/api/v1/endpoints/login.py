@@ -5,28 +5,46 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from api import deps
 from core import security
 from core.config import settings
+from core.rate_limit import login_account_limiter
 from db.session import get_db
 from models.user import User
 from schemas import Token
+from services import user_cache
 
 router = APIRouter()
 
-@router.post("/login/access-token", response_model=Token)
+@router.post("/login/access-token", response_model=Token, dependencies=[Depends(deps.login_rate_limit)])
 async def login_access_token(
     db: AsyncSession = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
+    # Only failed attempts use up an account's budget; a successful login refills it
+    account = form_data.username.lower()
+    deps.check_rate_limit(login_account_limiter, account, consume=False)
+    
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
     
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await security.verify_and_update_password_async(
+        form_data.password, user.hashed_password if user else None
+    )
+    if not valid:
+        login_account_limiter.hit(account)
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    elif not user.is_active:
+    login_account_limiter.reset(account)
+    if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    
+    if new_hash:
+        # Argon2 parameters changed since this password was hashed
+        user.hashed_password = new_hash
+        await db.commit()
+        await user_cache.invalidate_user(user.id)
         
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
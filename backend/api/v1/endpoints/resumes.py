@@ -1,81 +1,232 @@
-import shutil
-import os
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
 from api import deps
+from api.etag import make_etag, not_modified, not_modified_response, set_etag
+from api.pagination import paginate
+from api.sse import event_stream
+from api.uploads import FILE_FORM_OPENAPI, open_upload
 from db.session import get_db
 from models.resume import Resume
 from models.user import User
-from schemas import Resume as ResumeSchema
-from services import pdf_service, ai_service
+from schemas import Resume as ResumeSchema, ResumeBatch, ResumeBatchProgress, ResumeDetail, ResumeStatus, ResumeSummary
+from services import ai_service, resume_batch
+from services.storage import UploadTooLargeError, save_stream
+from services.task_queue import enqueue_resume_analysis
 
 router = APIRouter()
 
-UPLOAD_DIR = "uploads/resumes"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+UPLOAD_DIR = "uploads/resumes"  # created by services.storage on first write
 
-@router.post("/upload", response_model=ResumeSchema)
+SUMMARY_COLUMNS = (
+    Resume.user_id, Resume.filename, Resume.content_type,
+    Resume.is_analyzed, Resume.analysis_status, Resume.created_at,
+)
+
+@router.post("/upload", response_model=ResumeSchema, openapi_extra=FILE_FORM_OPENAPI)
 async def upload_resume(
     *,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    file: UploadFile = File(...),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Upload a resume (PDF), extract text, and analyze it with AI.
+    Upload a resume (PDF, multipart field "file"). Extraction and AI analysis
+    run in the background; poll /resumes/{id}/status until it is COMPLETED. A
+    file that was already analyzed (same SHA-256) reuses the existing results.
+    The body is streamed straight to storage as it arrives.
     """
+    file = await open_upload(request, "file")
     if not file.filename.endswith(".pdf"):
          raise HTTPException(status_code=400, detail="Only PDF files are supported")
-         
-    file_location = f"{UPLOAD_DIR}/{current_user.id}_{file.filename}"
     
-    with open(file_location, "wb+") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # Extract text (Sync for now, should be async/Celery in prod)
     try:
-        raw_text = pdf_service.extract_text_from_pdf(file_location)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error reading PDF: {str(e)}")
-        
-    # AI Analysis
-    parsed_content = await ai_service.analyze_resume(raw_text)
+        stored = await save_stream(file.chunks(), UPLOAD_DIR, extension=".pdf")
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    result = await db.execute(
+        select(Resume)
+        .where(Resume.content_hash == stored.sha256, Resume.is_analyzed == True)
+        .limit(1)
+    )
+    analyzed = result.scalars().first()
     
     db_obj = Resume(
         user_id=current_user.id,
-        file_path=file_location,
+        file_path=stored.path,
         filename=file.filename,
         content_type=file.content_type,
-        raw_text=raw_text,
-        parsed_content=parsed_content,
-        is_analyzed=True
+        content_hash=stored.sha256,
+        is_analyzed=False,
+        analysis_status="PENDING",
+        analysis_attempts=0,
     )
+    if analyzed:
+        db_obj.raw_text = analyzed.raw_text
+        db_obj.parsed_content = analyzed.parsed_content
+        db_obj.embedding = analyzed.embedding
+        db_obj.is_analyzed = True
+        db_obj.analysis_status = "COMPLETED"
     
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
     
+    if not analyzed:
+        await enqueue_resume_analysis(db_obj.id)
     return db_obj
 
-@router.get("/", response_model=List[ResumeSchema])
+@router.post("/batch", response_model=ResumeBatch)
+async def upload_resume_batch(
+    *,
+    db: AsyncSession = Depends(get_db),
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Upload many resumes at once: PDFs and/or zip files of PDFs. Every file
+    is queued for analysis; poll /resumes/batches/{batch_id} for progress.
+    Files that could not be stored are listed in `errors`.
+    """
+    try:
+        items = await resume_batch.store_files(files, UPLOAD_DIR)
+    except resume_batch.BatchTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if not any(item.stored for item in items):
+        raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+    
+    return await resume_batch.create_batch(db, current_user.id, items)
+
+@router.get("/batches/{batch_id}", response_model=ResumeBatchProgress)
+async def read_resume_batch(
+    *,
+    db: AsyncSession = Depends(get_db),
+    batch_id: str,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Analysis progress of a batch upload.
+    """
+    progress = await resume_batch.batch_progress(db, current_user.id, batch_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return progress
+
+@router.get("/{id}/status", response_model=ResumeStatus)
+async def read_resume_status(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Poll the background analysis status of a resume.
+    """
+    result = await db.execute(select(Resume).where(Resume.id == id, Resume.user_id == current_user.id))
+    resume = result.scalars().first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume
+
+@router.post("/{id}/reanalyze", response_model=ResumeStatus)
+async def reanalyze_resume(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Re-queue a resume whose analysis failed.
+    """
+    result = await db.execute(select(Resume).where(Resume.id == id, Resume.user_id == current_user.id))
+    resume = result.scalars().first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if resume.analysis_status != "FAILED":
+        raise HTTPException(status_code=409, detail="Resume analysis has not failed")
+
+    resume.analysis_status = "PENDING"
+    resume.analysis_attempts = 0
+    resume.analysis_error = None
+    await db.commit()
+    await db.refresh(resume)
+
+    await enqueue_resume_analysis(resume.id)
+    return resume
+
+@router.get("/", response_model=List[ResumeSummary])
 async def read_resumes(
+    response: Response,
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    status: Optional[str] = None,
+    include_total: bool = False,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Retrieve resume summaries, newest first (no raw_text/parsed_content; use
+    GET /resumes/{id} for those). `status` filters on analysis_status; pass
+    the X-Next-Cursor response header back as `cursor` to get the next page.
+    """
+    query = (
+        select(Resume)
+        .options(load_only(*SUMMARY_COLUMNS))
+        .where(Resume.user_id == current_user.id)
+    )
+    if status:
+        query = query.where(Resume.analysis_status == status)
+    return await paginate(db, query, Resume, response, cursor=cursor, skip=skip, limit=limit, include_total=include_total)
+
+@router.get("/{id}", response_model=ResumeDetail)
+async def read_resume(
+    *,
+    db: AsyncSession = Depends(get_db),
+    id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Retrieve resumes.
+    Get a resume with its extracted text and analysis. Supports If-None-Match:
+    the ETag is checked before the heavy columns are loaded.
     """
-    result = await db.execute(select(Resume).where(Resume.user_id == current_user.id).offset(skip).limit(limit))
-    resumes = result.scalars().all()
-    return resumes
+    result = await db.execute(
+        select(Resume.updated_at, Resume.analysis_status, Resume.analysis_attempts)
+        .where(Resume.id == id, Resume.user_id == current_user.id)
+    )
+    version = result.first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    etag = make_etag("resume", id, *version)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    
+    resume = await db.get(Resume, id)
+    set_etag(response, etag)
+    return resume
 
 from pydantic import BaseModel
 
+async def get_analyzed_resume(db: AsyncSession, resume_id: int, user: User) -> Resume:
+    """
+    The user's resume, once its text has been extracted; before that there is
+    nothing to send to the model (409, poll /{id}/status).
+    """
+    result = await db.execute(select(Resume).where(Resume.id == resume_id, Resume.user_id == user.id))
+    resume = result.scalars().first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if not resume.is_analyzed:
+        raise HTTPException(status_code=409, detail="Resume has not been analyzed yet")
+    return resume
+
 class TailorRequest(BaseModel):
     resume_id: int
     job_description: str
@@ -89,15 +240,25 @@ async def tailor_resume(
     """
     Tailor a resume for a specific job description using AI.
     """
-    result = await db.execute(select(Resume).where(Resume.id == request.resume_id, Resume.user_id == current_user.id))
-    resume = result.scalars().first()
-    
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
+    resume = await get_analyzed_resume(db, request.resume_id, current_user)
         
     tailored_result = await ai_service.tailor_resume(resume.raw_text, request.job_description)
     return tailored_result
 
+@router.post("/tailor/stream")
+async def tailor_resume_stream(
+    request: TailorRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Tailor a resume, streaming model output as Server-Sent Events ("token"
+    events, then a final "result" event with the parsed JSON).
+    """
+    resume = await get_analyzed_resume(db, request.resume_id, current_user)
+        
+    return event_stream(ai_service.stream_tailored_resume(resume.raw_text, request.job_description))
+
 class ColdEmailRequest(BaseModel):
     resume_id: int
     recipient_name: str
@@ -113,11 +274,7 @@ async def generate_cold_email(
     """
     Generate a cold email based on a resume and target details.
     """
-    result = await db.execute(select(Resume).where(Resume.id == request.resume_id, Resume.user_id == current_user.id))
-    resume = result.scalars().first()
-    
-    if not resume:
-        raise HTTPException(status_code=404, detail="Resume not found")
+    resume = await get_analyzed_resume(db, request.resume_id, current_user)
         
     email_result = await ai_service.generate_cold_email(
         resume.raw_text, 
@@ -126,3 +283,21 @@ async def generate_cold_email(
         request.job_title
     )
     return email_result
+
+@router.post("/cold-email/stream")
+async def generate_cold_email_stream(
+    request: ColdEmailRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Generate a cold email, streaming model output as Server-Sent Events.
+    """
+    resume = await get_analyzed_resume(db, request.resume_id, current_user)
+        
+    return event_stream(ai_service.stream_cold_email(
+        resume.raw_text, 
+        request.recipient_name, 
+        request.company_name, 
+        request.job_title
+    ))
@@ -0,0 +1,42 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api import deps
+from api.pagination import NEXT_CURSOR_HEADER, decode_offset_cursor, encode_offset_cursor
+from db.session import get_db
+from models.user import User
+from schemas import SearchHit
+from services import search as search_service
+
+router = APIRouter()
+
+# Relevance-ordered pages are merged from each type's top offset + limit rows
+MAX_OFFSET = 1000
+
+@router.get("/search", response_model=List[SearchHit])
+async def search(
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[List[str]] = Query(None, description="job and/or resume (default: both)"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Full-text search across your jobs and resumes, best match first, with
+    matched words highlighted. Pass the X-Next-Cursor response header back
+    as `cursor` to get the next page.
+    """
+    unknown = set(type or []) - set(search_service.SEARCH_TYPES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search type: {', '.join(sorted(unknown))}")
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    if not 0 <= offset <= MAX_OFFSET:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    hits, more = await search_service.search(db, current_user.id, q, types=type, offset=offset, limit=limit)
+    if more and offset + limit <= MAX_OFFSET:
+        response.headers[NEXT_CURSOR_HEADER] = encode_offset_cursor(offset + limit)
+    return hits
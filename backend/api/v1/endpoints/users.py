@@ -9,10 +9,11 @@ from core import security
 from db.session import get_db
 from models.user import User
 from schemas import User as UserSchema, UserCreate, UserUpdate
+from services import user_cache
 
 router = APIRouter()
 
-@router.post("/", response_model=UserSchema)
+@router.post("/", response_model=UserSchema, dependencies=[Depends(deps.login_rate_limit)])
 async def create_user(
     *,
     db: AsyncSession = Depends(get_db),
@@ -32,7 +33,7 @@ async def create_user(
         
     obj_in_data = jsonable_encoder(user_in)
     del obj_in_data["password"]
-    obj_in_data["hashed_password"] = security.get_password_hash(user_in.password)
+    obj_in_data["hashed_password"] = await security.get_password_hash_async(user_in.password)
     
     db_obj = User(**obj_in_data)
     db.add(db_obj)
@@ -49,3 +50,32 @@ async def read_user_me(
     Get current user.
     """
     return current_user
+
+@router.put("/me", response_model=UserSchema)
+async def update_user_me(
+    *,
+    db: AsyncSession = Depends(get_db),
+    user_in: UserUpdate,
+    current_user: User = Depends(deps.get_current_active_user_from_db),
+) -> Any:
+    """
+    Update own profile. Only email, full name and password can be changed here.
+    """
+    if user_in.email and user_in.email != current_user.email:
+        result = await db.execute(select(User).where(User.email == user_in.email))
+        if result.scalars().first():
+            raise HTTPException(
+                status_code=400,
+                detail="The user with this username already exists in the system.",
+            )
+        current_user.email = user_in.email
+    if user_in.full_name is not None:
+        current_user.full_name = user_in.full_name
+    if user_in.password:
+        current_user.hashed_password = await security.get_password_hash_async(user_in.password)
+    
+    await db.commit()
+    await db.refresh(current_user)
+    await user_cache.invalidate_user(current_user.id)
+    
+    return current_user
@@ -0,0 +1,102 @@
+"""
+Requests/second for DB-bound endpoints: original engine setup vs db.session.
+
+"before" is the engine the app used to create (echo=True, default pool,
+no SQLite pragmas); "after" is db.session.create_engine() with Settings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_db [--requests 2000] [--concurrency 50]
+    python -m benchmarks.bench_db --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import db.base  # noqa: register all models
+from core import security
+from core.config import settings
+from db.base_class import Base
+from db.session import create_engine, get_db
+from main import app
+from models.job import Job
+from models.user import User
+
+
+async def seed(engine) -> str:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="x", is_active=True)
+        session.add(user)
+        await session.flush()
+        session.add_all(
+            Job(user_id=user.id, title=f"Job {i}", company=f"Company {i % 50}", description="python sql " * 20)
+            for i in range(200)
+        )
+        await session.commit()
+        return security.create_access_token(user.id)
+
+
+async def run(engine, requests: int, concurrency: int) -> float:
+    token = await seed(engine)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                path = "/api/v1/users/me" if i % 2 else "/api/v1/jobs/?limit=20"
+                response = await client.get(path, headers=headers)
+                response.raise_for_status()
+
+        await one(0)  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    url = args.database_url or "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    results = {}
+    # echo=True writes every statement to stdout; send it to a file, as a
+    # container's stdout would go to a log pipe, instead of the terminal
+    with tempfile.TemporaryFile("w") as log, contextlib.redirect_stdout(log):
+        results["before (echo, default pool)"] = asyncio.run(
+            run(create_async_engine(url, echo=True), args.requests, args.concurrency)
+        )
+    results["after (db.session settings)"] = asyncio.run(run(create_engine(url), args.requests, args.concurrency))
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {url.split('://')[0]}")
+    for name, rps in results.items():
+        print(f"{name:<32} {rps:>8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+End-to-end load benchmark: user flows against the FastAPI app in-process.
+
+Flows: login, list (dashboard job + resume lists), upload (one PDF, analyzed
+in the background), tailor and interview (create a session, evaluate five
+answers). Each flow runs at each concurrency level; the report gives
+throughput and p50/p95/p99 latency per flow. LLM calls are served by the
+replay backend (services.llm_replay): from a recorded cassette if given,
+otherwise from canned responses, after a simulated latency. No Gemini key is
+used. Inputs are unique per request so the LLM response cache does not hide
+model latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_load [--concurrency 1,10,50] [--requests 100]
+    python -m benchmarks.bench_load --cassette cassettes/llm.jsonl --latency recorded
+    python -m benchmarks.bench_load --json results.json                 # save a baseline
+    python -m benchmarks.bench_load --baseline results.json --tolerance 0.2
+                                                                        # exit 1 on regression
+"""
+import os
+import tempfile
+
+# The app reads its settings at import time: point it at a scratch database
+# and upload directory, and turn off login rate limiting, before importing it.
+WORKDIR = tempfile.mkdtemp(prefix="bench_load_")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///" + os.path.join(WORKDIR, "bench.db"))
+os.environ.setdefault("LOGIN_IP_BURST", "0")
+os.environ.setdefault("LOGIN_ACCOUNT_BURST", "0")
+os.environ.setdefault("TASK_QUEUE_BACKEND", "local")
+BACKEND_DIR = os.getcwd()
+os.chdir(WORKDIR)
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+import db.base  # noqa: register all models
+from benchmarks.corpus import make_pdf, resume_text
+from core import security
+from db.base_class import Base
+from db.session import async_session, engine
+from main import app
+from models.job import Job
+from models.resume import Resume
+from models.user import User
+from services import pdf_service
+from services.llm_client import FAKE_RESPONSES, LLMClient, set_llm_client
+from services.llm_replay import ReplayBackend
+from services.task_queue import local_queue
+
+PASSWORD = "bench-password"
+FLOWS = ("login", "list", "upload", "tailor", "interview")
+
+
+@dataclass
+class BenchUser:
+    email: str
+    token: str
+    resume_id: int
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+@dataclass
+class Result:
+    flow: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, p: float) -> float:
+        # Nearest rank
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": len(self.latencies) + self.errors,
+            "errors": self.errors,
+            "throughput": round(self.throughput, 2),
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p95_ms": round(self.percentile(95) * 1000, 1),
+            "p99_ms": round(self.percentile(99) * 1000, 1),
+        }
+
+
+async def seed(users: int, jobs_per_user: int) -> List[BenchUser]:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(42)
+    hashed = security.get_password_hash(PASSWORD)
+    seeded = []
+    async with async_session() as session:
+        for i in range(users):
+            user = User(email=f"bench{i}@example.com", hashed_password=hashed, is_active=True)
+            session.add(user)
+            await session.flush()
+            session.add_all(
+                Job(user_id=user.id, title=f"Engineer {j}", company=f"Company {j % 20}", description="python sql " * 30)
+                for j in range(jobs_per_user)
+            )
+            resume = Resume(
+                user_id=user.id,
+                file_path=os.path.join(WORKDIR, "seed.pdf"),
+                filename="seed.pdf",
+                content_type="application/pdf",
+                raw_text="\n".join(line for page in resume_text(rng) for line in page),
+                parsed_content=FAKE_RESPONSES["analyze_resume"],
+                is_analyzed=True,
+                analysis_status="COMPLETED",
+            )
+            session.add(resume)
+            await session.flush()
+            seeded.append(BenchUser(user.email, security.create_access_token(user.id), resume.id))
+        await session.commit()
+    return seeded
+
+
+def unique() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def login(client: httpx.AsyncClient, user: BenchUser) -> None:
+    response = await client.post("/login/access-token", data={"username": user.email, "password": PASSWORD})
+    response.raise_for_status()
+
+
+async def list_dashboard(client: httpx.AsyncClient, user: BenchUser) -> None:
+    for path in ("/jobs/?limit=20", "/resumes/?limit=20"):
+        response = await client.get(path, headers=user.headers)
+        response.raise_for_status()
+
+
+async def upload(client: httpx.AsyncClient, user: BenchUser) -> None:
+    # A unique file each time, so the content-hash dedup doesn't skip analysis
+    pdf = make_pdf([[f"Benchmark Candidate {unique()}", "Experience", "Built APIs in Python and SQL."]])
+    response = await client.post(
+        "/resumes/upload", files={"file": ("resume.pdf", pdf, "application/pdf")}, headers=user.headers
+    )
+    response.raise_for_status()
+
+
+async def tailor(client: httpx.AsyncClient, user: BenchUser) -> None:
+    response = await client.post(
+        "/resumes/tailor",
+        json={"resume_id": user.resume_id, "job_description": f"Backend engineer, Python and SQL. Ref {unique()}"},
+        headers=user.headers,
+    )
+    response.raise_for_status()
+    if "error" in response.json():
+        raise RuntimeError(response.json()["error"])
+
+
+async def interview(client: httpx.AsyncClient, user: BenchUser) -> None:
+    response = await client.post(
+        "/interviews/sessions",
+        json={"job_title": f"Backend Engineer {unique()}", "job_description": "Python, SQL"},
+        headers=user.headers,
+    )
+    response.raise_for_status()
+    session = response.json()
+    answers = [
+        {"question_index": i, "answer": f"In my last role I handled this by ... ({unique()})"}
+        for i in range(len(session["questions"]))
+    ]
+    response = await client.post(
+        f"/interviews/sessions/{session['id']}/evaluate", json={"answers": answers}, headers=user.headers
+    )
+    response.raise_for_status()
+
+
+FLOW_FUNCTIONS: Dict[str, Callable[[httpx.AsyncClient, BenchUser], Awaitable[None]]] = {
+    "login": login,
+    "list": list_dashboard,
+    "upload": upload,
+    "tailor": tailor,
+    "interview": interview,
+}
+
+
+async def run_flow(
+    client: httpx.AsyncClient, users: List[BenchUser], flow: str, concurrency: int, requests: int
+) -> Result:
+    result = Result(flow, concurrency)
+    fn = FLOW_FUNCTIONS[flow]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await fn(client, users[i % len(users)])
+            except Exception as e:
+                result.errors += 1
+                if result.errors == 1:
+                    print(f"  {flow}: first error: {e!r}", file=sys.stderr)
+                return
+            result.latencies.append(time.perf_counter() - started)
+
+    await fn(client, users[0])  # warm up
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def compare(results: List[Result], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """
+    Flows whose p95 latency grew, or throughput dropped, by more than `tolerance`.
+    """
+    regressions = []
+    for result in results:
+        before = baseline.get(f"{result.flow}@{result.concurrency}")
+        if not before:
+            continue
+        now = result.summary()
+        if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.flow}@{result.concurrency}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if before["throughput"] and now["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{result.flow}@{result.concurrency}: throughput {before['throughput']} -> {now['throughput']} req/s"
+            )
+        if now["errors"] > before["errors"]:
+            regressions.append(f"{result.flow}@{result.concurrency}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+async def run(args) -> List[Result]:
+    if args.cassette:
+        backend = ReplayBackend.from_file(args.cassette, latency=args.latency or "recorded")
+    else:
+        backend = ReplayBackend.from_responses(FAKE_RESPONSES, latency=args.latency or "lognormal:600:0.4")
+    set_llm_client(LLMClient(backend))
+
+    users = await seed(args.users, args.jobs)
+    await local_queue.start()
+    results = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench/api/v1", timeout=None) as client:
+            for concurrency in args.concurrency:
+                for flow in args.flows:
+                    results.append(await run_flow(client, users, flow, concurrency, args.requests))
+                    print(f"  {flow} @ {concurrency}: {results[-1].summary()}", file=sys.stderr)
+    finally:
+        await local_queue.stop()
+        pdf_service.shutdown_executor()
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="1,10,50", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=100, help="requests per flow and concurrency level")
+    parser.add_argument("--flows", default=",".join(FLOWS), help=f"comma-separated subset of {','.join(FLOWS)}")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--jobs", type=int, default=50, help="jobs seeded per user")
+    parser.add_argument("--cassette", help="recorded LLM responses (default: canned responses)")
+    parser.add_argument("--latency", help="LLM latency model, see services/llm_replay.py")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed regression vs the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+    args.flows = [flow for flow in args.flows.split(",") if flow]
+    unknown = set(args.flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(sorted(unknown))}")
+    for option in ("cassette", "json", "baseline"):
+        path = getattr(args, option)
+        if path and not os.path.isabs(path):
+            setattr(args, option, os.path.join(BACKEND_DIR, path))
+
+    results = asyncio.run(run(args))
+
+    print(f"{'flow':<10} {'conc':>5} {'reqs':>6} {'errors':>6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for result in results:
+        s = result.summary()
+        print(
+            f"{result.flow:<10} {result.concurrency:>5} {s['requests']:>6} {s['errors']:>6} {s['throughput']:>9.1f}"
+            f" {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f}"
+        )
+
+    summaries = {f"{r.flow}@{r.concurrency}": r.summary() for r in results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Match scoring throughput (resume/job pairs per second), from job term counts
+extracted beforehand as services.job_terms stores them. Extraction, done once
+per job when it is saved, is timed separately.
+
+Usage (from backend/):
+    python -m benchmarks.bench_match [--jobs 10000] [--resumes 1000]
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from benchmarks.corpus import COMPANIES, SKILLS, TITLES
+from services.match_service import SKILL_VOCABULARY, get_engine, normalize_skill
+
+FILLER = "we are looking for a motivated teammate to join our growing team and ship great products".split()
+
+
+def make_job(rng: random.Random) -> str:
+    words = rng.sample(FILLER, 10) + [s.lower() for s in rng.sample(SKILLS, 6)] + rng.sample(SKILL_VOCABULARY, 4)
+    rng.shuffle(words)
+    return f"{rng.choice(TITLES)}\n{rng.choice(COMPANIES)}\n" + " ".join(words * 8)
+
+
+def make_skills(rng: random.Random) -> list:
+    return [normalize_skill(s) for s in rng.sample(SKILLS, 8) + rng.sample(SKILL_VOCABULARY, 6)]
+
+
+def naive_scores(skill_lists, job_terms):
+    # One pair at a time: what a per-pair loop (or per-pair LLM call) would do
+    term_sets = [set(terms) for terms in job_terms]
+    return [[len(set(skills) & terms) / (len(terms) or 1) for terms in term_sets] for skills in skill_lists]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--resumes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [make_job(rng) for _ in range(args.jobs)]
+    resumes = [make_skills(rng) for _ in range(args.resumes)]
+
+    engine = get_engine()
+    start = time.perf_counter()
+    jobs = [dict(engine.term_counts(text)) for text in texts]
+    extract = time.perf_counter() - start
+    print(f"Term extraction (once per saved job): {extract / len(texts) * 1e6:.0f} us/job")
+    document_frequency = Counter(term for terms in jobs for term in terms)
+    idf = engine.idf(document_frequency, len(jobs))
+
+    scenarios = [
+        (f"1 resume x {args.jobs} jobs", resumes[:1], jobs),
+        (f"{args.resumes} resumes x 1 job", resumes, jobs[:1]),
+        (f"{args.resumes} resumes x 1000 jobs", resumes, jobs[:1000]),
+    ]
+    print(f"{'scenario':<30} {'engine s':>9} {'pairs/s':>12} {'naive s':>9} {'pairs/s':>12}")
+    for name, skills, job_terms in scenarios:
+        pairs = len(skills) * len(job_terms)
+        fast = timed(engine.score, skills, job_terms, idf)
+        naive = timed(naive_scores, skills, job_terms)
+        print(f"{name:<30} {fast:>9.3f} {pairs / fast:>12,.0f} {naive:>9.3f} {pairs / naive:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
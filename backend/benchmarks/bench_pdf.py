@@ -0,0 +1,80 @@
+"""
+PDF extraction throughput: original implementation vs the new engine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_pdf                       # synthetic corpus
+    python -m benchmarks.bench_pdf --corpus path/to/pdfs # your own resumes
+"""
+import argparse
+import asyncio
+import glob
+import os
+import tempfile
+import time
+
+import pdfplumber
+
+from benchmarks.corpus import build_corpus
+from services import pdf_service
+
+
+def legacy_extract_text_from_pdf(file_path: str) -> str:
+    # The implementation this engine replaced, kept for comparison
+    text = ""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            text += (page.extract_text() or "") + "\n"
+    return text
+
+
+def run_sync(fn, paths) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        fn(path)
+    return time.perf_counter() - start
+
+
+async def run_pool(paths, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(path):
+        async with semaphore:
+            await pdf_service.extract_text_async(path)
+
+    # Warm the pool so process start-up is not measured
+    await pdf_service.extract_text_async(paths[0])
+    start = time.perf_counter()
+    await asyncio.gather(*(one(path) for path in paths))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of PDFs (default: generate a synthetic corpus)")
+    parser.add_argument("--docs", type=int, default=100, help="synthetic corpus size")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() * 2)
+    args = parser.parse_args()
+
+    if args.corpus:
+        paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf")))
+    else:
+        paths = build_corpus(os.path.join(tempfile.gettempdir(), "resume_corpus"), args.docs)
+    if not paths:
+        raise SystemExit("No PDFs found")
+
+    results = [
+        ("legacy pdfplumber", run_sync(legacy_extract_text_from_pdf, paths)),
+        ("engine, in-process", run_sync(pdf_service.extract_text_from_pdf, paths)),
+        (f"engine, process pool (x{args.concurrency})", asyncio.run(run_pool(paths, args.concurrency))),
+    ]
+    pdf_service.shutdown_executor()
+
+    baseline = results[0][1]
+    print(f"{len(paths)} documents, {os.cpu_count()} cores")
+    print(f"{'implementation':<36} {'seconds':>8} {'docs/s':>8} {'speedup':>8}")
+    for name, elapsed in results:
+        print(f"{name:<36} {elapsed:>8.2f} {len(paths) / elapsed:>8.1f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Full-text search latency (services.search) on a large job table.
+
+Migrates a scratch database to head (which creates the FTS5 tables and
+triggers), inserts --jobs jobs spread over --users users through the ORM so
+the triggers index them, then times searches for one user: common and rare
+words, multi-word and prefix queries, first and later pages.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search [--jobs 100000] [--users 100] [--searches 200]
+    python -m benchmarks.bench_search --database-url postgresql+asyncpg://...   # an empty database
+"""
+import os
+import tempfile
+
+WORKDIR = tempfile.mkdtemp(prefix="bench_search_")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///" + os.path.join(WORKDIR, "bench.db"))
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.bench_match import make_job
+from benchmarks.corpus import COMPANIES
+from core.config import settings
+from db import migrations
+from db.session import async_session, engine
+from models.job import Job
+from models.user import User
+from services.search import search
+
+QUERIES = ["python", "engineer kubernetes", "docker postgresql team", "kub", "machine learning", "globex"]
+
+
+async def seed(jobs: int, users: int) -> float:
+    await asyncio.to_thread(migrations.upgrade)
+    rng = random.Random(42)
+    started = time.perf_counter()
+    async with async_session() as session:
+        user_ids = []
+        for i in range(users):
+            user = User(email=f"search{i}@example.com", hashed_password="x", is_active=True)
+            session.add(user)
+            await session.flush()
+            user_ids.append(user.id)
+        for start in range(0, jobs, 5000):
+            for i in range(start, min(jobs, start + 5000)):
+                title, _, description = make_job(rng).split("\n", 2)
+                session.add(Job(user_id=user_ids[i % users], title=title, company=rng.choice(COMPANIES), description=description))
+            await session.commit()
+    return time.perf_counter() - started
+
+
+async def run(args) -> None:
+    seconds = await seed(args.jobs, args.users)
+    print(f"Inserted {args.jobs} jobs ({args.jobs / seconds:.0f} rows/s, FTS index maintained by triggers)")
+
+    rng = random.Random(7)
+    async with async_session() as session:
+        for query in QUERIES:
+            for label, offset in (("first page", 0), ("page 5", 80)):
+                timings = []
+                for _ in range(args.searches):
+                    user_id = rng.randint(1, args.users)
+                    started = time.perf_counter()
+                    hits, _ = await search(session, user_id, query, offset=offset, limit=20)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                print(f"{query!r:<28} {label:<10} {len(hits):>3} hits  p50 {statistics.median(timings):6.2f} ms  p95 {p95:6.2f} ms")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--searches", type=int, default=200, help="searches per query and page")
+    args = parser.parse_args()
+    if args.database_url and args.database_url != settings.DATABASE_URL:
+        sys.exit("Set DATABASE_URL instead; the app's engine is created at import time.")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Synthetic resume corpus for benchmarks.
+
+Writes small, valid text-only PDFs (Helvetica, one text stream per page) so
+benchmarks run without shipping real candidate data.
+"""
+import os
+import random
+from typing import List
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Carlos", "Amara", "Noah", "Sofia"]
+LAST_NAMES = ["Doe", "Smith", "Patel", "Zhang", "Garcia", "Okafor", "Kim", "Rossi"]
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer", "Frontend Developer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+SKILLS = [
+    "Python", "SQL", "FastAPI", "React", "TypeScript", "Docker", "Kubernetes", "AWS",
+    "PostgreSQL", "Redis", "Machine Learning", "Pandas", "Go", "Java", "Terraform", "GraphQL",
+]
+
+
+def _escape(text: str) -> bytes:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace")
+
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """
+    Build a minimal PDF with one page per list of lines.
+    """
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for lines in pages:
+        stream = b"BT /F1 10 Tf 50 760 Td 13 TL " + b" ".join(b"(" + _escape(line) + b") '" for line in lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return out
+
+
+def resume_text(rng: random.Random) -> List[List[str]]:
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"{rng.choice(TITLES)} | candidate{rng.randint(1, 9999)}@example.com",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(rng.randint(3, 8)):
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2010, 2020)} - {rng.randint(2021, 2025)})")
+        for _ in range(4):
+            lines.append(f"- Built {rng.choice(SKILLS)} services, improving latency by {rng.randint(5, 80)}% for {rng.randint(2, 90)}k users")
+    # ~50 lines per page
+    return [lines[i:i + 50] for i in range(0, len(lines), 50)]
+
+
+def build_corpus(directory: str, count: int, seed: int = 42) -> List[str]:
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"resume_{i:04d}.pdf")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(make_pdf(resume_text(rng)))
+        paths.append(path)
+    return paths
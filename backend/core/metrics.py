@@ -0,0 +1,204 @@
+"""
+In-process metrics in the Prometheus text exposition format, served at /metrics.
+
+Recording is a dict lookup and a few integer adds, done without locks:
+observations come from the event loop thread (or SQLAlchemy hooks running on
+it), so there is no contention to guard against. A stray observation from
+another thread can at worst lose one increment under the GIL. Values that
+already live elsewhere (queue depth, cache counters, breaker state) are read
+by callbacks at scrape time instead of being mirrored on every change.
+
+Each process keeps its own metrics; scrape every worker.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[LabelValues, float]
+
+# Seconds; covers both sub-millisecond DB queries and long LLM calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += self._samples()
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Gauge or counter whose samples are read from `collect` at scrape time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        collect: Callable[[], Iterable[Sample]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.collect = collect
+
+    def _samples(self) -> List[str]:
+        try:
+            samples = list(self.collect())
+        except Exception as e:
+            print(f"⚠ Metrics callback {self.name} failed: {e}")
+            return []
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in samples]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+
+def histogram(
+    name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+
+def callback(
+    name: str, help: str, collect: Callable[[], Iterable[Sample]], labelnames: Sequence[str] = (), kind: str = "gauge"
+) -> CallbackMetric:
+    return REGISTRY.register(CallbackMetric(name, help, collect, labelnames, kind))
+
+
+# Metrics recorded from several modules
+http_request_seconds = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+db_query_seconds = histogram("db_query_duration_seconds", "Database query latency by statement type", ("statement",))
+pdf_extraction_seconds = histogram("pdf_extraction_duration_seconds", "Time to extract text from one PDF")
+llm_call_seconds = histogram(
+    "llm_call_duration_seconds", "LLM call latency (including retries) by operation", ("operation", "outcome")
+)
+llm_tokens = histogram(
+    "llm_tokens", "Tokens per LLM call by operation and direction", ("operation", "direction"), TOKEN_BUCKETS
+)
+errors_total = counter("app_errors_total", "Errors by component and exception class", ("component", "type"))
+
+
+def record_error(component: str, exc: BaseException) -> None:
+    errors_total.inc(component, type(exc).__name__)
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Hashable, Tuple
+
+from core.cache import TTLCache
+from core.config import settings
+
+
+class RateLimiter:
+    """
+    Per-key token bucket: `capacity` requests in a burst, refilled at `per_minute`.
+
+    Buckets live in an in-process LRU, so limits apply per worker process and
+    idle keys are forgotten once their bucket would be full again.
+    """
+
+    def __init__(self, capacity: int, per_minute: float, max_keys: int = 100_000):
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self._buckets = TTLCache(maxsize=max_keys, ttl=capacity / self.rate if self.rate else 3600)
+
+    def _available(self, key: Hashable, now: float) -> float:
+        tokens, updated_at = self._buckets.get(key, (float(self.capacity), now))
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def _retry_after(self, tokens: float) -> float:
+        return (1 - tokens) / self.rate if self.rate else 60.0
+
+    def hit(self, key: Hashable) -> Tuple[bool, float]:
+        """
+        Take one token for `key`. Returns (allowed, seconds until a token is available).
+        """
+        if self.capacity <= 0:
+            return True, 0.0
+
+        now = time.monotonic()
+        tokens = self._available(key, now)
+        if tokens >= 1:
+            self._buckets.set(key, (tokens - 1, now))
+            return True, 0.0
+
+        self._buckets.set(key, (tokens, now))
+        return False, self._retry_after(tokens)
+
+    def peek(self, key: Hashable) -> Tuple[bool, float]:
+        """
+        Like hit(), without taking a token: for limits charged only on some
+        outcomes (see reset()).
+        """
+        if self.capacity <= 0:
+            return True, 0.0
+        tokens = self._available(key, time.monotonic())
+        return (True, 0.0) if tokens >= 1 else (False, self._retry_after(tokens))
+
+    def reset(self, key: Hashable) -> None:
+        """
+        Give `key` a full bucket again.
+        """
+        self._buckets.delete(key)
+
+
+class AsyncTokenBucket:
+    """
+    Awaitable token bucket for quotas such as LLM tokens per minute. Callers
+    queue in FIFO order for `amount` tokens; charge() settles the difference
+    once the real cost is known, and may leave the bucket in debt.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, amount: float) -> None:
+        if self.capacity <= 0:
+            return
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def charge(self, amount: float) -> None:
+        if self.capacity <= 0:
+            return
+        self._refill()
+        self.tokens -= amount
+
+
+login_ip_limiter = RateLimiter(settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE)
+login_account_limiter = RateLimiter(settings.LOGIN_ACCOUNT_BURST, settings.LOGIN_ACCOUNT_PER_MINUTE)
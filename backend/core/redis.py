@@ -0,0 +1,26 @@
+from typing import Any, Optional
+
+from core.config import settings
+
+_client = None
+
+
+def get_redis() -> Optional[Any]:
+    """
+    Shared async Redis client, or None when REDIS_URL is not configured.
+    """
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        import redis.asyncio as redis
+
+        _client = redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,10 +1,27 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Hashes made with other parameters still verify and are flagged for
+# rehashing (see verify_and_update_password_async).
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# argon2-cffi releases the GIL, so a small thread pool hashes in parallel
+# without blocking the event loop, and caps how many hashes run at once.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+
+# Verified against when the user doesn't exist, so both paths take as long
+_dummy_hash: Optional[str] = None
 
 ALGORITHM = "HS256"
 
@@ -26,3 +43,30 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, pwd_context.hash, password)
+
+async def warm_up() -> None:
+    """
+    Load the argon2 backend and compute the dummy hash before the first login needs it.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await get_password_hash_async("dummy-password")
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify off the event loop. Returns (valid, new_hash); new_hash is set when
+    the stored hash uses outdated parameters and should be replaced.
+    Pass hashed_password=None for unknown users to spend the same time.
+    """
+    loop = asyncio.get_running_loop()
+    if hashed_password is None:
+        await warm_up()
+        await loop.run_in_executor(_hash_executor, pwd_context.verify, plain_password, _dummy_hash)
+        return False, None
+    return await loop.run_in_executor(_hash_executor, pwd_context.verify_and_update, plain_password, hashed_password)
@@ -2,3 +2,6 @@ from db.base_class import Base  # noqa
 from models.user import User  # noqa
 from models.resume import Resume  # noqa
 from models.job import Job  # noqa
+from models.interview import InterviewSession  # noqa
+from models.job_stats import JobStageStat, JobStatusEvent, JobWeeklyStat  # noqa
+from models.job_term import JobTermStat  # noqa
@@ -0,0 +1,158 @@
+"""
+Schema migrations: the pre-deploy command and the startup check.
+
+Run migrations once per deploy, before starting the API workers:
+
+    python -m db.migrations            # upgrade to head
+    python -m db.migrations --check    # exit 1 if the database is behind head
+
+On startup each worker only compares the database's revision with the
+script heads (one small query); by default a database behind head only keeps
+/ready failing. If MIGRATIONS_ON_STARTUP is "upgrade" (an opt-in for local
+development), the upgrade runs under a cross-process lock (a Postgres advisory
+lock, or a file lock next to a SQLite database) so concurrent workers don't
+race; whoever gets the lock second finds the database already at head.
+Alembic is imported only when these functions run.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no file lock, SQLite users run a single worker there
+    fcntl = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Arbitrary constant shared by every worker; pg_advisory_lock takes a bigint
+ADVISORY_LOCK_KEY = 720_451_923
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    # Absolute paths, so the working directory doesn't matter
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+
+def head_revisions() -> Set[str]:
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+def _current_revisions(connection) -> Set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+async def revisions(engine: AsyncEngine) -> Tuple[Set[str], Set[str]]:
+    """
+    (current revisions of the database, head revisions of the scripts).
+    """
+    heads = await asyncio.to_thread(head_revisions)
+    async with engine.connect() as connection:
+        current = await connection.run_sync(_current_revisions)
+    return current, heads
+
+
+def upgrade() -> None:
+    """
+    Upgrade to head. migrations/env.py runs its own event loop, so call this
+    from a thread (or a process) without a running loop.
+    """
+    from alembic import command
+
+    command.upgrade(alembic_config(), "head")
+
+
+def _lock_file_path(url: str) -> str:
+    database = make_url(url).database
+    if database and database != ":memory:":
+        return os.path.abspath(database) + ".migrate.lock"
+    return os.path.join(BACKEND_DIR, ".migrate.lock")
+
+
+@asynccontextmanager
+async def migration_lock(engine: AsyncEngine) -> AsyncIterator[None]:
+    """
+    Held by one process at a time, across all workers sharing the database.
+    """
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            try:
+                yield
+            finally:
+                await connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        return
+
+    if fcntl is None:
+        yield
+        return
+    with open(_lock_file_path(str(engine.url)), "a") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+async def ensure_migrated(engine: AsyncEngine, mode: str = settings.MIGRATIONS_ON_STARTUP) -> str:
+    """
+    Returns "up to date", "upgraded", "pending" (behind head, mode is not
+    "upgrade") or "skipped" (mode "off").
+    """
+    if mode == "off":
+        return "skipped"
+    current, heads = await revisions(engine)
+    if current == heads:
+        return "up to date"
+    if mode != "upgrade":
+        return "pending"
+
+    async with migration_lock(engine):
+        # Another worker may have upgraded while we waited for the lock
+        current, heads = await revisions(engine)
+        if current == heads:
+            return "up to date"
+        print(f"Upgrading database from {sorted(current) or 'empty'} to {sorted(heads)}...")
+        await asyncio.to_thread(upgrade)
+    return "upgraded"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="only report whether the database is at head")
+    args = parser.parse_args()
+
+    from db.session import create_engine
+
+    async def run() -> str:
+        engine = create_engine()
+        try:
+            return await ensure_migrated(engine, mode="check" if args.check else "upgrade")
+        finally:
+            await engine.dispose()
+
+    status = asyncio.run(run())
+    print(f"Database schema: {status}")
+    if status == "pending":
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
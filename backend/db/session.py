@@ -1,8 +1,81 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import logging
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
+from core.metrics import db_query_seconds
+
+slow_query_logger = logging.getLogger("db.slow_query")
+
+
+def engine_options(url: str) -> dict:
+    """
+    create_async_engine keyword arguments for a database URL, from Settings.
+    """
+    url = make_url(url)
+    options = {"echo": settings.DB_ECHO}
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return options  # single shared connection (StaticPool)
+    else:
+        # Local SQLite files never go stale; pinging is for networked servers
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the statement's execution context rather than the connection, so
+    # a statement that raises (and never reaches after_cursor_execute) leaves nothing behind
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_start_time", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if settings.METRICS_ENABLED:
+        db_query_seconds.observe(elapsed, statement.split(None, 1)[0].upper())
+    elapsed_ms = elapsed * 1000
+    if settings.DB_SLOW_QUERY_MS > 0 and elapsed_ms >= settings.DB_SLOW_QUERY_MS and random.random() < settings.DB_SLOW_QUERY_SAMPLE_RATE:
+        # Parameters are left out on purpose: they contain user data
+        slow_query_logger.warning("Slow query (%.1f ms): %s", elapsed_ms, " ".join(statement.split())[:1000])
+
+
+def create_engine(url: str = settings.DATABASE_URL) -> AsyncEngine:
+    engine = create_async_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    if settings.DB_SLOW_QUERY_MS > 0 or settings.METRICS_ENABLED:
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+engine = create_engine()
 
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -0,0 +1,33 @@
+from sqlalchemy import JSON
+from sqlalchemy.types import TypeDecorator
+
+
+class Embedding(TypeDecorator):
+    """
+    Fixed-size float vector: a pgvector column on PostgreSQL, JSON elsewhere
+    (SQLite), where similarity search falls back to NumPy.
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self, dim: int):
+        super().__init__(none_as_null=True)
+        self.dim = dim
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            from pgvector.sqlalchemy import Vector
+
+            return dialect.type_descriptor(Vector(self.dim))
+        return dialect.type_descriptor(JSON(none_as_null=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return [float(x) for x in value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return [float(x) for x in value]
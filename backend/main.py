@@ -1,9 +1,19 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 
+from api.metrics import FirstRequestMiddleware, MetricsMiddleware
 from api.v1.api import api_router
+from core import metrics
 from core.config import settings
+from services import pdf_service, startup
+from services.llm_cache import llm_cache
+from services.llm_client import get_llm_client
+from services.single_flight import single_flight
+from services.task_queue import local_queue, queue_backend
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -24,8 +34,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(FirstRequestMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -36,23 +51,57 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    200 once startup warm-up has finished and the schema is at head; 503
+    (with the current step timings) until then.
+    """
+    details = startup.state.details()
+    return JSONResponse(details, status_code=200 if startup.state.ready else 503)
+
+@app.get("/health/cache")
+async def cache_stats():
+    """
+    Hit/miss counters of the LLM response cache, per operation.
+    """
+    return llm_cache.stats()
+
+@app.get("/health/llm")
+async def llm_stats():
+    """
+    LLM client state: in-flight calls, circuit breaker state, retry/hedge
+    counters, breaker transitions and deduplicated (single-flight) requests.
+    """
+    return {**get_llm_client().stats(), "single_flight": single_flight.stats()}
 
-# Auto-run migrations on startup (for Render)
-from alembic.config import Config
-from alembic import command
-import os
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint: request, DB, PDF and LLM latency histograms,
+    token counts, cache and queue gauges, error counters. Per process.
+    """
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+
+_warm_up_task = None
 
 @app.on_event("startup")
 async def startup_event():
-    # Only run if we are in production or seemingly so
-    # Adjust condition as needed, or just run it always for this simple app
-    try:
-        print("Running database migrations...")
-        alembic_cfg = Config("alembic.ini")
-        command.upgrade(alembic_cfg, "head")
-        print("Migrations completed successfully.")
-    except Exception as e:
-        print(f"Migration failed: {e}")
+    # Migrations and client setup run in the background; /ready reports when they're done
+    global _warm_up_task
+    if queue_backend() == "local":
+        await local_queue.start()
+        print(f"Started {local_queue.workers} in-process task workers.")
+    _warm_up_task = asyncio.create_task(startup.warm_up())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if _warm_up_task is not None and not _warm_up_task.done():
+        _warm_up_task.cancel()
+        await asyncio.gather(_warm_up_task, return_exceptions=True)
+    await local_queue.stop()
+    pdf_service.shutdown_executor()
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
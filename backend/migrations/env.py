@@ -12,21 +12,30 @@ from alembic import context
 config = context.config
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
+# This line sets up loggers basically. Loggers that already exist (e.g. the
+# slow query log) stay enabled when migrations run inside the app process.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
 from db.base import Base
 target_metadata = Base.metadata
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Full-text search objects (FTS5 tables and their shadow tables, tsvector
+    # columns and indexes) live outside the models; see the Full_text_search revision
+    if type_ == "table":
+        return "_fts" not in name
+    return not (name or "").endswith("search_vector")
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,
@@ -57,6 +66,7 @@ def do_run_migrations(connection: Connection) -> None:
     context.configure(
         connection=connection, 
         target_metadata=target_metadata,
+        include_object=include_object,
         render_as_batch=True
     )
 
@@ -0,0 +1,28 @@
+"""Resume_content_hash
+
+Revision ID: 3d9a7c5e1f20
+Revises: 8c1f4e2a9b7d
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d9a7c5e1f20'
+down_revision = '8c1f4e2a9b7d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resume_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_content_hash'))
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,54 @@
+"""Vector_embeddings
+
+Revision ID: 5b2e8f0c4a61
+Revises: 3d9a7c5e1f20
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e8f0c4a61'
+down_revision = '3d9a7c5e1f20'
+branch_labels = None
+depends_on = None
+
+EMBEDDING_DIM = 256
+
+
+def upgrade() -> None:
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    if is_postgres:
+        from pgvector.sqlalchemy import Vector
+
+        op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        vector_type = Vector(EMBEDDING_DIM)
+    else:
+        vector_type = sa.JSON()
+
+    # The old resume.embedding was an unused String placeholder
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.add_column(sa.Column('embedding', vector_type, nullable=True))
+
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('embedding', vector_type, nullable=True))
+
+    if is_postgres:
+        op.execute("CREATE INDEX ix_job_embedding_hnsw ON job USING hnsw (embedding vector_cosine_ops)")
+        op.execute("CREATE INDEX ix_resume_embedding_hnsw ON resume USING hnsw (embedding vector_cosine_ops)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_resume_embedding_hnsw")
+        op.execute("DROP INDEX IF EXISTS ix_job_embedding_hnsw")
+
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_column('embedding')
+
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.add_column(sa.Column('embedding', sa.String(), nullable=True))
@@ -0,0 +1,34 @@
+"""Resume_analysis_status
+
+Revision ID: 8c1f4e2a9b7d
+Revises: 2fada66dce5d
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1f4e2a9b7d'
+down_revision = '2fada66dce5d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_status', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('analysis_attempts', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('analysis_error', sa.Text(), nullable=True))
+
+    # Resumes uploaded before the background pipeline were analyzed inline
+    op.execute("UPDATE resume SET analysis_status = 'COMPLETED', analysis_attempts = 1 WHERE is_analyzed")
+    op.execute("UPDATE resume SET analysis_status = 'PENDING', analysis_attempts = 0 WHERE analysis_status IS NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_column('analysis_error')
+        batch_op.drop_column('analysis_attempts')
+        batch_op.drop_column('analysis_status')
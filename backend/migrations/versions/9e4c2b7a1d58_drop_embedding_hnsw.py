@@ -0,0 +1,31 @@
+"""Drop_embedding_hnsw
+
+Revision ID: 9e4c2b7a1d58
+Revises: f3b8d2e5c417
+Create Date: 2026-10-19 11:00:00.000000
+
+The HNSW indexes from 5b2e8f0c4a61 were never used: job search scans one
+user's rows exactly (see services.vector_index.search_jobs) and resume
+embeddings are only read by id. Dropping them saves their build cost on
+every insert and update.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4c2b7a1d58'
+down_revision = 'f3b8d2e5c417'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_resume_embedding_hnsw")
+        op.execute("DROP INDEX IF EXISTS ix_job_embedding_hnsw")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE INDEX ix_job_embedding_hnsw ON job USING hnsw (embedding vector_cosine_ops)")
+        op.execute("CREATE INDEX ix_resume_embedding_hnsw ON resume USING hnsw (embedding vector_cosine_ops)")
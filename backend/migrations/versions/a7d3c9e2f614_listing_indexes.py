@@ -0,0 +1,34 @@
+"""Listing_indexes
+
+Revision ID: a7d3c9e2f614
+Revises: 5b2e8f0c4a61
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3c9e2f614'
+down_revision = '5b2e8f0c4a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.create_index('ix_job_user_created', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_job_user_status_created', ['user_id', 'status', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.create_index('ix_resume_user_created', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_index('ix_resume_user_created')
+
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_index('ix_job_user_status_created')
+        batch_op.drop_index('ix_job_user_created')
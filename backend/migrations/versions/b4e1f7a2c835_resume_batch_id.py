@@ -0,0 +1,28 @@
+"""Resume_batch_id
+
+Revision ID: b4e1f7a2c835
+Revises: a7d3c9e2f614
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1f7a2c835'
+down_revision = 'a7d3c9e2f614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('batch_id', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resume_batch_id'), ['batch_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_batch_id'))
+        batch_op.drop_column('batch_id')
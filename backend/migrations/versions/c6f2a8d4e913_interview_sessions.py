@@ -0,0 +1,47 @@
+"""Interview_sessions
+
+Revision ID: c6f2a8d4e913
+Revises: b4e1f7a2c835
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f2a8d4e913'
+down_revision = 'b4e1f7a2c835'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('interviewsession',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=True),
+    sa.Column('job_title', sa.String(), nullable=False),
+    sa.Column('job_description', sa.Text(), nullable=True),
+    sa.Column('questions', sa.JSON(), nullable=False),
+    sa.Column('answers', sa.JSON(), nullable=True),
+    sa.Column('evaluations', sa.JSON(), nullable=True),
+    sa.Column('overall_score', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('interviewsession', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_interviewsession_id'), ['id'], unique=False)
+        batch_op.create_index('ix_interviewsession_user_created', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('interviewsession', schema=None) as batch_op:
+        batch_op.drop_index('ix_interviewsession_user_created')
+        batch_op.drop_index(batch_op.f('ix_interviewsession_id'))
+
+    op.drop_table('interviewsession')
@@ -0,0 +1,86 @@
+"""Full_text_search
+
+Revision ID: d8b3f1e6a2c7
+Revises: c6f2a8d4e913
+Create Date: 2026-10-18 21:00:00.000000
+
+SQLite: external-content FTS5 tables (job_fts, resume_fts) kept in step by
+triggers. Batch migrations that recreate job or resume on SQLite drop those
+triggers; recreate them afterwards (see _create_sqlite_triggers).
+PostgreSQL: a generated tsvector column with a GIN index on each table.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f1e6a2c7'
+down_revision = 'c6f2a8d4e913'
+branch_labels = None
+depends_on = None
+
+# table -> (FTS columns, bm25 weight per column); user_id is indexed so a
+# search can be restricted to one user inside the MATCH, weight 0 so it doesn't rank
+FTS_TABLES = {
+    'job': (('user_id', 'title', 'company', 'description'), (0.0, 10.0, 5.0, 1.0)),
+    'resume': (('user_id', 'filename', 'raw_text'), (0.0, 5.0, 1.0)),
+}
+
+TSVECTORS = {
+    'job': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    'resume': (
+        "setweight(to_tsvector('english', coalesce(filename, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(raw_text, '')), 'C')"
+    ),
+}
+
+
+def _create_sqlite_triggers(table: str, columns) -> None:
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    op.execute(f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END")
+    op.execute(f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END")
+    # Only when indexed columns change; status or embedding updates leave the index alone
+    op.execute(f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN {delete_old} {insert_new} END")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, expression in TSVECTORS.items():
+            op.execute(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({expression}) STORED")
+            op.execute(f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)")
+        return
+
+    for table, (columns, weights) in FTS_TABLES.items():
+        fts = f'{table}_fts'
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(columns)}, content='{table}', content_rowid='id', "
+            # Prefixes up to 4 characters are indexed: services.search only prefix-matches those
+            "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3 4')"
+        )
+        # Persist the column weights used by ORDER BY rank
+        op.execute(f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({', '.join(map(str, weights))})')")
+        _create_sqlite_triggers(table, columns)
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for table in TSVECTORS:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+        return
+
+    for table in FTS_TABLES:
+        fts = f'{table}_fts'
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {fts}")
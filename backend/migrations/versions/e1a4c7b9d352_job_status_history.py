@@ -0,0 +1,131 @@
+"""Job_status_history
+
+Revision ID: e1a4c7b9d352
+Revises: d8b3f1e6a2c7
+Create Date: 2026-10-18 23:00:00.000000
+
+Adds the status history and the per-user aggregates behind /jobs/stats, and
+backfills them from existing jobs: one history row each, in its current
+status since it was created.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a4c7b9d352'
+down_revision = 'd8b3f1e6a2c7'
+branch_labels = None
+depends_on = None
+
+# As in services.job_stats at the time of this revision
+PIPELINE = ('SAVED', 'APPLIED', 'INTERVIEWING', 'OFFER')
+IMPLIES = {'REJECTED': 'APPLIED'}
+UNSET = 'UNSET'
+
+
+def _reached(key):
+    stages = {key}
+    furthest = IMPLIES.get(key, key)
+    if furthest in PIPELINE:
+        stages.update(PIPELINE[:PIPELINE.index(furthest) + 1])
+    return stages
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    job = sa.table('job', sa.column('id', sa.Integer), sa.column('user_id', sa.Integer),
+                   sa.column('status', sa.String), sa.column('created_at', sa.DateTime(timezone=True)))
+    event = sa.table('jobstatusevent', sa.column('user_id', sa.Integer), sa.column('job_id', sa.Integer),
+                     sa.column('to_status', sa.String), sa.column('changed_at', sa.DateTime(timezone=True)))
+    stage = sa.table('jobstagestat', sa.column('user_id', sa.Integer), sa.column('status', sa.String),
+                     sa.column('job_count', sa.Integer), sa.column('reached_count', sa.Integer),
+                     sa.column('exited_count', sa.Integer), sa.column('exited_seconds', sa.Float),
+                     sa.column('entered_epoch_sum', sa.Float))
+    weekly = sa.table('jobweeklystat', sa.column('user_id', sa.Integer), sa.column('week_start', sa.Date),
+                      sa.column('applied_count', sa.Integer))
+
+    now = datetime.now(timezone.utc)
+    stages = defaultdict(lambda: {'job_count': 0, 'reached_count': 0, 'entered_epoch_sum': 0.0})
+    weeks = defaultdict(int)
+    events = []
+    for job_id, user_id, status, created_at in bind.execute(sa.select(job.c.id, job.c.user_id, job.c.status, job.c.created_at)):
+        created_at = created_at or now
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        key = status or UNSET
+        stages[user_id, key]['job_count'] += 1
+        stages[user_id, key]['entered_epoch_sum'] += created_at.timestamp()
+        for reached in _reached(key):
+            stages[user_id, reached]['reached_count'] += 1
+        if 'APPLIED' in _reached(key):
+            day = created_at.date()
+            weeks[user_id, day - timedelta(days=day.weekday())] += 1
+        events.append({'user_id': user_id, 'job_id': job_id, 'to_status': status, 'changed_at': created_at})
+        if len(events) >= 1000:
+            bind.execute(event.insert(), events)
+            events = []
+    if events:
+        bind.execute(event.insert(), events)
+    if stages:
+        bind.execute(stage.insert(), [
+            {'user_id': user_id, 'status': key, 'exited_count': 0, 'exited_seconds': 0.0, **values}
+            for (user_id, key), values in stages.items()
+        ])
+    if weeks:
+        bind.execute(weekly.insert(), [
+            {'user_id': user_id, 'week_start': week, 'applied_count': count}
+            for (user_id, week), count in weeks.items()
+        ])
+
+
+def upgrade() -> None:
+    op.create_table('jobstatusevent',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('from_status', sa.String(), nullable=True),
+    sa.Column('to_status', sa.String(), nullable=True),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('jobstatusevent', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_jobstatusevent_id'), ['id'], unique=False)
+        batch_op.create_index('ix_jobstatusevent_job_changed', ['job_id', 'changed_at', 'id'], unique=False)
+
+    op.create_table('jobstagestat',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('job_count', sa.Integer(), nullable=False),
+    sa.Column('reached_count', sa.Integer(), nullable=False),
+    sa.Column('exited_count', sa.Integer(), nullable=False),
+    sa.Column('exited_seconds', sa.Float(), nullable=False),
+    sa.Column('entered_epoch_sum', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'status')
+    )
+    op.create_table('jobweeklystat',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('applied_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'week_start')
+    )
+
+    _backfill()
+
+
+def downgrade() -> None:
+    op.drop_table('jobweeklystat')
+    op.drop_table('jobstagestat')
+
+    with op.batch_alter_table('jobstatusevent', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobstatusevent_job_changed')
+        batch_op.drop_index(batch_op.f('ix_jobstatusevent_id'))
+
+    op.drop_table('jobstatusevent')
@@ -0,0 +1,37 @@
+"""Job_skill_terms
+
+Revision ID: f3b8d2e5c417
+Revises: e1a4c7b9d352
+Create Date: 2026-10-19 10:00:00.000000
+
+Stored term counts per job and per-user document frequencies for
+/jobs/scores. Existing jobs are indexed on first use (services.job_terms).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2e5c417'
+down_revision = 'e1a4c7b9d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A plain ADD COLUMN: recreating job on SQLite would drop the job_fts triggers
+    op.add_column('job', sa.Column('skill_terms', sa.JSON(), nullable=True))
+
+    op.create_table('jobtermstat',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(), nullable=False),
+    sa.Column('job_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'term')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('jobtermstat')
+    # Native DROP COLUMN (SQLite 3.35+) for the same reason
+    op.drop_column('job', 'skill_terms')
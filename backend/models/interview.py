@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Index, Integer, String, JSON, ForeignKey, DateTime, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from db.base_class import Base
+
+class InterviewSession(Base):
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("job.id", ondelete="SET NULL"), nullable=True) # Optional: practice for a tracked job
+    
+    job_title = Column(String, nullable=False)
+    job_description = Column(Text, nullable=True)
+    questions = Column(JSON, nullable=False) # ["question", ...]
+    answers = Column(JSON, nullable=True) # Same length as questions, null for unanswered
+    evaluations = Column(JSON, nullable=True) # Same length as questions, {"feedback", "score", "suggested_improvement"} or null
+    overall_score = Column(Integer, nullable=True) # Mean score of the evaluated answers
+    status = Column(String, default="IN_PROGRESS") # IN_PROGRESS, EVALUATED
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    user = relationship("User", back_populates="interview_sessions")
+    
+    __table_args__ = (
+        Index("ix_interviewsession_user_created", "user_id", "created_at", "id"),
+    )
+
+# Add backref to User model
+from models.user import User
+User.interview_sessions = relationship("InterviewSession", back_populates="user", cascade="all, delete-orphan")
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Index, Integer, String, JSON, ForeignKey, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from core.config import settings
 from db.base_class import Base
+from db.types import Embedding
 
 class Job(Base):
     id = Column(Integer, primary_key=True, index=True)
@@ -14,11 +16,19 @@ class Job(Base):
     salary_range = Column(String, nullable=True)
     job_url = Column(String, nullable=True)
     description = Column(Text, nullable=True)
+    embedding = Column(Embedding(settings.EMBEDDING_DIM), nullable=True) # Cleared when title/company/description change
+    skill_terms = Column(JSON(none_as_null=True), nullable=True) # {term: count} for match scoring (services.job_terms)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="jobs")
+    
+    __table_args__ = (
+        # Keyset pagination (api.pagination), unfiltered and by status
+        Index("ix_job_user_created", "user_id", "created_at", "id"),
+        Index("ix_job_user_status_created", "user_id", "status", "created_at", "id"),
+    )
 
 # Add backref to User model
 from models.user import User
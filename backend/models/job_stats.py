@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Index, Integer, String
+from db.base_class import Base
+
+class JobStatusEvent(Base):
+    """
+    One row per status a job entered, creation included (from_status null).
+    """
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    job_id = Column(Integer, ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    from_status = Column(String, nullable=True)
+    to_status = Column(String, nullable=True)
+    changed_at = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        Index("ix_jobstatusevent_job_changed", "job_id", "changed_at", "id"),
+    )
+
+class JobStageStat(Base):
+    """
+    Per-user running totals for one status, updated with each job change
+    (services.job_stats) so /jobs/stats never scans the job table.
+    """
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    job_count = Column(Integer, nullable=False, default=0) # Jobs in this status now
+    reached_count = Column(Integer, nullable=False, default=0) # Jobs that ever got this far (funnel)
+    exited_count = Column(Integer, nullable=False, default=0) # Finished stays in this status
+    exited_seconds = Column(Float, nullable=False, default=0.0) # Total length of the finished stays
+    entered_epoch_sum = Column(Float, nullable=False, default=0.0) # Sum of entry times (Unix) of the current stays
+
+class JobWeeklyStat(Base):
+    """
+    Jobs that reached APPLIED, per user and week (starting Monday, UTC).
+    """
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    week_start = Column(Date, primary_key=True)
+    applied_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+from db.base_class import Base
+
+class JobTermStat(Base):
+    """
+    Per-user document frequencies for match scoring: how many of the user's
+    indexed jobs contain `term` (services.job_terms). The row with the empty
+    term counts the indexed jobs themselves.
+    """
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    term = Column(String, primary_key=True)
+    job_count = Column(Integer, nullable=False, default=0)
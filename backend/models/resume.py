@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, JSON, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Index, Integer, String, JSON, ForeignKey, DateTime, Boolean, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from core.config import settings
 from db.base_class import Base
+from db.types import Embedding
 
 class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
@@ -9,18 +11,27 @@ class Resume(Base):
     file_path = Column(String, nullable=False)
     filename = Column(String, nullable=False)
     content_type = Column(String, nullable=False)
+    content_hash = Column(String(64), index=True, nullable=True) # SHA-256 of the uploaded file
+    batch_id = Column(String(32), index=True, nullable=True) # Set for uploads made via /resumes/batch
     
     # Analysis Data
     raw_text = Column(String, nullable=True)
     parsed_content = Column(JSON, nullable=True) # AI extracted structured data
-    embedding = Column(String, nullable=True) # Placeholder for vector (pgvector needs specific type)
+    embedding = Column(Embedding(settings.EMBEDDING_DIM), nullable=True)
     
     is_analyzed = Column(Boolean(), default=False)
+    analysis_status = Column(String, default="PENDING") # PENDING, PROCESSING, RETRYING, COMPLETED, FAILED
+    analysis_attempts = Column(Integer, default=0)
+    analysis_error = Column(Text, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     user = relationship("User", back_populates="resumes")
+    
+    __table_args__ = (
+        Index("ix_resume_user_created", "user_id", "created_at", "id"),
+    )
 
 # Add backref to User model (circular import handling usually needed, but for now just defining here)
 from models.user import User
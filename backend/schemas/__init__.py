@@ -1,4 +1,7 @@
 from .token import Token, TokenPayload
 from .user import User, UserCreate, UserInDB, UserUpdate
-from .resume import Resume, ResumeCreate, ResumeDetail
-from .job import Job, JobCreate, JobUpdate
+from .resume import Resume, ResumeBatch, ResumeBatchError, ResumeBatchProgress, ResumeCreate, ResumeDetail, ResumeStatus, ResumeSummary
+from .job import Job, JobCreate, JobUpdate, JobMatch, JobScore, JobSummary, JobImportError, JobImportResult, JobStats
+from .ai import AnswerEvaluation, AnswerEvaluations, ColdEmail, InterviewQuestions, ResumeAnalysis, TailoredResume
+from .interview import InterviewAnswer, InterviewAnswers, InterviewEvaluation, InterviewSession, InterviewSessionCreate, InterviewSessionSummary
+from .search import SearchHit
@@ -0,0 +1,94 @@
+from typing import Any, List
+from pydantic import BaseModel, Field, RootModel, field_validator, model_validator
+
+# Expected shapes of LLM output, one model per ai_service operation. Fields
+# have defaults so a response missing optional parts still validates; a
+# response of the wrong shape does not.
+
+class LenientModel(BaseModel):
+    @model_validator(mode="before")
+    @classmethod
+    def drop_nulls(cls, data: Any) -> Any:
+        # Models often emit null for "unknown"; let the defaults apply
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value is not None}
+        return data
+
+class PersonalInfo(LenientModel):
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    linkedin: str = ""
+    location: str = ""
+
+class Education(LenientModel):
+    institution: str = ""
+    degree: str = ""
+    start_date: str = ""
+    end_date: str = ""
+    gpa: str = ""
+
+class Experience(LenientModel):
+    company: str = ""
+    title: str = ""
+    start_date: str = ""
+    end_date: str = ""
+    description: str = ""
+    skills_used: List[str] = []
+
+class Skills(LenientModel):
+    technical: List[str] = []
+    soft: List[str] = []
+    tools: List[str] = []
+
+class Project(LenientModel):
+    name: str = ""
+    description: str = ""
+    technologies: List[str] = []
+
+class Certification(LenientModel):
+    name: str = ""
+    issuer: str = ""
+    date: str = ""
+
+class ResumeAnalysis(LenientModel):
+    personal_info: PersonalInfo = PersonalInfo()
+    education: List[Education] = []
+    experience: List[Experience] = []
+    skills: Skills = Skills()
+    projects: List[Project] = []
+    certifications: List[Certification] = []
+
+class InterviewQuestions(RootModel[List[str]]):
+    root: List[str] = Field(min_length=1)
+
+    @field_validator("root", mode="before")
+    @classmethod
+    def question_texts(cls, value: Any) -> Any:
+        # Accept {"questions": [...]} and [{"question": "..."}] as well
+        if isinstance(value, dict) and isinstance(value.get("questions"), list):
+            value = value["questions"]
+        if isinstance(value, list):
+            value = [item.get("question", "") if isinstance(item, dict) else item for item in value]
+            value = [item for item in value if item]
+        return value
+
+class AnswerEvaluation(LenientModel):
+    feedback: str
+    score: int = Field(ge=0, le=100)
+    suggested_improvement: str = ""
+
+class IndexedEvaluation(AnswerEvaluation):
+    index: int = Field(ge=0)
+
+class AnswerEvaluations(LenientModel):
+    evaluations: List[IndexedEvaluation]
+
+class TailoredResume(LenientModel):
+    tailored_summary: str
+    key_improvements: List[str] = []
+    tailored_content_preview: str = ""
+
+class ColdEmail(LenientModel):
+    subject: str
+    body: str
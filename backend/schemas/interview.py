@@ -0,0 +1,39 @@
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+class InterviewSessionCreate(BaseModel):
+    job_title: Optional[str] = None
+    job_description: str = ""
+    job_id: Optional[int] = None # Take title and description from a tracked job
+
+class InterviewAnswer(BaseModel):
+    question_index: int = Field(ge=0)
+    answer: str
+
+class InterviewAnswers(BaseModel):
+    answers: List[InterviewAnswer] = []
+
+class InterviewEvaluation(BaseModel):
+    feedback: str
+    score: int
+    suggested_improvement: str = ""
+
+class InterviewSessionSummary(BaseModel):
+    id: int
+    user_id: int
+    job_id: Optional[int] = None
+    job_title: str
+    status: Optional[str] = None
+    overall_score: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class InterviewSession(InterviewSessionSummary):
+    job_description: Optional[str] = None
+    questions: List[str]
+    answers: List[Optional[str]] = []
+    evaluations: List[Optional[InterviewEvaluation]] = []
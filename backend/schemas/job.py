@@ -1,5 +1,5 @@
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime
 from pydantic import BaseModel
 
 class JobBase(BaseModel):
@@ -30,3 +30,64 @@ class JobInDBBase(JobBase):
 
 class Job(JobInDBBase):
     pass
+
+class JobSummary(BaseModel):
+    """
+    List item without the description; fetch /jobs/{id} for that.
+    """
+    id: int
+    user_id: int
+    title: str
+    company: str
+    location: Optional[str] = None
+    status: Optional[str] = None
+    salary_range: Optional[str] = None
+    job_url: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class JobMatch(BaseModel):
+    job: Job
+    score: float
+
+class JobScore(BaseModel):
+    resume_id: int
+    job_id: int
+    score: float
+    matched_skills: List[str] = []
+    missing_skills: List[str] = []
+
+class JobImportError(BaseModel):
+    row: int
+    error: str
+
+class JobImportResult(BaseModel):
+    created: int
+    ids: List[int] = []
+    errors: List[JobImportError] = []
+
+class JobStageStats(BaseModel):
+    status: str
+    count: int # Jobs in this status now
+    reached: int # Jobs that have ever been in (or, for pipeline stages, past) this status
+    avg_days_in_stage: Optional[float] = None # Over finished stays
+    avg_days_current: Optional[float] = None # Time so far for the jobs in this status now
+
+class JobFunnelStep(BaseModel):
+    stage: str
+    reached: int
+    conversion: Optional[float] = None # reached / reached of the previous stage
+
+class JobWeeklyApplications(BaseModel):
+    week_start: date # Monday, UTC
+    applied: int
+
+class JobStats(BaseModel):
+    total: int
+    by_status: List[JobStageStats] = []
+    funnel: List[JobFunnelStep] = []
+    weekly_applications: List[JobWeeklyApplications] = []
+    applications_per_week: float = 0.0
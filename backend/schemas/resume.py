@@ -1,4 +1,4 @@
-from typing import Optional, Any
+from typing import List, Optional, Any
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -13,16 +13,52 @@ class ResumeInDBBase(ResumeBase):
     id: int
     user_id: int
     is_analyzed: bool
+    analysis_status: Optional[str] = None
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class ResumeSummary(ResumeInDBBase):
+    """
+    List item without the heavy analysis columns; fetch /resumes/{id} for those.
+    """
+    pass
+
 class Resume(ResumeInDBBase):
     raw_text: Optional[str] = None
     parsed_content: Optional[Any] = None
 
 
 class ResumeDetail(Resume):
-    pass
+    analysis_error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+class ResumeStatus(BaseModel):
+    id: int
+    is_analyzed: bool
+    analysis_status: Optional[str] = None
+    analysis_attempts: Optional[int] = None
+    analysis_error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class ResumeBatchError(BaseModel):
+    filename: str
+    error: str
+
+class ResumeBatch(BaseModel):
+    batch_id: str
+    total: int
+    resume_ids: List[int] = []
+    errors: List[ResumeBatchError] = []
 
+class ResumeBatchProgress(BaseModel):
+    batch_id: str
+    total: int
+    pending: int
+    processing: int
+    completed: int
+    failed: int
+    done: bool
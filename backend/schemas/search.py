@@ -0,0 +1,17 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class SearchHit(BaseModel):
+    """
+    One match. title_highlight and snippet mark matched words with
+    <mark></mark> and are not HTML-escaped otherwise.
+    """
+    type: str # job or resume
+    id: int
+    title: str # Job title or resume filename
+    subtitle: Optional[str] = None # Company, for jobs
+    title_highlight: str
+    snippet: str = "" # Best-matching excerpt of the description or resume text
+    score: float
+    created_at: Optional[datetime] = None
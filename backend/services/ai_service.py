@@ -1,92 +1,118 @@
-import google.generativeai as genai
-import json
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, RootModel, ValidationError
+
 from core.config import settings
+from core.metrics import record_error
+from schemas import AnswerEvaluation, AnswerEvaluations, ColdEmail, InterviewQuestions, ResumeAnalysis, TailoredResume
+from services.json_extract import JSONExtractError, JSONExtractor, extract_json
+from services.llm_cache import llm_cache, make_key
+from services.llm_client import LLMError, get_llm_client
+from services.single_flight import single_flight
+from services.prompt_budget import fit_resume, fit_text
+
+# Bump an operation's version whenever its prompt changes, so cached
+# results produced by the old prompt are no longer served.
+PROMPT_VERSIONS = {
+    "analyze_resume": "3",
+    "generate_interview_questions": "3",
+    "evaluate_interview_answer": "3",
+    "evaluate_interview_answers": "1",
+    "tailor_resume": "3",
+    "generate_cold_email": "3",
+}
+
+
+# Expected output of each operation; responses are validated against these
+OUTPUT_MODELS: Dict[str, Type[BaseModel]] = {
+    "analyze_resume": ResumeAnalysis,
+    "generate_interview_questions": InterviewQuestions,
+    "evaluate_interview_answer": AnswerEvaluation,
+    "evaluate_interview_answers": AnswerEvaluations,
+    "tailor_resume": TailoredResume,
+    "generate_cold_email": ColdEmail,
+}
+
 
-# Only configure if API key is provided
-model = None
-if settings.GOOGLE_API_KEY:
+def validate_output(operation: str, value: Any) -> Any:
     try:
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
-        model = genai.GenerativeModel('gemini-flash-latest')
-        print("✓ Google AI configured successfully")
-    except Exception as e:
-        print(f"⚠ Warning: Could not configure Google AI: {e}")
-        model = None
-else:
-    print("⚠ Warning: No GOOGLE_API_KEY found. AI features will be disabled.")
+        return OUTPUT_MODELS[operation].model_validate(value).model_dump()
+    except ValidationError as e:
+        raise ValueError(f"Response for {operation} did not match the expected format: {e}")
 
-async def analyze_resume(text: str) -> dict:
+
+def expected_openers(operation: str) -> str:
+    # Object outputs skip stray [brackets] in prose; list outputs accept either
+    return "[{" if issubclass(OUTPUT_MODELS[operation], RootModel) else "{"
+
+
+def parse_output(operation: str, text: str) -> Any:
     """
-    Analyze resume text using AI. Returns basic structure if AI is not available.
+    Extract the first JSON value from model output (single pass, tolerant of
+    fences and prose) and validate it against the operation's model.
     """
-    # If no AI model available, return basic structure
-    if not model:
-        print("⚠ AI analysis skipped - no API key configured")
-        return {
-            "personal_info": {"name": "", "email": "", "phone": "", "linkedin": "", "location": ""},
-            "education": [],
-            "experience": [],
-            "skills": {"technical": [], "soft": [], "tools": []},
-            "projects": [],
-            "certifications": [],
-            "note": "AI analysis unavailable - please configure GOOGLE_API_KEY for full analysis"
-        }
-    
-    prompt = """
-    You are an expert Resume Parser. Extract the following information from the resume text into a strict JSON format.
-    
-    Structure:
-    {
-        "personal_info": {"name": "", "email": "", "phone": "", "linkedin": "", "location": ""},
-        "education": [{"institution": "", "degree": "", "start_date": "", "end_date": "", "gpa": ""}],
-        "experience": [{"company": "", "title": "", "start_date": "", "end_date": "", "description": "", "skills_used": []}],
-        "skills": {"technical": [], "soft": [], "tools": []},
-        "projects": [{"name": "", "description": "", "technologies": []}],
-        "certifications": [{"name": "", "issuer": "", "date": ""}]
-    }
-    
-    Resume Text:
-    """ + text
-    
-import re
+    return validate_output(operation, extract_json(text, expected_openers(operation)))
 
-def extract_json(text: str) -> dict:
+async def generate_json(operation: str, prompt: str, inputs: Sequence[Any]) -> Any:
     """
-    Robustly extract JSON from text using regex, handling potential markdown blocks or extra text.
+    Run a prompt through the LLM and parse the result, serving repeated
+    (operation, inputs) pairs from the response cache. Identical requests
+    that arrive while one is running share its call (single-flight). Errors
+    propagate and are never cached.
     """
-    try:
-        # First try direct JSON parse
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # Try to find JSON block code
-    if "```" in text:
-        # Remove ```json and ``` wrapping
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*', '', text)
-        try:
-            return json.loads(text.strip())
-        except json.JSONDecodeError:
-            pass
-
-    # Regex to find the first { ... } object (non-greedy)
-    # This matches the outermost braces
-    match = re.search(r'(\{.*\})', text, re.DOTALL)
-    if match:
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            pass
-            
-    raise ValueError("Could not extract valid JSON from response")
+    llm = get_llm_client()
+    key = make_key(operation, PROMPT_VERSIONS[operation], llm.model_name, *inputs)
+    cached = await llm_cache.get(operation, key)
+    if cached is not None:
+        return cached
+
+    async def _call() -> Any:
+        response = await llm.generate(prompt, operation=operation, json_mode=True)
+        result = parse_output(operation, response.text)
+        # Cached before the flight ends so waiters on other workers find it
+        await llm_cache.set(operation, key, result)
+        return result
+
+    return await single_flight.run(key, _call, lambda: llm_cache.get(operation, key, record=False))
+
+async def stream_json(operation: str, prompt: str, inputs: Sequence[Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming counterpart of generate_json. Yields ("token", {"text": ...})
+    events as the model produces output, then one ("result", parsed) event.
+    A cache hit, or a duplicate of a request already in flight, yields the
+    result event only.
+    """
+    llm = get_llm_client()
+    key = make_key(operation, PROMPT_VERSIONS[operation], llm.model_name, *inputs)
+    cached = await llm_cache.get(operation, key)
+    if cached is not None:
+        yield "result", cached
+        return
+
+    async with single_flight.flight(key, lambda: llm_cache.get(operation, key, record=False)) as flight:
+        if not flight.leader:
+            yield "result", flight.result
+            return
+
+        extractor = JSONExtractor(expected_openers(operation))
+        async for text in llm.stream(prompt, operation=operation, json_mode=True):
+            extractor.feed(text)
+            yield "token", {"text": text}
+        if not extractor.done:
+            raise JSONExtractError("Could not extract valid JSON from response")
+        result = validate_output(operation, extractor.value)
+        await llm_cache.set(operation, key, result)
+        flight.resolve(result)
+    yield "result", result
 
 async def analyze_resume(text: str) -> dict:
     """
     Analyze resume text using AI. Returns basic structure if AI is not available.
     """
     # If no AI model available, return basic structure
-    if not model:
+    llm = get_llm_client()
+    if not llm.enabled:
         print("⚠ AI analysis skipped - no API key configured")
         return {
             "personal_info": {"name": "", "email": "", "phone": "", "linkedin": "", "location": ""},
@@ -112,59 +138,46 @@ async def analyze_resume(text: str) -> dict:
     }
     
     Resume Text:
-    """ + text
+    """ + fit_resume(text, "analyze_resume")
     
     try:
-        response = model.generate_content(prompt)
-        return extract_json(response.text)
+        return await generate_json("analyze_resume", prompt, [text])
     except Exception as e:
         print(f"Error in AI analysis: {e}")
+        record_error("ai_service", e)
         return {
             "error": f"Failed to parse resume with AI: {str(e)}",
             "raw_text_preview": text[:500] + "..." if len(text) > 500 else text
         }
 
 async def generate_interview_questions(job_title: str, job_description: str) -> list:
-    if not model:
+    llm = get_llm_client()
+    if not llm.enabled:
         return [{"question": "Describe yourself and your experience."}]
     
     prompt = f"""
-    Generate 5 technical and behavioral interview questions for a {job_title} role.
+    Generate 5 technical and behavioral interview questions for a {fit_text(job_title, "generate_interview_questions", "job_title")} role.
     
     Job Description:
-    {job_description[:1000]}...
+    {fit_text(job_description, "generate_interview_questions", "job_description")}
     
     Return ONLY a raw JSON list of strings. Example: ["Question 1", "Question 2"]
     """
     
     try:
-        response = model.generate_content(prompt)
-        # Handle list response specifically if needed, but json.loads usually handles lists too
-        text = response.text
-        # Clean up for list if extract_json looks for object
-        try:
-            # Try direct parse
-            return json.loads(text)
-        except:
-             # Try regex for list [ ... ]
-            match = re.search(r'(\[.*\])', text, re.DOTALL)
-            if match:
-                return json.loads(match.group(1))
-            return extract_json(text) # Fallback to object finder (might fail for list)
-            
+        return await generate_json("generate_interview_questions", prompt, [job_title, job_description])
+
     except Exception as e:
         print(f"Error generating questions: {e}")
+        record_error("ai_service", e)
         return ["Describe yourself.", "Why do you want this job?"]
 
-async def evaluate_interview_answer(question: str, answer: str) -> dict:
-    if not model:
-        return {"feedback": "AI Not configured", "score": 0}
-
-    prompt = f"""
+def evaluate_answer_prompt(question: str, answer: str) -> str:
+    return f"""
     You are an expert interviewer. Evaluate the candidate's answer.
     
-    Question: {question}
-    Answer: {answer}
+    Question: {fit_text(question, "evaluate_interview_answer", "question")}
+    Answer: {fit_text(answer, "evaluate_interview_answer", "answer")}
     
     Provide feedback in JSON format:
     {{
@@ -173,27 +186,104 @@ async def evaluate_interview_answer(question: str, answer: str) -> dict:
         "suggested_improvement": "How to make it better..."
     }}
     """
-    
+
+async def evaluate_interview_answer(question: str, answer: str) -> dict:
+    llm = get_llm_client()
+    if not llm.enabled:
+        return {"feedback": "AI Not configured", "score": 0}
+
     try:
-        response = model.generate_content(prompt)
-        return extract_json(response.text)
+        return await generate_json("evaluate_interview_answer", evaluate_answer_prompt(question, answer), [question, answer])
     except Exception as e:
         print(f"Error evaluating answer: {e}")
+        record_error("ai_service", e)
         return {"feedback": f"Error processing answer: {str(e)}", "score": 0}
 
-async def tailor_resume(resume_text: str, job_description: str) -> dict:
-    if not model:
-        return {"error": "AI not configured"}
+def evaluate_answers_prompt(pairs: Sequence[Tuple[str, str]]) -> str:
+    items = "\n\n".join(
+        f"[{index}] Question: {fit_text(question, 'evaluate_interview_answer', 'question')}\n"
+        f"Answer: {fit_text(answer, 'evaluate_interview_answer', 'answer')}"
+        for index, (question, answer) in enumerate(pairs)
+    )
+    return f"""
+    You are an expert interviewer. Evaluate each of the candidate's answers below on its own.
     
-    prompt = f"""
+{items}
+    
+    Provide feedback in JSON format, one entry per answer, using the answer's index:
+    {{
+        "evaluations": [
+            {{
+                "index": 0,
+                "feedback": "Constructive feedback string...",
+                "score": 85 (0-100),
+                "suggested_improvement": "How to make it better..."
+            }}
+        ]
+    }}
+    """
+
+async def evaluate_interview_answers(pairs: Sequence[Tuple[str, str]]) -> List[Optional[dict]]:
+    """
+    Evaluate several (question, answer) pairs with one structured LLM call per
+    group of INTERVIEW_EVAL_BATCH_SIZE answers; groups run concurrently.
+    Results are cached per answer, so answers evaluated before (alone or in an
+    earlier batch) cost nothing. Answers missing from a batch response are
+    evaluated individually; those that still fail come back as None rather
+    than a placeholder evaluation. Raises LLMError when AI is not configured.
+    """
+    llm = get_llm_client()
+    if not llm.enabled:
+        raise LLMError("AI not configured")
+
+    operation = "evaluate_interview_answer"
+    keys = [make_key(operation, PROMPT_VERSIONS[operation], llm.model_name, q, a) for q, a in pairs]
+    results: List[Optional[dict]] = [await llm_cache.get(operation, key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    size = max(settings.INTERVIEW_EVAL_BATCH_SIZE, 1)
+
+    async def _evaluate_group(group: List[int]) -> None:
+        group_pairs = [pairs[i] for i in group]
+        try:
+            batch = await generate_json(
+                "evaluate_interview_answers",
+                evaluate_answers_prompt(group_pairs),
+                [text for pair in group_pairs for text in pair],
+            )
+            by_index = {item.pop("index"): item for item in (dict(e) for e in batch["evaluations"])}
+        except Exception as e:
+            print(f"Error evaluating answers in batch: {e}")
+            record_error("ai_service", e)
+            by_index = {}
+
+        async def _one(position: int, i: int) -> None:
+            evaluation = by_index.get(position)
+            if evaluation is None:
+                question, answer = pairs[i]
+                try:
+                    results[i] = await generate_json(operation, evaluate_answer_prompt(question, answer), [question, answer])
+                except Exception as e:
+                    print(f"Error evaluating answer: {e}")
+                    record_error("ai_service", e)
+            else:
+                await llm_cache.set(operation, keys[i], evaluation)
+                results[i] = evaluation
+
+        await asyncio.gather(*[_one(position, i) for position, i in enumerate(group)])
+
+    await asyncio.gather(*[_evaluate_group(missing[i:i + size]) for i in range(0, len(missing), size)])
+    return results
+
+def tailor_prompt(resume_text: str, job_description: str) -> str:
+    return f"""
     You are an expert Resume Tailor. Rewrite the summary and key experience bullet points of the resume to better match the job description.
     Focus on keywords, relevant skills, and impact.
     
     Job Description:
-    {job_description[:2000]}
+    {fit_text(job_description, "tailor_resume", "job_description")}
     
     Resume Text:
-    {resume_text[:2000]}
+    {fit_resume(resume_text, "tailor_resume", focus=job_description)}
     
     Return JSON format:
     {{
@@ -202,26 +292,30 @@ async def tailor_resume(resume_text: str, job_description: str) -> dict:
         "tailored_content_preview": "Rewritten text..."
     }}
     """
+
+async def tailor_resume(resume_text: str, job_description: str) -> dict:
+    llm = get_llm_client()
+    if not llm.enabled:
+        return {"error": "AI not configured"}
+    
+    prompt = tailor_prompt(resume_text, job_description)
     
     try:
-        response = model.generate_content(prompt)
-        return extract_json(response.text)
+        return await generate_json("tailor_resume", prompt, [resume_text, job_description])
     except Exception as e:
         print(f"Error tailoring resume: {e}")
+        record_error("ai_service", e)
         return {"error": f"Failed to tailor resume: {str(e)}"}
 
-async def generate_cold_email(resume_text: str, recipient_name: str, company_name: str, job_title: str) -> dict:
-    if not model:
-        return {"error": "AI not configured"}
-        
-    prompt = f"""
+def cold_email_prompt(resume_text: str, recipient_name: str, company_name: str, job_title: str) -> str:
+    return f"""
     You are an expert Career Coach. Write a compelling, professional cold email to a hiring manager.
     
     Context:
-    - Candidate Resume Summary: {resume_text[:1000]}...
-    - Recipient: {recipient_name}
-    - Company: {company_name}
-    - Target Role: {job_title}
+    - Candidate Resume: {fit_resume(resume_text, "generate_cold_email", focus=job_title)}
+    - Recipient: {fit_text(recipient_name, "generate_cold_email", "recipient_name")}
+    - Company: {fit_text(company_name, "generate_cold_email", "company_name")}
+    - Target Role: {fit_text(job_title, "generate_cold_email", "job_title")}
     
     The email should be:
     - Concise (under 150 words)
@@ -235,10 +329,36 @@ async def generate_cold_email(resume_text: str, recipient_name: str, company_nam
         "body": "Email Body..."
     }}
     """
+
+async def generate_cold_email(resume_text: str, recipient_name: str, company_name: str, job_title: str) -> dict:
+    llm = get_llm_client()
+    if not llm.enabled:
+        return {"error": "AI not configured"}
+        
+    prompt = cold_email_prompt(resume_text, recipient_name, company_name, job_title)
     
     try:
-        response = model.generate_content(prompt)
-        return extract_json(response.text)
+        return await generate_json(
+            "generate_cold_email", prompt, [resume_text, recipient_name, company_name, job_title]
+        )
     except Exception as e:
         print(f"Error generating cold email: {e}")
+        record_error("ai_service", e)
         return {"error": f"Failed to generate email: {str(e)}"}
+
+def stream_interview_evaluation(question: str, answer: str) -> AsyncIterator[Tuple[str, Any]]:
+    return stream_json(
+        "evaluate_interview_answer", evaluate_answer_prompt(question, answer), [question, answer]
+    )
+
+def stream_tailored_resume(resume_text: str, job_description: str) -> AsyncIterator[Tuple[str, Any]]:
+    return stream_json(
+        "tailor_resume", tailor_prompt(resume_text, job_description), [resume_text, job_description]
+    )
+
+def stream_cold_email(resume_text: str, recipient_name: str, company_name: str, job_title: str) -> AsyncIterator[Tuple[str, Any]]:
+    return stream_json(
+        "generate_cold_email",
+        cold_email_prompt(resume_text, recipient_name, company_name, job_title),
+        [resume_text, recipient_name, company_name, job_title],
+    )
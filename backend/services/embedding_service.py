@@ -0,0 +1,123 @@
+"""
+Text embeddings for resumes and jobs.
+
+The embedder is pluggable (EMBEDDING_BACKEND). The default hashing embedder is
+deterministic and runs offline: tokens and token bigrams are hashed into
+EMBEDDING_DIM signed buckets and the vector is L2-normalized, so cosine
+similarity reflects shared vocabulary.
+"""
+import hashlib
+import re
+from typing import List, Optional, Protocol, Sequence
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.job import Job
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+class Embedder(Protocol):
+    dim: int
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        ...
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _bucket(self, feature: str):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if (value >> 63) else -1.0
+
+    def embed_one(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = _TOKEN.findall((text or "").lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            index, sign = self._bucket(feature)
+            vector[index] += sign
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+class GeminiEmbedder:
+    def __init__(self, api_key: str, model: str, dim: int):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self.model = model
+        self.dim = dim
+
+    async def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        result = await self._genai.embed_content_async(
+            model=self.model,
+            content=list(texts),
+            output_dimensionality=self.dim,
+        )
+        return result["embedding"]
+
+
+_embedder: Optional[Embedder] = None
+
+
+def get_embedder() -> Embedder:
+    global _embedder
+    if _embedder is None:
+        if settings.EMBEDDING_BACKEND == "gemini" and settings.GOOGLE_API_KEY:
+            _embedder = GeminiEmbedder(settings.GOOGLE_API_KEY, settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM)
+        else:
+            _embedder = HashingEmbedder(settings.EMBEDDING_DIM)
+    return _embedder
+
+
+def job_text(job) -> str:
+    return "\n".join(part for part in (job.title, job.company, job.description) if part)
+
+
+async def embed_texts(texts: Sequence[str]) -> List[List[float]]:
+    """
+    Embed texts in batches of EMBEDDING_BATCH_SIZE.
+    """
+    embedder = get_embedder()
+    vectors: List[List[float]] = []
+    batch = settings.EMBEDDING_BATCH_SIZE
+    for start in range(0, len(texts), batch):
+        vectors.extend(await embedder.embed(texts[start:start + batch]))
+    return vectors
+
+
+async def embed_missing_jobs(db: AsyncSession, user_id: int) -> int:
+    """
+    Compute embeddings for a user's jobs that do not have one yet. Returns the
+    number of jobs embedded; the caller commits. updated_at is left untouched,
+    since the embedding is derived data.
+    """
+    result = await db.execute(
+        select(Job.id, Job.title, Job.company, Job.description, Job.updated_at)
+        .where(Job.user_id == user_id, Job.embedding.is_(None))
+    )
+    jobs = result.all()
+    if not jobs:
+        return 0
+    vectors = await embed_texts([job_text(job) for job in jobs])
+    await db.execute(
+        update(Job),
+        [
+            {"id": job.id, "embedding": vector, "updated_at": job.updated_at}
+            for job, vector in zip(jobs, vectors)
+        ],
+    )
+    return len(jobs)
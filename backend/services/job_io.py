@@ -0,0 +1,155 @@
+"""
+CSV / NDJSON import and export of tracked jobs.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from db.session import async_session
+from models.job import Job
+from schemas import JobCreate
+from services import job_stats, job_terms
+
+FORMATS = ("csv", "ndjson")
+EXPORT_COLUMNS = (
+    "id", "title", "company", "location", "status", "salary_range",
+    "job_url", "description", "created_at", "updated_at",
+)
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class ImportTooLargeError(Exception):
+    pass
+
+
+def detect_format(content_type: Optional[str]) -> str:
+    return "csv" if content_type and "csv" in content_type else "ndjson"
+
+
+def _error_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+    )
+
+
+def validate_row(data: Any) -> JobCreate:
+    if not isinstance(data, dict):
+        raise ValueError("expected an object")
+    # CSV has no nulls: empty cells mean "not set"
+    return JobCreate(**{key: value for key, value in data.items() if key and value not in ("", None)})
+
+
+def parse_rows(lines: Iterable[str], fmt: str) -> Iterable[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (row number, raw row) pairs. Row numbers are 1-based data rows
+    (the CSV header is not counted); blank NDJSON lines are skipped.
+    """
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            yield number, row
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, e
+
+
+async def import_jobs(
+    db: AsyncSession,
+    user_id: int,
+    text: str,
+    fmt: str,
+    chunk_size: int = settings.JOB_IMPORT_CHUNK_SIZE,
+    max_rows: int = settings.JOB_IMPORT_MAX_ROWS,
+) -> Dict[str, Any]:
+    """
+    Validate rows with JobCreate and insert the valid ones in chunks of
+    multi-row INSERT ... RETURNING. Invalid rows are reported, not fatal.
+    The caller commits, so the whole import is one transaction.
+    """
+    ids: List[int] = []
+    errors: List[Dict[str, Any]] = []
+    batch: List[Dict[str, Any]] = []
+
+    async def flush() -> None:
+        if batch:
+            result = await db.execute(insert(Job).returning(Job.id, Job.status), batch)
+            created = result.all()
+            ids.extend(job_id for job_id, _ in created)
+            await job_stats.jobs_created(db, user_id, created)
+            await job_terms.jobs_indexed(db, user_id, [row["skill_terms"] for row in batch])
+            batch.clear()
+
+    for number, row in parse_rows(text.splitlines(keepends=True), fmt):
+        if number > max_rows:
+            raise ImportTooLargeError(f"Imports are limited to {max_rows} rows")
+        if isinstance(row, Exception):
+            errors.append({"row": number, "error": f"invalid JSON: {row}"})
+            continue
+        try:
+            job_in = validate_row(row)
+        except ValidationError as e:
+            errors.append({"row": number, "error": _error_message(e)})
+            continue
+        except (ValueError, TypeError) as e:
+            errors.append({"row": number, "error": str(e)})
+            continue
+
+        batch.append({**job_in.model_dump(), "user_id": user_id, "skill_terms": job_terms.term_counts(job_in)})
+        if len(batch) >= chunk_size:
+            await flush()
+    await flush()
+
+    return {"created": len(ids), "ids": ids, "errors": errors}
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def export_jobs(user_id: int, fmt: str, batch_size: int = 500) -> AsyncIterator[str]:
+    """
+    Stream a user's jobs from a server-side cursor. Opens its own session:
+    the response body is produced after the request's session is closed.
+    """
+    columns = [getattr(Job, name) for name in EXPORT_COLUMNS]
+    query = (
+        select(*columns)
+        .where(Job.user_id == user_id)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
+
+    async with async_session() as db:
+        result = await db.stream(query)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(EXPORT_COLUMNS)
+
+        async for rows in result.partitions():
+            for row in rows:
+                values = [_export_value(value) for value in row]
+                if fmt == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values))) + "\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
@@ -0,0 +1,246 @@
+"""
+Job pipeline analytics from incrementally maintained aggregates.
+
+Every job insert, status change and delete records JobStatusEvent rows and
+applies the matching deltas to the user's JobStageStat rows (one per status)
+and JobWeeklyStat rows (one per week with applications), in the same
+transaction as the job change. /jobs/stats then reads those few small rows
+instead of grouping the job table; time spent in the current status comes
+from the sum of entry times (count * now - sum).
+
+Funnel: pipeline stages are ordered SAVED < APPLIED < INTERVIEWING < OFFER,
+and a job counts as having reached every stage up to the furthest it has
+been in (a job created as INTERVIEWING was also saved and applied for).
+REJECTED implies APPLIED. Other statuses only count for themselves.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.job import Job
+from models.job_stats import JobStageStat, JobStatusEvent, JobWeeklyStat
+
+PIPELINE = ("SAVED", "APPLIED", "INTERVIEWING", "OFFER")
+IMPLIES = {"REJECTED": "APPLIED"}
+UNSET = "UNSET" # Stats key for jobs whose status is null
+
+STAGE_COUNTERS = ("job_count", "reached_count", "exited_count", "exited_seconds", "entered_epoch_sum")
+
+
+def stage_key(status: Optional[str]) -> str:
+    return status or UNSET
+
+
+def reached_stages(status: Optional[str]) -> Set[str]:
+    key = stage_key(status)
+    stages = {key}
+    furthest = IMPLIES.get(key, key)
+    if furthest in PIPELINE:
+        stages.update(PIPELINE[:PIPELINE.index(furthest) + 1])
+    return stages
+
+
+def week_start(moment: datetime) -> date:
+    day = _utc(moment).date()
+    return day - timedelta(days=day.weekday())
+
+
+def _utc(moment: datetime) -> datetime:
+    # SQLite returns timestamps without a zone; they are stored in UTC
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment
+
+
+def _epoch(moment: datetime) -> float:
+    return _utc(moment).timestamp()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class StatsDelta:
+    """
+    Changes to one user's aggregates, accumulated in memory and written by apply().
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.stages: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.weeks: Dict[date, int] = defaultdict(int)
+
+    def enter(self, status: Optional[str], at: datetime, reached_before: Set[str], sign: int = 1) -> Set[str]:
+        """
+        A job entered `status` at `at`; returns the stages it has now reached.
+        """
+        stage = self.stages[stage_key(status)]
+        stage["job_count"] += sign
+        stage["entered_epoch_sum"] += sign * _epoch(at)
+        newly = reached_stages(status) - reached_before
+        for key in newly:
+            self.stages[key]["reached_count"] += sign
+        if "APPLIED" in newly:
+            self.weeks[week_start(at)] += sign
+        return reached_before | newly
+
+    def leave(self, status: Optional[str], entered_at: datetime, at: datetime, sign: int = 1) -> None:
+        stage = self.stages[stage_key(status)]
+        stage["job_count"] -= sign
+        stage["entered_epoch_sum"] -= sign * _epoch(entered_at)
+        stage["exited_count"] += sign
+        stage["exited_seconds"] += sign * (_epoch(at) - _epoch(entered_at))
+
+    def forget(self, events: List[JobStatusEvent]) -> None:
+        """
+        Undo everything a job's history contributed (the job is being deleted).
+        """
+        reached: Set[str] = set()
+        for previous, event in zip([None] + events[:-1], events):
+            if previous is not None:
+                self.leave(previous.to_status, previous.changed_at, event.changed_at, sign=-1)
+            reached = self.enter(event.to_status, event.changed_at, reached, sign=-1)
+
+    async def apply(self, db: AsyncSession) -> None:
+        # Upserts of increments: concurrent changes for the same user add up instead of overwriting
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        for status, changes in self.stages.items():
+            values = {
+                column: int(changes.get(column, 0)) if column.endswith("_count") else changes.get(column, 0.0)
+                for column in STAGE_COUNTERS
+            }
+            statement = insert(JobStageStat).values(user_id=self.user_id, status=status, **values)
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[JobStageStat.user_id, JobStageStat.status],
+                set_={column: getattr(JobStageStat, column) + statement.excluded[column] for column in STAGE_COUNTERS},
+            ))
+        for week, count in self.weeks.items():
+            if not count:
+                continue
+            statement = insert(JobWeeklyStat).values(user_id=self.user_id, week_start=week, applied_count=count)
+            await db.execute(statement.on_conflict_do_update(
+                index_elements=[JobWeeklyStat.user_id, JobWeeklyStat.week_start],
+                set_={"applied_count": JobWeeklyStat.applied_count + statement.excluded.applied_count},
+            ))
+
+
+async def _history(db: AsyncSession, job_id: int) -> List[JobStatusEvent]:
+    result = await db.execute(
+        select(JobStatusEvent)
+        .where(JobStatusEvent.job_id == job_id)
+        .order_by(JobStatusEvent.changed_at, JobStatusEvent.id)
+    )
+    return list(result.scalars().all())
+
+
+async def jobs_created(db: AsyncSession, user_id: int, jobs: Iterable[Tuple[int, Optional[str]]]) -> None:
+    """
+    Record new jobs, given as (id, status) pairs, e.g. from a bulk import.
+    """
+    at = _now()
+    delta = StatsDelta(user_id)
+    events = []
+    for job_id, status in jobs:
+        delta.enter(status, at, set())
+        events.append(JobStatusEvent(user_id=user_id, job_id=job_id, to_status=status, changed_at=at))
+    db.add_all(events)
+    await delta.apply(db)
+
+
+async def job_created(db: AsyncSession, job: Job) -> None:
+    """
+    Call after the job has been flushed (it needs an id), before committing.
+    """
+    await jobs_created(db, job.user_id, [(job.id, job.status)])
+
+
+async def job_status_changed(db: AsyncSession, job: Job, old_status: Optional[str]) -> None:
+    if stage_key(old_status) == stage_key(job.status):
+        return
+    at = _now()
+    events = await _history(db, job.id)
+    entered_at = events[-1].changed_at if events else (job.created_at or at)
+    reached: Set[str] = set()
+    for event in events:
+        reached |= reached_stages(event.to_status)
+
+    delta = StatsDelta(job.user_id)
+    delta.leave(old_status, entered_at, at)
+    delta.enter(job.status, at, reached)
+    db.add(JobStatusEvent(user_id=job.user_id, job_id=job.id, from_status=old_status, to_status=job.status, changed_at=at))
+    await delta.apply(db)
+
+
+async def job_deleted(db: AsyncSession, job: Job) -> None:
+    delta = StatsDelta(job.user_id)
+    delta.forget(await _history(db, job.id))
+    # SQLite doesn't enforce the ON DELETE CASCADE
+    await db.execute(delete(JobStatusEvent).where(JobStatusEvent.job_id == job.id))
+    await delta.apply(db)
+
+
+def _stage_order(status: str) -> Tuple[int, str]:
+    if status in PIPELINE:
+        return PIPELINE.index(status), status
+    return len(PIPELINE) + (status not in IMPLIES), status
+
+
+def _days(seconds: float) -> float:
+    return round(seconds / 86400, 2)
+
+
+async def get_stats(db: AsyncSession, user_id: int, weeks: int = 12) -> Dict[str, Any]:
+    now = _now()
+    result = await db.execute(select(JobStageStat).where(JobStageStat.user_id == user_id))
+    stages = {row.status: row for row in result.scalars().all()}
+
+    first_week = week_start(now) - timedelta(weeks=weeks - 1)
+    result = await db.execute(
+        select(JobWeeklyStat.week_start, JobWeeklyStat.applied_count)
+        .where(JobWeeklyStat.user_id == user_id, JobWeeklyStat.week_start >= first_week)
+    )
+    applied = dict(result.all())
+
+    by_status = []
+    for status in sorted(stages, key=_stage_order):
+        row = stages[status]
+        if not (row.job_count or row.reached_count or row.exited_count):
+            continue
+        by_status.append({
+            "status": status,
+            "count": row.job_count,
+            "reached": row.reached_count,
+            "avg_days_in_stage": _days(row.exited_seconds / row.exited_count) if row.exited_count else None,
+            "avg_days_current": (
+                _days((row.job_count * now.timestamp() - row.entered_epoch_sum) / row.job_count)
+                if row.job_count else None
+            ),
+        })
+
+    funnel = []
+    previous = None
+    for stage in PIPELINE:
+        reached = stages[stage].reached_count if stage in stages else 0
+        funnel.append({
+            "stage": stage,
+            "reached": reached,
+            "conversion": round(reached / previous, 4) if previous else None,
+        })
+        previous = reached
+
+    velocity = [
+        {"week_start": week, "applied": applied.get(week, 0)}
+        for week in (first_week + timedelta(weeks=i) for i in range(weeks))
+    ]
+    return {
+        "total": sum(row.job_count for row in stages.values()),
+        "by_status": by_status,
+        "funnel": funnel,
+        "weekly_applications": velocity,
+        "applications_per_week": round(sum(item["applied"] for item in velocity) / weeks, 2),
+    }
@@ -0,0 +1,133 @@
+"""
+Stored skill-term vectors for match scoring (services.match_service).
+
+A job's term counts are extracted when it is created or its title, company
+or description change, and kept in job.skill_terms. JobTermStat holds, per
+user, how many indexed jobs contain each term (the document frequencies
+behind IDF) and, under the empty term, how many jobs are indexed; it is
+updated in the same transaction as the job. /jobs/scores then reads stored
+counts instead of scanning job text. Jobs from before the column existed
+are indexed on first use (index_missing_jobs).
+
+Changing SKILL_VOCABULARY only takes effect for jobs indexed afterwards; to
+re-index, set job.skill_terms to null and empty jobtermstat.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.job import Job
+from models.job_term import JobTermStat
+from services.embedding_service import job_text
+from services.match_service import MatchEngine, get_engine
+
+ALL_JOBS = "" # JobTermStat.term of the indexed-jobs count
+
+
+def term_counts(job) -> Dict[str, int]:
+    return dict(get_engine().term_counts(job_text(job)))
+
+
+class TermsDelta:
+    """
+    Document-frequency changes for one user, written by apply().
+    """
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, terms: Optional[Mapping[str, int]], sign: int = 1) -> None:
+        if terms is None:
+            return # Never indexed, so never counted
+        self.counts[ALL_JOBS] += sign
+        for term in terms:
+            self.counts[term] += sign
+
+    async def apply(self, db: AsyncSession) -> None:
+        # Upserts of increments, as in services.job_stats
+        if db.bind.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        rows = [
+            {"user_id": self.user_id, "term": term, "job_count": count}
+            for term, count in self.counts.items() if count
+        ]
+        if not rows:
+            return
+        statement = insert(JobTermStat)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[JobTermStat.user_id, JobTermStat.term],
+                set_={"job_count": JobTermStat.job_count + statement.excluded.job_count},
+            ),
+            rows,
+        )
+
+
+async def jobs_indexed(db: AsyncSession, user_id: int, term_lists: Iterable[Mapping[str, int]]) -> None:
+    """
+    Count new jobs inserted with skill_terms already set (e.g. a bulk import).
+    """
+    delta = TermsDelta(user_id)
+    for terms in term_lists:
+        delta.add(terms)
+    await delta.apply(db)
+
+
+async def index_job(db: AsyncSession, job: Job) -> None:
+    """
+    (Re)compute a job's terms; call on create and whenever its text changes, before committing.
+    """
+    delta = TermsDelta(job.user_id)
+    delta.add(job.skill_terms, sign=-1)
+    job.skill_terms = term_counts(job)
+    delta.add(job.skill_terms)
+    await delta.apply(db)
+
+
+async def job_deleted(db: AsyncSession, job: Job) -> None:
+    delta = TermsDelta(job.user_id)
+    delta.add(job.skill_terms, sign=-1)
+    await delta.apply(db)
+
+
+async def index_missing_jobs(db: AsyncSession, user_id: int) -> int:
+    """
+    Index a user's jobs that have no stored terms yet. Returns the number of
+    jobs indexed; the caller commits. updated_at is left untouched, since the
+    terms are derived data.
+    """
+    result = await db.execute(
+        select(Job.id, Job.title, Job.company, Job.description, Job.updated_at)
+        .where(Job.user_id == user_id, Job.skill_terms.is_(None))
+    )
+    delta = TermsDelta(user_id)
+    indexed = 0
+    for job in result.all():
+        terms = term_counts(job)
+        # Only the request that actually fills the column counts the job
+        filled = await db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.skill_terms.is_(None))
+            .values(skill_terms=terms, updated_at=job.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        if filled.rowcount:
+            delta.add(terms)
+            indexed += 1
+    await delta.apply(db)
+    return indexed
+
+
+async def load_idf(db: AsyncSession, user_id: int, engine: MatchEngine) -> np.ndarray:
+    result = await db.execute(
+        select(JobTermStat.term, JobTermStat.job_count).where(JobTermStat.user_id == user_id)
+    )
+    document_frequency = dict(result.all())
+    return engine.idf(document_frequency, document_frequency.pop(ALL_JOBS, 0))
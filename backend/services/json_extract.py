@@ -0,0 +1,103 @@
+"""
+Single-pass extraction of the first JSON object or array in model output.
+
+Models sometimes wrap JSON in markdown fences or prose. Rather than trying
+json.loads on several rewritten copies of the text, the extractor scans the
+characters once, tracking string/escape state and bracket depth, and parses
+the first balanced span. A span that fails to parse is rescanned from just
+after its opening bracket, so text with many failing nested spans can cost
+more than one pass. It can be fed incrementally while a response streams in.
+"""
+import json
+from typing import Any, List
+
+OPENERS = {"{": "}", "[": "]"}
+
+
+class JSONExtractError(ValueError):
+    pass
+
+
+class JSONExtractor:
+    """
+    Feed text chunks; `value` is set as soon as the first top-level JSON
+    value closes. `expect` limits the opening brackets considered ("{", "[").
+    """
+
+    def __init__(self, expect: str = "{["):
+        self.expect = expect
+        self.value: Any = None
+        self.done = False
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume a chunk. Returns True once a complete value has been parsed.
+        """
+        text = chunk
+        while text and not self.done:
+            text = self._scan(text)
+        return self.done
+
+    def _scan(self, text: str) -> str:
+        """
+        Scan text until a value completes or a candidate span fails. A failed
+        span is scanned again from just after its opening bracket, so a valid
+        value nested in it (e.g. {note: {"a": 1}}) is still found; the text
+        left to scan is returned.
+        """
+        for pos, char in enumerate(text):
+            if not self._stack:
+                if char in self.expect:
+                    self._stack.append(OPENERS[char])
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in OPENERS:
+                self._stack.append(OPENERS[char])
+            elif char in "}]":
+                if char != self._stack[-1]:
+                    # Mismatched bracket: this span isn't JSON
+                    return self._restart(text[pos + 1:])
+                self._stack.pop()
+                if not self._stack:
+                    try:
+                        self.value = json.loads("".join(self._buffer))
+                    except json.JSONDecodeError:
+                        # e.g. [citation] in prose
+                        return self._restart(text[pos + 1:])
+                    self.done = True
+                    return ""
+        return ""
+
+    def _restart(self, rest: str) -> str:
+        retry = "".join(self._buffer[1:]) + rest
+        self._reset()
+        return retry
+
+    def _reset(self) -> None:
+        self._buffer = []
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+
+
+def extract_json(text: str, expect: str = "{[") -> Any:
+    extractor = JSONExtractor(expect)
+    if not extractor.feed(text):
+        raise JSONExtractError("Could not extract valid JSON from response")
+    return extractor.value
+
@@ -0,0 +1,152 @@
+"""
+Content-addressed cache for LLM results.
+
+Keys are a SHA-256 of (operation, prompt template version, model name,
+normalized inputs), so the same resume/job pair hits the cache no matter how
+often it is submitted. Lookups go to an in-process LRU first and then to Redis
+(when REDIS_URL is set); a Redis hit is copied back into the LRU.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from core.cache import TTLCache
+from core.config import settings
+from core.metrics import callback
+from core.redis import get_redis
+
+
+@dataclass
+class CachePolicy:
+    ttl: int  # seconds
+    max_entries: int
+
+
+POLICIES: Dict[str, CachePolicy] = {
+    "analyze_resume": CachePolicy(ttl=7 * 24 * 3600, max_entries=1000),
+    "generate_interview_questions": CachePolicy(ttl=24 * 3600, max_entries=2000),
+    "evaluate_interview_answer": CachePolicy(ttl=3600, max_entries=2000),
+    "evaluate_interview_answers": CachePolicy(ttl=3600, max_entries=500),
+    "tailor_resume": CachePolicy(ttl=24 * 3600, max_entries=2000),
+    "generate_cold_email": CachePolicy(ttl=24 * 3600, max_entries=2000),
+}
+DEFAULT_POLICY = CachePolicy(ttl=3600, max_entries=500)
+
+REDIS_PREFIX = "llm:"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    return value
+
+
+def make_key(operation: str, template_version: str, model: str, *inputs: Any) -> str:
+    payload = json.dumps(
+        [operation, template_version, model, [normalize(v) for v in inputs]],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._tiers: Dict[str, TTLCache] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _tier(self, operation: str) -> TTLCache:
+        tier = self._tiers.get(operation)
+        if tier is None:
+            policy = POLICIES.get(operation, DEFAULT_POLICY)
+            tier = self._tiers[operation] = TTLCache(policy.max_entries, policy.ttl)
+        return tier
+
+    def _count(self, operation: str, field: str) -> None:
+        stats = self._stats.setdefault(operation, {"hits": 0, "redis_hits": 0, "misses": 0})
+        stats[field] += 1
+
+    async def get(self, operation: str, key: str, record: bool = True) -> Optional[Any]:
+        """
+        Look up a result. `record=False` leaves the hit/miss counters alone
+        (used when polling for another worker's result).
+        """
+        if not self.enabled:
+            return None
+
+        tier = self._tier(operation)
+        value = tier.get(key)
+        if value is not None:
+            if record:
+                self._count(operation, "hits")
+            return value
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(REDIS_PREFIX + key)
+            except Exception as e:
+                print(f"⚠ LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                tier.set(key, value)
+                if record:
+                    self._count(operation, "redis_hits")
+                return value
+
+        if record:
+            self._count(operation, "misses")
+        return None
+
+    async def set(self, operation: str, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+
+        policy = POLICIES.get(operation, DEFAULT_POLICY)
+        self._tier(operation).set(key, value)
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                await redis.set(REDIS_PREFIX + key, json.dumps(value), ex=policy.ttl)
+            except Exception as e:
+                print(f"⚠ LLM cache Redis write failed: {e}")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for operation, stats in self._stats.items():
+            lookups = stats["hits"] + stats["redis_hits"] + stats["misses"]
+            result[operation] = {
+                **stats,
+                "entries": len(self._tier(operation)),
+                "hit_ratio": round((stats["hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0,
+            }
+        return result
+
+
+llm_cache = LLMCache(enabled=settings.LLM_CACHE_ENABLED)
+
+
+def _lookup_samples():
+    return [
+        ((operation, result), stats[field])
+        for operation, stats in llm_cache._stats.items()
+        for result, field in (("hit", "hits"), ("redis_hit", "redis_hits"), ("miss", "misses"))
+    ]
+
+
+def _hit_ratio_samples():
+    return [((operation,), stats["hit_ratio"]) for operation, stats in llm_cache.stats().items()]
+
+
+callback(
+    "llm_cache_lookups_total", "LLM response cache lookups by operation and result", _lookup_samples,
+    ("operation", "result"), kind="counter",
+)
+callback("llm_cache_hit_ratio", "LLM response cache hit ratio by operation", _hit_ratio_samples, ("operation",))
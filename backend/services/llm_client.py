@@ -0,0 +1,420 @@
+"""
+Async LLM client used by ai_service.
+
+Every Gemini call goes through LLMClient.generate (or .stream) so that no request blocks the
+event loop, the number of in-flight calls is capped, and each call has its own
+timeout. Transient provider errors are retried and tracked by a circuit
+breaker (see llm_resilience). The backend is pluggable: set LLM_BACKEND=fake to run without an API
+key (load testing, local development), or record/replay to capture real responses
+and serve them back (see llm_replay).
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Protocol
+
+from core.config import settings
+from core.metrics import callback, llm_call_seconds, llm_tokens, record_error
+from core.rate_limit import AsyncTokenBucket
+from services.llm_resilience import CircuitBreaker, CircuitOpenError, ResilienceStats, hedged, retrying
+from services.prompt_budget import count_tokens
+
+usage_log = logging.getLogger("llm.usage")
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMTimeoutError(LLMError):
+    pass
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    model: str
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+class LLMBackend(Protocol):
+    model_name: str
+
+    async def generate(self, prompt: str, operation: str, json_mode: bool = False) -> LLMResponse:
+        ...
+
+    def stream(self, prompt: str, operation: str, json_mode: bool = False) -> AsyncIterator[str]:
+        ...
+
+
+class GeminiBackend:
+    """
+    Uses the native async API of google-generativeai, so a pending call only
+    holds a coroutine, not a thread.
+    """
+
+    def __init__(self, api_key: str, model_name: str):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+
+    @staticmethod
+    def _config(json_mode: bool) -> Optional[Dict[str, Any]]:
+        # JSON mode makes the model emit bare JSON (no fences or prose)
+        return {"response_mime_type": "application/json"} if json_mode and settings.LLM_JSON_MODE else None
+
+    async def generate(self, prompt: str, operation: str, json_mode: bool = False) -> LLMResponse:
+        response = await self._model.generate_content_async(prompt, generation_config=self._config(json_mode))
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text,
+            model=self.model_name,
+            input_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+        )
+
+    async def stream(self, prompt: str, operation: str, json_mode: bool = False) -> AsyncIterator[str]:
+        response = await self._model.generate_content_async(
+            prompt, stream=True, generation_config=self._config(json_mode)
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+# Canned responses for the fake backend, keyed by ai_service operation
+FAKE_RESPONSES = {
+    "analyze_resume": {
+        "personal_info": {"name": "Jane Doe", "email": "jane@example.com", "phone": "", "linkedin": "", "location": ""},
+        "education": [{"institution": "State University", "degree": "BSc Computer Science", "start_date": "2016", "end_date": "2020", "gpa": ""}],
+        "experience": [{"company": "Acme", "title": "Software Engineer", "start_date": "2020", "end_date": "Present", "description": "Built APIs.", "skills_used": ["Python", "SQL"]}],
+        "skills": {"technical": ["Python", "SQL"], "soft": ["Communication"], "tools": ["Git"]},
+        "projects": [],
+        "certifications": [],
+    },
+    "generate_interview_questions": [
+        "Tell me about a project you are proud of.",
+        "How do you design a REST API?",
+        "Describe a time you resolved a conflict in your team.",
+        "How would you debug a slow database query?",
+        "Why do you want this role?",
+    ],
+    "evaluate_interview_answer": {
+        "feedback": "Clear answer with a concrete example.",
+        "score": 75,
+        "suggested_improvement": "Quantify the impact of your work.",
+    },
+    "evaluate_interview_answers": {
+        "evaluations": [
+            {"index": i, "feedback": "Clear answer with a concrete example.", "score": 75, "suggested_improvement": "Quantify the impact of your work."}
+            for i in range(5)
+        ],
+    },
+    "tailor_resume": {
+        "tailored_summary": "Engineer with experience matching the role.",
+        "key_improvements": ["Highlighted relevant skills"],
+        "tailored_content_preview": "Rewritten text...",
+    },
+    "generate_cold_email": {
+        "subject": "Interest in the open role",
+        "body": "Hi, I would love to chat about the role.",
+    },
+}
+
+
+class FakeBackend:
+    """
+    Offline backend returning canned JSON after a simulated latency.
+    """
+
+    def __init__(self, latency_ms: int = 0, jitter_ms: int = 0):
+        self.model_name = "fake"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+
+    async def generate(self, prompt: str, operation: str, json_mode: bool = False) -> LLMResponse:
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        text = json.dumps(FAKE_RESPONSES.get(operation, {}))
+        return LLMResponse(
+            text=text,
+            model=self.model_name,
+            input_tokens=count_tokens(prompt),
+            output_tokens=count_tokens(text),
+        )
+
+    async def stream(
+        self, prompt: str, operation: str, json_mode: bool = False, chunk_size: int = 16
+    ) -> AsyncIterator[str]:
+        text = json.dumps(FAKE_RESPONSES.get(operation, {}))
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        delay = (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000 / max(len(chunks), 1)
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+class LLMClient:
+    def __init__(
+        self,
+        backend: Optional[LLMBackend],
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        timeout: float = settings.LLM_TIMEOUT_SECONDS,
+        tokens_per_minute: int = settings.LLM_TOKENS_PER_MINUTE,
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._token_budget = AsyncTokenBucket(tokens_per_minute)
+        self.in_flight = 0
+        self.resilience = ResilienceStats()
+        self.breaker = CircuitBreaker(
+            settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RECOVERY_SECONDS, self.resilience
+        )
+        self.hedge_after = settings.LLM_HEDGE_AFTER_SECONDS
+        self.usage: Dict[str, Counter] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name if self.backend else ""
+
+    @staticmethod
+    def estimate_tokens(prompt: str) -> int:
+        return count_tokens(prompt) + settings.LLM_OUTPUT_TOKENS_ESTIMATE
+
+    def record_usage(self, operation: str, input_tokens: Optional[int], output_tokens: Optional[int], seconds: float) -> None:
+        """
+        Per-operation token and latency totals, reported by /health/llm.
+        """
+        usage = self.usage.setdefault(operation, Counter())
+        usage["calls"] += 1
+        usage["input_tokens"] += input_tokens or 0
+        usage["output_tokens"] += output_tokens or 0
+        usage["seconds"] += seconds
+        llm_call_seconds.observe(seconds, operation, "ok")
+        if input_tokens is not None:
+            llm_tokens.observe(input_tokens, operation, "input")
+        if output_tokens is not None:
+            llm_tokens.observe(output_tokens, operation, "output")
+        usage_log.debug(
+            "%s input_tokens=%s output_tokens=%s seconds=%.3f", operation, input_tokens, output_tokens, seconds
+        )
+
+    @staticmethod
+    def record_failure(operation: str, exc: BaseException, seconds: float) -> None:
+        llm_call_seconds.observe(seconds, operation, "error")
+        record_error("llm", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "breaker_state": self.breaker.state,
+            **self.resilience.snapshot(),
+            "usage": {
+                operation: {
+                    **usage,
+                    "seconds": round(usage["seconds"], 3),
+                    "avg_input_tokens": round(usage["input_tokens"] / usage["calls"], 1),
+                    "avg_output_tokens": round(usage["output_tokens"] / usage["calls"], 1),
+                }
+                for operation, usage in self.usage.items()
+            },
+        }
+
+    async def _backend_call(self, prompt: str, operation: str, json_mode: bool) -> LLMResponse:
+        """
+        One backend request, holding a concurrency slot of its own (so a
+        hedged second request is capped like any other).
+        """
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                return await self.backend.generate(prompt, operation, json_mode=json_mode)
+            finally:
+                self.in_flight -= 1
+
+    async def _attempt(self, prompt: str, operation: str, json_mode: bool, timeout: float) -> LLMResponse:
+        with self.breaker.call():
+            return await asyncio.wait_for(
+                hedged(lambda: self._backend_call(prompt, operation, json_mode), self.hedge_after, self.resilience),
+                timeout,
+            )
+
+    async def generate(
+        self, prompt: str, operation: str, timeout: Optional[float] = None, json_mode: bool = False
+    ) -> LLMResponse:
+        """
+        Run one generation under the concurrency cap and tokens-per-minute
+        budget. Each attempt (waiting for a slot included) is bounded by the
+        timeout; attempts that time out or fail transiently are retried with
+        jittered backoff, and count toward the circuit breaker, which makes
+        calls fail fast while it is open. Raises LLMTimeoutError once the last
+        attempt times out. Cancelling the caller cancels the upstream call.
+        """
+        if not self.backend:
+            raise LLMError("AI not configured")
+
+        timeout = timeout or self.timeout
+        estimate = self.estimate_tokens(prompt)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._token_budget.acquire(estimate), timeout)
+            response = await retrying(self.resilience)(self._attempt, prompt, operation, json_mode, timeout)
+        except asyncio.TimeoutError as e:
+            self.record_failure(operation, e, time.perf_counter() - started)
+            raise LLMTimeoutError(f"{operation} timed out after {timeout}s")
+        except Exception as e:
+            self.record_failure(operation, e, time.perf_counter() - started)
+            raise
+        self.record_usage(operation, response.input_tokens, response.output_tokens, time.perf_counter() - started)
+        if response.input_tokens is not None and response.output_tokens is not None:
+            self._token_budget.charge(response.input_tokens + response.output_tokens - estimate)
+        return response
+
+    async def stream(
+        self, prompt: str, operation: str, timeout: Optional[float] = None, json_mode: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Yield text chunks as the model produces them. Holds a concurrency slot
+        for the whole stream; the timeout bounds the total stream duration.
+        """
+        if not self.backend:
+            raise LLMError("AI not configured")
+
+        timeout = timeout or self.timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            await asyncio.wait_for(self._token_budget.acquire(self.estimate_tokens(prompt)), timeout)
+            await asyncio.wait_for(self._semaphore.acquire(), deadline - loop.time())
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"{operation} timed out after {timeout}s")
+
+        # Not retried: chunks already yielded can't be taken back
+        started = time.perf_counter()
+        output_tokens = 0
+        try:
+            with self.breaker.call():
+                self.in_flight += 1
+                chunks = self.backend.stream(prompt, operation, json_mode=json_mode)
+                try:
+                    while True:
+                        try:
+                            text = await asyncio.wait_for(chunks.__anext__(), deadline - loop.time())
+                        except StopAsyncIteration:
+                            break
+                        output_tokens += count_tokens(text)
+                        yield text
+                finally:
+                    self.in_flight -= 1
+                    await chunks.aclose()
+            # Streams don't report usage; these are local estimates
+            self.record_usage(operation, count_tokens(prompt), output_tokens, time.perf_counter() - started)
+        except CircuitOpenError:
+            raise
+        except asyncio.TimeoutError as e:
+            self.record_failure(operation, e, time.perf_counter() - started)
+            raise LLMTimeoutError(f"{operation} timed out after {timeout}s")
+        except Exception as e:
+            self.record_failure(operation, e, time.perf_counter() - started)
+            raise
+        finally:
+            self._semaphore.release()
+
+
+def build_backend() -> Optional[LLMBackend]:
+    if settings.LLM_BACKEND == "fake":
+        print("✓ Using fake LLM backend")
+        return FakeBackend(latency_ms=settings.FAKE_LLM_LATENCY_MS)
+
+    if settings.LLM_BACKEND == "replay":
+        # Never calls Gemini, even when GOOGLE_API_KEY is set
+        from services.llm_replay import build_replay_backend
+
+        return build_replay_backend()
+
+    if not settings.GOOGLE_API_KEY:
+        print("⚠ Warning: No GOOGLE_API_KEY found. AI features will be disabled.")
+        return None
+
+    try:
+        backend = GeminiBackend(settings.GOOGLE_API_KEY, settings.LLM_MODEL)
+        print("✓ Google AI configured successfully")
+        if settings.LLM_BACKEND == "record":
+            from services.llm_replay import RecordingBackend
+
+            print(f"✓ Recording LLM responses to {settings.LLM_CASSETTE_PATH}")
+            return RecordingBackend(backend, settings.LLM_CASSETTE_PATH)
+        return backend
+    except Exception as e:
+        print(f"⚠ Warning: Could not configure Google AI: {e}")
+        return None
+
+
+_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        _client = LLMClient(build_backend())
+    return _client
+
+
+async def init_llm_client() -> LLMClient:
+    """
+    Build the process-wide client during startup warm-up. Only the backend
+    (SDK import and configuration) is built in a thread; the client is created
+    and published on the event loop, so the global is never set from two threads.
+    """
+    global _client
+    if _client is None:
+        backend = await asyncio.to_thread(build_backend)
+        # A request may have built one while the backend was being set up
+        if _client is None:
+            _client = LLMClient(backend)
+    return _client
+
+
+def set_llm_client(client: LLMClient) -> None:
+    """
+    Swap the process-wide client (e.g. to plug a fake backend into a benchmark).
+    """
+    global _client
+    _client = client
+
+
+# Read at scrape time; reporting never builds a client (and backend) itself
+def _in_flight_samples():
+    return [((), _client.in_flight)] if _client else []
+
+
+def _breaker_samples():
+    if not _client:
+        return []
+    return [((state,), int(_client.breaker.state == state)) for state in ("closed", "open", "half_open")]
+
+
+def _resilience_samples():
+    return [((event,), count) for event, count in _client.resilience.snapshot().items()] if _client else []
+
+
+callback("llm_in_flight_calls", "LLM calls currently in flight", _in_flight_samples)
+callback("llm_circuit_breaker_state", "1 for the LLM circuit breaker's current state", _breaker_samples, ("state",))
+callback(
+    "llm_resilience_events_total", "Retries, hedges, short-circuited calls and breaker transitions",
+    _resilience_samples, ("event",), kind="counter",
+)
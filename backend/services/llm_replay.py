@@ -0,0 +1,201 @@
+"""
+Record/replay LLM backends for benchmarking without a Gemini key.
+
+LLM_BACKEND=record wraps the Gemini backend and appends every response
+(text, streamed chunks, token usage, latency) to a cassette file, one JSON
+object per line. LLM_BACKEND=replay serves responses from that cassette,
+with no network access, after a simulated latency:
+
+    recorded              the latency measured when recording (default)
+    scale:0.5             recorded latency times a factor
+    fixed:800             milliseconds
+    uniform:200:1500      milliseconds, uniformly distributed
+    lognormal:800:0.5     median milliseconds and sigma; long-tailed like real APIs
+
+Prompts are matched by hash. A prompt that was never recorded gets another
+response of the same operation (round robin), so load tests can vary their
+inputs; with LLM_REPLAY_STRICT it is an error instead.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from core.config import settings
+from services.llm_client import LLMBackend, LLMError, LLMResponse
+from services.prompt_budget import count_tokens
+
+LatencyModel = Callable[[Dict[str, Any]], float]
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def parse_latency(spec: str, rng: Optional[random.Random] = None) -> LatencyModel:
+    """
+    Turn a latency spec (see module docstring) into entry -> seconds.
+    """
+    rng = rng or random.Random()
+    kind, _, args = (spec or "recorded").partition(":")
+    arity = {"recorded": 0, "scale": 1, "fixed": 1, "uniform": 2, "lognormal": 2}
+    try:
+        params = [float(arg) for arg in args.split(":") if arg]
+    except ValueError:
+        params = None
+    if kind not in arity or params is None or len(params) != arity[kind]:
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+
+    if kind == "recorded":
+        return lambda entry: entry.get("latency_ms", 0) / 1000
+    if kind == "scale":
+        return lambda entry: entry.get("latency_ms", 0) * params[0] / 1000
+    if kind == "fixed":
+        return lambda entry: params[0] / 1000
+    if kind == "uniform":
+        low, high = params
+        return lambda entry: rng.uniform(low, high) / 1000
+    median, sigma = params
+    return lambda entry: rng.lognormvariate(math.log(median), sigma) / 1000
+
+
+class RecordingBackend:
+    """
+    Passes calls through to `inner` and appends each response to the cassette.
+    """
+
+    def __init__(self, inner: LLMBackend, path: str):
+        self.inner = inner
+        self.path = path
+        self.model_name = inner.model_name
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        # One short line per write; append mode keeps concurrent writers' lines whole
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _entry(self, prompt: str, operation: str, json_mode: bool, started: float) -> Dict[str, Any]:
+        return {
+            "operation": operation,
+            "prompt_sha256": prompt_hash(prompt),
+            "json_mode": json_mode,
+            "model": self.model_name,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "recorded_at": time.time(),
+        }
+
+    async def generate(self, prompt: str, operation: str, json_mode: bool = False) -> LLMResponse:
+        started = time.perf_counter()
+        response = await self.inner.generate(prompt, operation, json_mode=json_mode)
+        entry = self._entry(prompt, operation, json_mode, started)
+        entry.update(text=response.text, input_tokens=response.input_tokens, output_tokens=response.output_tokens)
+        await asyncio.to_thread(self._append, entry)
+        return response
+
+    async def stream(self, prompt: str, operation: str, json_mode: bool = False) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        first_chunk_ms = None
+        chunks: List[str] = []
+        async for chunk in self.inner.stream(prompt, operation, json_mode=json_mode):
+            if first_chunk_ms is None:
+                first_chunk_ms = round((time.perf_counter() - started) * 1000, 1)
+            chunks.append(chunk)
+            yield chunk
+        entry = self._entry(prompt, operation, json_mode, started)
+        entry.update(text="".join(chunks), chunks=chunks, first_chunk_ms=first_chunk_ms)
+        await asyncio.to_thread(self._append, entry)
+
+
+class ReplayBackend:
+    """
+    Serves recorded responses after a latency drawn from `latency`.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], latency: str = "recorded", strict: bool = False):
+        if not entries:
+            raise LLMError("Cassette has no recorded responses")
+        self.model_name = entries[0].get("model") or "replay"
+        self.latency = parse_latency(latency)
+        self.strict = strict
+        self._by_prompt: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_operation: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._next: Dict[str, int] = defaultdict(int)
+        for entry in entries:
+            self._by_prompt[entry["prompt_sha256"]].append(entry)
+            self._by_operation[entry["operation"]].append(entry)
+
+    @classmethod
+    def from_file(cls, path: str, latency: str = "recorded", strict: bool = False) -> "ReplayBackend":
+        with open(path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        return cls(entries, latency=latency, strict=strict)
+
+    @classmethod
+    def from_responses(cls, responses: Dict[str, Any], latency: str = "fixed:0") -> "ReplayBackend":
+        """
+        A cassette made of canned responses (e.g. llm_client.FAKE_RESPONSES),
+        for benchmarks when nothing has been recorded yet.
+        """
+        entries = [
+            {"operation": operation, "prompt_sha256": "", "model": "replay", "text": json.dumps(response)}
+            for operation, response in responses.items()
+        ]
+        return cls(entries, latency=latency)
+
+    def _lookup(self, prompt: str, operation: str) -> Dict[str, Any]:
+        candidates = [e for e in self._by_prompt.get(prompt_hash(prompt), []) if e["operation"] == operation]
+        if not candidates:
+            if self.strict:
+                raise LLMError(f"No recorded response for this {operation} prompt")
+            candidates = self._by_operation.get(operation)
+            if not candidates:
+                raise LLMError(f"No recorded responses for {operation}")
+        index = self._next[operation] % len(candidates)
+        self._next[operation] += 1
+        return candidates[index]
+
+    async def generate(self, prompt: str, operation: str, json_mode: bool = False) -> LLMResponse:
+        entry = self._lookup(prompt, operation)
+        delay = self.latency(entry)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return LLMResponse(
+            text=entry["text"],
+            model=self.model_name,
+            input_tokens=entry.get("input_tokens") or count_tokens(prompt),
+            output_tokens=entry.get("output_tokens") or count_tokens(entry["text"]),
+        )
+
+    async def stream(self, prompt: str, operation: str, json_mode: bool = False) -> AsyncIterator[str]:
+        entry = self._lookup(prompt, operation)
+        text = entry["text"]
+        chunks = entry.get("chunks") or [text[i:i + 64] for i in range(0, len(text), 64)]
+        delay = self.latency(entry)
+        # Keep the recorded shape: time to first chunk, then the rest spread evenly
+        first = delay * (entry["first_chunk_ms"] / entry["latency_ms"]) if entry.get("first_chunk_ms") and entry.get("latency_ms") else 0
+        rest = (delay - first) / max(len(chunks), 1)
+        if first > 0:
+            await asyncio.sleep(first)
+        for chunk in chunks:
+            if rest > 0:
+                await asyncio.sleep(rest)
+            yield chunk
+
+
+def build_replay_backend() -> Optional[LLMBackend]:
+    if not os.path.exists(settings.LLM_CASSETTE_PATH):
+        print(f"⚠ Warning: LLM cassette {settings.LLM_CASSETTE_PATH} not found. AI features will be disabled.")
+        return None
+    backend = ReplayBackend.from_file(
+        settings.LLM_CASSETTE_PATH, latency=settings.LLM_REPLAY_LATENCY, strict=settings.LLM_REPLAY_STRICT
+    )
+    print(f"✓ Replaying LLM responses from {settings.LLM_CASSETTE_PATH} (latency: {settings.LLM_REPLAY_LATENCY})")
+    return backend
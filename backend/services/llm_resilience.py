@@ -0,0 +1,183 @@
+"""
+Retry, circuit-breaker and hedging policies used by LLMClient.
+
+Only transient failures (rate limits, 5xx, timeouts, connection errors) are
+retried and count toward opening the breaker; request errors such as an
+invalid prompt fail immediately. Cancelled calls also count toward the
+breaker (a hung provider's calls end by being cancelled) but are never
+retried. While the breaker is open, calls fail fast instead of waiting for
+the provider's timeout.
+"""
+import asyncio
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, TypeVar
+
+from tenacity import AsyncRetrying, RetryCallState, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from core.config import settings
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Classify an exception from a backend call. google.api_core errors carry
+    the HTTP status in `.code`.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(exc, "code", None)
+    code = getattr(code, "value", code)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Failures that count toward opening the breaker: retryable ones, and cancellations.
+    """
+    return isinstance(exc, asyncio.CancelledError) or is_retryable(exc)
+
+
+class ResilienceStats:
+    """
+    Counters for retries, hedges and breaker state changes.
+    """
+
+    def __init__(self):
+        self.counters: Counter = Counter()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.counters)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive transient failures. After
+    `recovery_timeout` seconds one probe call is let through (half-open): its
+    success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float, stats: ResilienceStats):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.stats = stats
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            print(f"LLM circuit breaker: {self.state} -> {state}")
+            self.stats.incr(f"breaker_{self.state}_to_{state}")
+            self.state = state
+
+    def before_call(self) -> None:
+        if self.failure_threshold <= 0 or self.state == CLOSED:
+            return
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.stats.incr("short_circuited")
+        raise CircuitOpenError("LLM provider unavailable (circuit open)")
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probe_in_flight = False
+        self._transition(CLOSED)
+
+    def record_failure(self, exc: BaseException) -> None:
+        self._probe_in_flight = False
+        if not is_transient(exc):
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or (self.failure_threshold > 0 and self.failures >= self.failure_threshold):
+            self._opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """
+        Guard one call: fails fast while open, and records the outcome however
+        the call ends (including cancellation, or a stream closed early).
+        """
+        self.before_call()
+        try:
+            yield
+        except BaseException as e:
+            self.record_failure(e)
+            raise
+        else:
+            self.record_success()
+        finally:
+            # A probe that ended any other way must not hold the breaker half-open
+            self._probe_in_flight = False
+
+
+def retrying(stats: ResilienceStats, attempts: int = settings.LLM_RETRY_ATTEMPTS) -> AsyncRetrying:
+    def before_sleep(state: RetryCallState) -> None:
+        stats.incr("retries")
+
+    return AsyncRetrying(
+        stop=stop_after_attempt(max(attempts, 1)),
+        wait=wait_random_exponential(
+            multiplier=settings.LLM_RETRY_BACKOFF_SECONDS,
+            max=settings.LLM_RETRY_MAX_BACKOFF_SECONDS,
+        ),
+        retry=retry_if_exception(is_retryable),
+        before_sleep=before_sleep,
+        reraise=True,
+    )
+
+
+async def hedged(call: Callable[[], Awaitable[T]], hedge_after: float, stats: ResilienceStats) -> T:
+    """
+    Run `call`; if it hasn't finished after `hedge_after` seconds, start a
+    second identical call and return whichever succeeds first. Calls still
+    running when this returns, raises or is cancelled are cancelled.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        if hedge_after <= 0:
+            return await tasks[0]
+
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if done:
+            return tasks[0].result()
+
+        stats.incr("hedges")
+        tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Any = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is tasks[1]:
+                        stats.incr("hedges_won")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
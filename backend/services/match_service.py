@@ -0,0 +1,199 @@
+"""
+Local resume-to-job match scoring.
+
+Skills are matched against a keyword vocabulary (SKILL_VOCABULARY). Each
+job's term counts are extracted once, when its text is saved, and stored
+with per-user document frequencies (services.job_terms); scoring only turns
+those counts into a sparse TF-IDF matrix in CSR form (indptr/indices/data
+NumPy arrays). Resumes become dense binary IDF-weighted rows, and every
+resume/job cosine score is computed with one gather + np.add.reduceat pass,
+so scoring 1 x 10,000 or 1,000 x 1 pairs costs a single vectorized call
+instead of one LLM request per pair.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+MAX_BLOCK_CELLS = 4_000_000
+
+SKILL_VOCABULARY = [
+    # Languages
+    # (single letters and "go" are left out: too ambiguous in prose)
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", "ruby", "php",
+    "kotlin", "swift", "scala", "sql", "bash", "html", "css",
+    # Frameworks and libraries
+    "react", "next.js", "vue", "angular", "node.js", "express", "django", "flask", "fastapi", "spring",
+    "spring boot", "rails", ".net", "graphql", "rest", "grpc", "pandas", "numpy", "scikit-learn",
+    "tensorflow", "pytorch", "keras", "spark", "hadoop", "airflow", "dbt", "kafka", "celery",
+    # Data and infrastructure
+    "postgresql", "postgres", "mysql", "sqlite", "mongodb", "redis", "elasticsearch", "dynamodb",
+    "snowflake", "bigquery", "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible",
+    "linux", "git", "ci/cd", "jenkins", "github actions", "microservices", "serverless",
+    # Disciplines
+    "machine learning", "deep learning", "data science", "data engineering", "data analysis",
+    "natural language processing", "nlp", "computer vision", "statistics", "etl", "devops",
+    "distributed systems", "system design", "security", "testing", "unit testing", "agile", "scrum",
+    "product management", "project management", "ux", "ui", "figma", "excel", "tableau", "power bi",
+    # Soft skills
+    "communication", "leadership", "mentoring", "collaboration", "problem solving", "stakeholder management",
+]
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+def resume_skills(parsed_content: Any) -> List[str]:
+    """
+    Skills from an analyzed resume: skills.{technical,soft,tools} (or a flat
+    list) plus experience[].skills_used.
+    """
+    if not isinstance(parsed_content, dict):
+        return []
+    found: List[str] = []
+    skills = parsed_content.get("skills") or {}
+    groups = skills.values() if isinstance(skills, dict) else [skills]
+    for group in groups:
+        if isinstance(group, list):
+            found.extend(s for s in group if isinstance(s, str))
+    for item in parsed_content.get("experience") or []:
+        if isinstance(item, dict):
+            found.extend(s for s in item.get("skills_used") or [] if isinstance(s, str))
+    return list(dict.fromkeys(normalize_skill(s) for s in found if s.strip()))
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Regex alternation shaped as a prefix trie ("sp(?:ark|ring(?: boot)?)"),
+    which the re engine scans far faster than a flat list of alternatives.
+    Optional suffixes are greedy, so the longest term wins.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+@lru_cache(maxsize=64)
+def _matcher(vocabulary: Tuple[str, ...]) -> "re.Pattern":
+    return re.compile(rf"(?<![a-z0-9])(?:{_trie_pattern(vocabulary)})(?![a-z0-9])")
+
+
+class MatchEngine:
+    def __init__(self, vocabulary: Iterable[str] = SKILL_VOCABULARY):
+        self.vocabulary: Tuple[str, ...] = tuple(dict.fromkeys(normalize_skill(t) for t in vocabulary if t.strip()))
+        self.index: Dict[str, int] = {term: i for i, term in enumerate(self.vocabulary)}
+        self._pattern = _matcher(self.vocabulary)
+
+    def term_counts(self, text: str) -> Counter:
+        return Counter(self._pattern.findall((text or "").lower()))
+
+    def idf(self, document_frequency: Mapping[str, int], jobs: int) -> np.ndarray:
+        """
+        IDF per vocabulary term, from how many of `jobs` jobs contain each term.
+        """
+        df = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for term, count in document_frequency.items():
+            if term in self.index:
+                df[self.index[term]] = count
+        return np.log((1.0 + jobs) / (1.0 + df)) + 1.0
+
+    def job_matrix(
+        self, job_terms: Sequence[Mapping[str, int]], idf: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the L2-normalized TF-IDF CSR matrix of jobs from their stored term
+        counts. Returns (indptr, indices, data).
+        """
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for terms in job_terms:
+            for term, count in (terms or {}).items():
+                # Terms dropped from the vocabulary since the job was indexed
+                if term in self.index:
+                    indices.append(self.index[term])
+                    counts.append(count)
+            indptr.append(len(indices))
+
+        indptr_arr = np.asarray(indptr, dtype=np.int64)
+        indices_arr = np.asarray(indices, dtype=np.int64)
+        data = (1.0 + np.log(np.asarray(counts, dtype=np.float64))) * idf[indices_arr]
+
+        norms = np.sqrt(_row_sums(data * data, indptr_arr))
+        data /= np.repeat(np.where(norms == 0, 1.0, norms), np.diff(indptr_arr))
+        return indptr_arr, indices_arr, data
+
+    def resume_matrix(self, skill_lists: Sequence[Sequence[str]], idf: np.ndarray) -> np.ndarray:
+        matrix = np.zeros((len(skill_lists), len(self.vocabulary)), dtype=np.float64)
+        for row, skills in enumerate(skill_lists):
+            columns = [self.index[s] for s in skills if s in self.index]
+            matrix[row, columns] = idf[columns]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def score(
+        self, skill_lists: Sequence[Sequence[str]], job_terms: Sequence[Mapping[str, int]], idf: np.ndarray
+    ) -> np.ndarray:
+        """
+        Cosine scores between each resume's skills and each job's term counts,
+        as a (len(skill_lists), len(job_terms)) array in [0, 1].
+        """
+        indptr, indices, data = self.job_matrix(job_terms, idf)
+        resumes = self.resume_matrix(skill_lists, idf)
+        scores = np.zeros((len(skill_lists), len(job_terms)), dtype=np.float64)
+        # scores[r, j] = sum over job j's nonzeros of resumes[r, term] * weight,
+        # in blocks of resumes so the gathered array stays around MAX_BLOCK_CELLS
+        block = max(1, MAX_BLOCK_CELLS // max(len(indices), 1))
+        for start in range(0, len(skill_lists), block):
+            gathered = resumes[start:start + block][:, indices] * data
+            scores[start:start + block] = _row_sums(gathered, indptr, axis=1)
+        return scores
+
+    def explain(self, skills: Sequence[str], job_terms: Mapping[str, int], limit: int = 10) -> Tuple[List[str], List[str]]:
+        """
+        (matched, missing) skills for one pair; missing are the job's terms the
+        resume lacks, most frequent first.
+        """
+        terms = Counter({term: count for term, count in (job_terms or {}).items() if term in self.index})
+        owned = set(skills)
+        matched = [term for term in terms if term in owned]
+        missing = [term for term, _ in terms.most_common() if term not in owned][:limit]
+        return matched, missing
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> MatchEngine:
+    return MatchEngine(SKILL_VOCABULARY)
+
+
+def _row_sums(values: np.ndarray, indptr: np.ndarray, axis: int = 0) -> np.ndarray:
+    """
+    Sum each CSR row segment of values (along axis), giving 0 for empty rows.
+    """
+    rows = len(indptr) - 1
+    shape = list(values.shape)
+    shape[axis] = rows
+    result = np.zeros(shape, dtype=np.float64)
+    nonempty = np.flatnonzero(np.diff(indptr))
+    if len(nonempty):
+        sums = np.add.reduceat(values, indptr[nonempty], axis=axis)
+        if axis == 0:
+            result[nonempty] = sums
+        else:
+            result[:, nonempty] = sums
+    return result
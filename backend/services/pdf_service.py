@@ -1,8 +1,207 @@
-import pdfplumber
+"""
+PDF text extraction.
+
+Pages are laid out once with pdfminer; text-only pages (the vast majority of
+resumes) are read straight from that layout, and only pages with tables or
+graphics fall back to pdfplumber's slower, table-aware extraction. The async
+API runs extraction in a process pool so the event loop never parses PDFs.
+pdfplumber and pdfminer are imported where they are used, which is in the
+pool's worker processes, so the API process starts without them.
+
+A pool whose worker died (e.g. killed for memory) is replaced and the call
+retried once. A call that outlives PDF_TIMEOUT_SECONDS fails with
+PDFTimeoutError and the pool is replaced too, since a running parse can only
+be stopped by ending its process; calls in flight on the old pool are retried.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from core.config import settings
+from core.metrics import pdf_extraction_seconds
+
+# Pages with more vector graphics than this are treated as tables/forms
+MAX_FAST_PATH_GRAPHICS = 8
+
+
+class PDFTooLargeError(ValueError):
+    pass
+
+
+class PDFTimeoutError(ValueError):
+    pass
+
+
+def check_size(file_path: str, max_bytes: int = settings.PDF_MAX_BYTES) -> None:
+    size = os.path.getsize(file_path)
+    if size > max_bytes:
+        raise PDFTooLargeError(f"PDF is {size} bytes, limit is {max_bytes}")
+
+
+def _is_text_only(layout) -> bool:
+    from pdfminer.layout import LTCurve, LTFigure, LTImage
+
+    graphics = 0
+    for element in layout:
+        if isinstance(element, (LTFigure, LTImage)):
+            return False
+        if isinstance(element, LTCurve):  # LTLine and LTRect are curves too
+            graphics += 1
+            if graphics > MAX_FAST_PATH_GRAPHICS:
+                return False
+    return True
+
+
+def iter_pages(
+    file_path: str,
+    first_page: int = 0,
+    max_pages: int = settings.PDF_MAX_PAGES,
+) -> Iterator[str]:
+    """
+    Yield the text of each page, starting at first_page, for at most max_pages
+    pages. Pages without extractable text yield an empty string.
+    """
+    import pdfplumber
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LAParams, LTTextContainer
+
+    page_numbers = range(first_page, first_page + max_pages)
+    plumber = None
+    try:
+        layouts = extract_pages(
+            file_path, page_numbers=page_numbers, maxpages=page_numbers.stop, laparams=LAParams()
+        )
+        for page_number, layout in zip(page_numbers, layouts):
+            if _is_text_only(layout):
+                yield "".join(
+                    element.get_text() for element in layout if isinstance(element, LTTextContainer)
+                ).rstrip("\n")
+            else:
+                if plumber is None:
+                    plumber = pdfplumber.open(file_path)
+                yield plumber.pages[page_number].extract_text() or ""
+    finally:
+        if plumber is not None:
+            plumber.close()
+
 
 def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
+    check_size(file_path)
+    return "".join(f"{text}\n" for text in iter_pages(file_path))
+
+
+def _extract_chunk(file_path: str, first_page: int, max_pages: int) -> List[str]:
+    return list(iter_pages(file_path, first_page=first_page, max_pages=max_pages))
+
+
+def _extract_first_chunk(file_path: str, max_pages: int) -> Tuple[int, List[str]]:
+    import pdfplumber
+
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text
+        page_count = len(pdf.pages)
+    return page_count, _extract_chunk(file_path, 0, max_pages)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    return settings.PDF_WORKERS or os.cpu_count()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=pool_size())
+    return _executor
+
+
+def _preload() -> None:
+    import pdfplumber  # noqa
+    import pdfminer.high_level  # noqa
+
+
+async def warm_up() -> None:
+    """
+    Start the pool's processes and import the PDF libraries in each, so the
+    first upload doesn't pay for either.
+    """
+    executor = get_executor()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(executor, _preload) for _ in range(pool_size())))
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+def _reset_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken or stuck pool; the next call starts a new one. Concurrent
+    callers that hit the same pool only reset it once.
+    """
+    global _executor
+    if _executor is not executor:
+        return
+    _executor = None
+    # ProcessPoolExecutor can't stop running work; end the processes directly
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+T = TypeVar("T")
+
+
+async def run_in_pool(fn: Callable[..., T], *args) -> T:
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = get_executor()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, fn, *args), settings.PDF_TIMEOUT_SECONDS
+            )
+        except BrokenProcessPool:
+            _reset_executor(executor)
+            if attempt:
+                raise
+        except asyncio.TimeoutError:
+            _reset_executor(executor)
+            raise PDFTimeoutError(f"PDF extraction took longer than {settings.PDF_TIMEOUT_SECONDS}s")
+
+
+async def stream_pages(file_path: str) -> AsyncIterator[str]:
+    """
+    Yield page texts in order as the process pool finishes them. Pages are
+    extracted in chunks of PDF_PAGES_PER_CHUNK, so long documents use several
+    cores and callers can start on the first pages early.
+    """
+    check_size(file_path)
+
+    chunk = min(settings.PDF_PAGES_PER_CHUNK, settings.PDF_MAX_PAGES)
+    page_count, first_pages = await run_in_pool(_extract_first_chunk, file_path, chunk)
+    pages = min(page_count, settings.PDF_MAX_PAGES)
+    futures = [
+        asyncio.ensure_future(run_in_pool(_extract_chunk, file_path, first, min(chunk, pages - first)))
+        for first in range(chunk, pages, chunk)
+    ]
+    try:
+        for text in first_pages:
+            yield text
+        for future in futures:
+            for text in await future:
+                yield text
+    finally:
+        for future in futures:
+            future.cancel()
+        await asyncio.gather(*futures, return_exceptions=True)
+
+
+async def extract_text_async(file_path: str) -> str:
+    with pdf_extraction_seconds.time():
+        return "".join([f"{text}\n" async for text in stream_pages(file_path)])
@@ -0,0 +1,210 @@
+"""
+Token budgets for prompt inputs.
+
+Instead of slicing inputs at fixed character offsets, prompts are built from
+cleaned text that is fitted to a per-operation token budget. Resumes are
+split into sections and the sections most useful for the operation are kept
+first, so a long resume loses its hobbies before its experience.
+"""
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Token budget per operation and input
+BUDGETS: Dict[str, Dict[str, int]] = {
+    "analyze_resume": {"resume": 6000},
+    "generate_interview_questions": {"job_title": 50, "job_description": 800},
+    "evaluate_interview_answer": {"question": 300, "answer": 1500},
+    "tailor_resume": {"resume": 1500, "job_description": 800},
+    "generate_cold_email": {"resume": 600, "recipient_name": 30, "company_name": 30, "job_title": 50},
+}
+
+# Resume sections in the order they are kept when the budget is tight.
+# Sections not listed come last; for analyze_resume everything matters.
+SECTION_PRIORITIES: Dict[str, List[str]] = {
+    "tailor_resume": ["header", "summary", "experience", "skills", "projects", "education", "certifications"],
+    "generate_cold_email": ["header", "summary", "experience", "projects", "skills"],
+    "analyze_resume": [
+        "header", "experience", "education", "skills", "summary", "projects", "certifications",
+    ],
+}
+
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "professional summary", "about me", "objective", "career objective"),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history",
+    ),
+    "education": ("education", "academic background", "qualifications"),
+    "skills": ("skills", "technical skills", "core competencies", "competencies", "technologies", "tools"),
+    "projects": ("projects", "personal projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses & certifications"),
+    "awards": ("awards", "honors", "achievements", "honors & awards"),
+    "publications": ("publications",),
+    "volunteering": ("volunteering", "volunteer experience", "volunteer"),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies", "hobbies & interests"),
+    "references": ("references",),
+}
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_CID_RE = re.compile(r"\(cid:\d+\)")
+_PAGE_NUMBER_RE = re.compile(r"^\s*(page\s*)?\d+(\s*(of|/)\s*\d+)?\s*$", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^\s*[•●▪■◦‣∙·\-\*]\s*")
+_SPACES_RE = re.compile(r"[ \t ]+")
+_CONTACT_RE = re.compile(r"@|https?://|www\.|\+?\d[\d ()\-]{6,}\d")
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#.]{2,}")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate token count without a network round trip: one token per word
+    or punctuation mark, plus one per extra 6 characters of long words.
+    """
+    return sum(1 + (len(piece) - 1) // 6 for piece in _TOKEN_RE.findall(text))
+
+
+def clean_text(text: str) -> str:
+    """
+    Normalize PDF-extracted text: unicode forms, pdfminer (cid:N) glyphs,
+    bullets, page numbers, running headers/footers and runs of whitespace.
+    """
+    text = unicodedata.normalize("NFKC", text or "").replace("\x0c", "\n")
+    text = _CID_RE.sub("", text)
+
+    lines = [_SPACES_RE.sub(" ", line).strip() for line in text.splitlines()]
+    # Running headers/footers: the name or contact line repeated on every page
+    first_line = next((line for line in lines if line), "")
+    repeats = Counter(line for line in lines if line and len(line) < 80)
+    seen = set()
+    cleaned = []
+    for line in lines:
+        if _PAGE_NUMBER_RE.match(line):
+            continue
+        if line in seen and repeats[line] >= 2 and (line == first_line or _CONTACT_RE.search(line)):
+            continue
+        seen.add(line)
+        line = _BULLET_RE.sub("- ", line) if _BULLET_RE.match(line) else line
+        if not line and (not cleaned or not cleaned[-1]):
+            continue
+        cleaned.append(line)
+    return "\n".join(cleaned).strip()
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """
+    Keep whole lines (or, for a single long line, whole words) up to the budget.
+    """
+    if budget <= 0:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            if not kept:
+                words, total = [], 0
+                for word in line.split():
+                    total += count_tokens(word)
+                    if total > budget:
+                        break
+                    words.append(word)
+                kept.append(" ".join(words))
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+@dataclass
+class Section:
+    name: str
+    text: str
+    position: int
+
+    @property
+    def tokens(self) -> int:
+        return count_tokens(self.text)
+
+
+def _heading(line: str) -> Optional[str]:
+    candidate = line.strip().rstrip(":").strip().lower()
+    if not candidate or len(candidate) > 40:
+        return None
+    return _HEADING_TO_SECTION.get(candidate)
+
+
+def split_sections(text: str) -> List[Section]:
+    """
+    Split a resume on recognised headings. Text before the first heading
+    (name, contact details) is the "header" section.
+    """
+    sections: List[Section] = []
+    name, lines = "header", []
+    for line in text.splitlines():
+        heading = _heading(line)
+        if heading:
+            if any(lines):
+                sections.append(Section(name, "\n".join(lines).strip(), len(sections)))
+            name, lines = heading, [line]
+        else:
+            lines.append(line)
+    if any(lines):
+        sections.append(Section(name, "\n".join(lines).strip(), len(sections)))
+    return sections
+
+
+def _overlap(text: str, terms: Iterable[str]) -> int:
+    words = set(_WORD_RE.findall(text.lower()))
+    return len(words & set(terms))
+
+
+def fit_resume(text: str, operation: str, budget: Optional[int] = None, focus: Optional[str] = None) -> str:
+    """
+    Clean a resume and fit it to the operation's budget. Sections are kept in
+    priority order (unlisted ones ranked by word overlap with `focus`, e.g. a
+    job description); the last section that doesn't fit is cut at a line
+    boundary. The result keeps the resume's original section order.
+    """
+    budget = budget if budget is not None else BUDGETS[operation]["resume"]
+    text = clean_text(text)
+    if count_tokens(text) <= budget:
+        return text
+
+    priorities = SECTION_PRIORITIES.get(operation, [])
+    focus_terms = set(_WORD_RE.findall(focus.lower())) if focus else set()
+    sections = split_sections(text)
+    ranked = sorted(
+        sections,
+        key=lambda s: (
+            priorities.index(s.name) if s.name in priorities else len(priorities),
+            -_overlap(s.text, focus_terms),
+            s.position,
+        ),
+    )
+
+    kept: Dict[int, str] = {}
+    remaining = budget
+    for section in ranked:
+        if remaining <= 0:
+            break
+        cost = section.tokens + 1
+        if cost <= remaining:
+            kept[section.position] = section.text
+            remaining -= cost
+        else:
+            kept[section.position] = truncate_to_tokens(section.text, remaining - 1)
+            remaining = 0
+    return "\n\n".join(kept[position] for position in sorted(kept) if kept[position])
+
+
+def fit_text(text: str, operation: str, field: str) -> str:
+    """
+    Clean and truncate a plain input (job description, answer, ...) to its budget.
+    """
+    return truncate_to_tokens(clean_text(text), BUDGETS[operation][field])
@@ -0,0 +1,171 @@
+"""
+Batch resume upload: many PDFs (or zips of PDFs) in one request.
+
+Files are stored like single uploads, rows are bulk-inserted with a shared
+batch_id, and each new resume is queued for analysis. Throughput is then
+bounded by the LLM client's concurrency and tokens-per-minute limits rather
+than by the request.
+"""
+import asyncio
+import os
+import uuid
+import zipfile
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.resume import Resume
+from services.storage import StoredFile, UploadTooLargeError, save_bytes, save_upload
+from services.task_queue import enqueue_resume_analysis
+
+
+class BatchTooLargeError(ValueError):
+    pass
+
+
+@dataclass
+class BatchItem:
+    filename: str
+    stored: Optional[StoredFile] = None
+    error: Optional[str] = None
+
+
+def _extract_zip(fileobj: Any, root: str, max_files: int, max_bytes: int) -> List[BatchItem]:
+    items = []
+    with zipfile.ZipFile(fileobj) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(".pdf"):
+                continue
+            if len(items) >= max_files:
+                raise BatchTooLargeError(f"Batches are limited to {max_files} files")
+
+            filename = os.path.basename(name)
+            if info.file_size > max_bytes:
+                items.append(BatchItem(filename, error=f"File exceeds the {max_bytes} byte limit"))
+                continue
+            with archive.open(info) as member:
+                # The header size can lie; never read more than the limit
+                data = member.read(max_bytes + 1)
+            if len(data) > max_bytes:
+                items.append(BatchItem(filename, error=f"File exceeds the {max_bytes} byte limit"))
+                continue
+            items.append(BatchItem(filename, stored=save_bytes(data, root, ".pdf")))
+    return items
+
+
+async def store_files(
+    files: List[UploadFile],
+    root: str,
+    max_files: int = settings.RESUME_BATCH_MAX_FILES,
+    max_bytes: int = settings.UPLOAD_MAX_BYTES,
+) -> List[BatchItem]:
+    items: List[BatchItem] = []
+    for file in files:
+        name = file.filename or ""
+        if name.lower().endswith(".zip"):
+            try:
+                items += await asyncio.to_thread(_extract_zip, file.file, root, max_files - len(items), max_bytes)
+            except zipfile.BadZipFile:
+                items.append(BatchItem(name, error="Not a valid zip file"))
+        elif name.lower().endswith(".pdf"):
+            if len(items) >= max_files:
+                raise BatchTooLargeError(f"Batches are limited to {max_files} files")
+            try:
+                items.append(BatchItem(name, stored=await save_upload(file, root, extension=".pdf")))
+            except UploadTooLargeError as e:
+                items.append(BatchItem(name, error=str(e)))
+        else:
+            items.append(BatchItem(name, error="Only PDF and zip files are supported"))
+    return items
+
+
+async def create_batch(db: AsyncSession, user_id: int, items: List[BatchItem]) -> Dict[str, Any]:
+    """
+    Insert one row per stored file in a single INSERT ... RETURNING and queue
+    the ones that need analysis. Files already analyzed (same SHA-256) reuse
+    the earlier results, as single uploads do.
+    """
+    batch_id = uuid.uuid4().hex
+    stored = [item for item in items if item.stored]
+
+    analyzed: Dict[str, Resume] = {}
+    hashes = {item.stored.sha256 for item in stored}
+    if hashes:
+        result = await db.execute(
+            select(Resume).where(Resume.content_hash.in_(hashes), Resume.is_analyzed == True)
+        )
+        for resume in result.scalars():
+            analyzed.setdefault(resume.content_hash, resume)
+
+    rows = []
+    for item in stored:
+        row = {
+            "user_id": user_id,
+            "batch_id": batch_id,
+            "file_path": item.stored.path,
+            "filename": item.filename,
+            "content_type": "application/pdf",
+            "content_hash": item.stored.sha256,
+            "is_analyzed": False,
+            "analysis_status": "PENDING",
+            "analysis_attempts": 0,
+        }
+        previous = analyzed.get(item.stored.sha256)
+        if previous:
+            row.update(
+                raw_text=previous.raw_text,
+                parsed_content=previous.parsed_content,
+                embedding=previous.embedding,
+                is_analyzed=True,
+                analysis_status="COMPLETED",
+            )
+        rows.append(row)
+
+    inserted = []
+    if rows:
+        result = await db.execute(
+            insert(Resume).returning(Resume.id, Resume.is_analyzed, sort_by_parameter_order=True), rows
+        )
+        inserted = result.all()
+    await db.commit()
+
+    ids = [resume_id for resume_id, _ in inserted]
+    for resume_id, is_analyzed in inserted:
+        if not is_analyzed:
+            await enqueue_resume_analysis(resume_id)
+
+    return {
+        "batch_id": batch_id,
+        "total": len(ids),
+        "resume_ids": ids,
+        "errors": [{"filename": item.filename, "error": item.error} for item in items if item.error],
+    }
+
+
+async def batch_progress(db: AsyncSession, user_id: int, batch_id: str) -> Optional[Dict[str, Any]]:
+    result = await db.execute(
+        select(Resume.analysis_status, func.count())
+        .where(Resume.batch_id == batch_id, Resume.user_id == user_id)
+        .group_by(Resume.analysis_status)
+    )
+    counts = {status: count for status, count in result.all()}
+    if not counts:
+        return None
+
+    total = sum(counts.values())
+    completed = counts.get("COMPLETED", 0)
+    failed = counts.get("FAILED", 0)
+    return {
+        "batch_id": batch_id,
+        "total": total,
+        "pending": counts.get("PENDING", 0) + counts.get("RETRYING", 0),
+        "processing": counts.get("PROCESSING", 0),
+        "completed": completed,
+        "failed": failed,
+        "done": completed + failed == total,
+    }
@@ -0,0 +1,68 @@
+"""
+Resume extraction + analysis, run by the task queue after upload.
+"""
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import async_session
+from models.resume import Resume
+from services import ai_service, pdf_service
+from services.embedding_service import embed_texts
+
+
+class PermanentTaskError(Exception):
+    """
+    Failure that retrying cannot fix (e.g. an unreadable PDF).
+    """
+
+
+async def process_resume(
+    resume_id: int,
+    session_factory: Callable[[], AsyncSession] = async_session,
+    extract: Callable[[str], Awaitable[str]] = pdf_service.extract_text_async,
+) -> None:
+    async with session_factory() as db:
+        resume = await db.get(Resume, resume_id)
+        if resume is None or resume.is_analyzed:
+            return
+
+        resume.analysis_status = "PROCESSING"
+        resume.analysis_attempts = (resume.analysis_attempts or 0) + 1
+        await db.commit()
+
+        try:
+            raw_text = await extract(resume.file_path)
+        except Exception as e:
+            raise PermanentTaskError(f"Error reading PDF: {str(e)}")
+
+        parsed_content = await ai_service.analyze_resume(raw_text)
+        if "error" in parsed_content:
+            raise RuntimeError(parsed_content["error"])
+
+        resume.raw_text = raw_text
+        resume.parsed_content = parsed_content
+        try:
+            resume.embedding = (await embed_texts([raw_text]))[0]
+        except Exception as e:
+            # Not fatal: /jobs/match embeds on demand
+            print(f"Could not embed resume {resume_id}: {e}")
+        resume.is_analyzed = True
+        resume.analysis_status = "COMPLETED"
+        resume.analysis_error = None
+        await db.commit()
+
+
+async def mark_failed(
+    resume_id: int,
+    error: str,
+    final: bool,
+    session_factory: Callable[[], AsyncSession] = async_session,
+) -> None:
+    async with session_factory() as db:
+        resume = await db.get(Resume, resume_id)
+        if resume is None:
+            return
+        resume.analysis_status = "FAILED" if final else "RETRYING"
+        resume.analysis_error = error
+        await db.commit()
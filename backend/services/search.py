@@ -0,0 +1,134 @@
+"""
+Full-text search over a user's jobs (title, company, description) and
+resumes (filename, extracted text).
+
+SQLite uses the FTS5 tables job_fts and resume_fts, PostgreSQL the
+generated search_vector columns and their GIN indexes; both are created by
+migration d8b3f1e6a2c7 and kept current by the database on every insert,
+update and delete. User input is reduced to plain words, so FTS query
+syntax can't be injected. Words match on their stem ("running" finds "run");
+a short last word (up to PREFIX_CHARS, as typed so far) also matches as a
+prefix. Longer prefixes are left out because FTS5 has no index for them and
+would merge them across every user's rows.
+
+Matches are wrapped in <mark></mark>; the surrounding text is returned as
+stored, so clients must escape it before rendering it as HTML.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_TERMS = 10
+PREFIX_CHARS = 4 # Longest prefix in the FTS5 prefix index
+SNIPPET_TOKENS = 24
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+SEARCH_TYPES = ("job", "resume")
+
+# type -> (title column, subtitle column or None, snippet column)
+_FIELDS = {
+    "job": ("title", "company", "description"),
+    "resume": ("filename", None, "raw_text"),
+}
+
+
+def query_terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def _is_prefix(term: str) -> bool:
+    return len(term) <= PREFIX_CHARS
+
+
+def fts5_query(terms: List[str], columns: Tuple[str, ...]) -> str:
+    phrases = [f'"{term}"' for term in terms]
+    if _is_prefix(terms[-1]):
+        phrases[-1] += "*"
+    return "{" + " ".join(columns) + "} : (" + " AND ".join(phrases) + ")"
+
+
+def tsquery(terms: List[str]) -> str:
+    last = terms[-1] + ":*" if _is_prefix(terms[-1]) else terms[-1]
+    return " & ".join(terms[:-1] + [last])
+
+
+async def _search_sqlite(
+    db: AsyncSession, kind: str, user_id: int, terms: List[str], limit: int
+) -> List[Dict[str, Any]]:
+    title, subtitle, body = _FIELDS[kind]
+    columns = tuple(column for column in (title, subtitle, body) if column)
+    fts = f"{kind}_fts"
+    # Column numbers in the FTS table; user_id is column 0
+    title_col, body_col = 1, len(columns)
+    # The user filter is a term of the MATCH, so FTS5 only ranks that user's rows;
+    # ORDER BY rank LIMIT is done inside FTS5, and highlighting only for the rows returned
+    match = f'user_id : "{user_id}" AND ' + fts5_query(terms, columns)
+    result = await db.execute(
+        text(
+            f"SELECT {fts}.rowid AS id, {kind}.created_at AS created_at, "
+            f"{f'{kind}.{subtitle}' if subtitle else 'NULL'} AS subtitle, {kind}.{title} AS title, "
+            f"highlight({fts}, {title_col}, :start, :end) AS title_highlight, "
+            f"snippet({fts}, {body_col}, :start, :end, '…', {SNIPPET_TOKENS}) AS snippet, "
+            f"-rank AS score "
+            f"FROM {fts} JOIN {kind} ON {kind}.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :match AND {kind}.user_id = :user_id "
+            f"ORDER BY rank LIMIT :limit"
+        ),
+        {"match": match, "user_id": user_id, "limit": limit, "start": HIGHLIGHT_START, "end": HIGHLIGHT_END},
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def _search_postgres(
+    db: AsyncSession, kind: str, user_id: int, terms: List[str], limit: int
+) -> List[Dict[str, Any]]:
+    title, subtitle, body = _FIELDS[kind]
+    options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, HighlightAll=true"
+    snippet_options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_TOKENS}, MinWords=8"
+    # Rank on the GIN index first; ts_headline re-parses the text, so only for the page
+    result = await db.execute(
+        text(
+            f"WITH q AS (SELECT to_tsquery('english', :query) AS query), "
+            f"top AS (SELECT {kind}.id, ts_rank({kind}.search_vector, q.query) AS score FROM {kind}, q "
+            f"WHERE {kind}.user_id = :user_id AND {kind}.search_vector @@ q.query "
+            f"ORDER BY score DESC, {kind}.id DESC LIMIT :limit) "
+            f"SELECT {kind}.id, {kind}.created_at, {f'{kind}.{subtitle}' if subtitle else 'NULL'} AS subtitle, "
+            f"{kind}.{title} AS title, "
+            f"ts_headline('english', coalesce({kind}.{title}, ''), q.query, '{options}') AS title_highlight, "
+            f"ts_headline('english', coalesce({kind}.{body}, ''), q.query, '{snippet_options}') AS snippet, "
+            f"top.score FROM top JOIN {kind} ON {kind}.id = top.id, q ORDER BY top.score DESC, {kind}.id DESC"
+        ),
+        {"query": tsquery(terms), "user_id": user_id, "limit": limit},
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def search(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    types: Optional[List[str]] = None,
+    offset: int = 0,
+    limit: int = 20,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Ranked matches for `query` among the user's jobs and resumes, best first,
+    and whether there are more after this page. Scores are comparable across
+    types: both come from the same ranking function (bm25 on SQLite, ts_rank
+    on PostgreSQL).
+    """
+    terms = query_terms(query)
+    if not terms:
+        return [], False
+    search_type = _search_postgres if db.bind.dialect.name == "postgresql" else _search_sqlite
+
+    # Each type's best offset + limit + 1 are enough to merge this page and know if there's another
+    hits: List[Dict[str, Any]] = []
+    for kind in types or SEARCH_TYPES:
+        for row in await search_type(db, kind, user_id, terms, offset + limit + 1):
+            hits.append({"type": kind, **row})
+    hits.sort(key=lambda hit: hit["score"], reverse=True)
+    return hits[offset:offset + limit], len(hits) > offset + limit
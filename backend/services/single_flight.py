@@ -0,0 +1,199 @@
+"""
+Single-flight coordination for identical LLM requests.
+
+A double-clicked "Generate" or a frontend retry produces the same cache key
+while the first call is still running. Inside a process, the first caller
+becomes the leader and everyone else awaits its future. Across workers, the
+leader also holds a Redis lock on the key (SET NX PX); callers on other
+workers that find the lock taken poll the response cache for the leader's
+result instead of calling the model themselves.
+"""
+import asyncio
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from core.config import settings
+from core.metrics import callback
+from core.redis import get_redis
+
+REDIS_PREFIX = "flight:"
+
+# Delete the lock only if we still own it (it may have expired and been retaken)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+Lookup = Callable[[], Awaitable[Optional[Any]]]
+
+
+class Flight:
+    """
+    Handle returned by SingleFlight.flight. Followers get `result` filled in;
+    the leader does the work and calls `resolve` with its result.
+    """
+
+    def __init__(self, leader: bool, result: Any = None, future: Optional[asyncio.Future] = None):
+        self.leader = leader
+        self.result = result
+        self._future = future
+
+    def resolve(self, result: Any) -> None:
+        # Release followers now, even if the leader still has work to do (e.g. yield to its client)
+        self.result = result
+        if self._future is not None and not self._future.done():
+            self._future.set_result(result)
+
+
+class SingleFlight:
+    def __init__(
+        self,
+        lock_ttl: float = settings.SINGLE_FLIGHT_LOCK_TTL_SECONDS,
+        wait_timeout: float = settings.SINGLE_FLIGHT_WAIT_SECONDS,
+        poll_interval: float = settings.SINGLE_FLIGHT_POLL_SECONDS,
+    ):
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.counters: Counter = Counter()
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), **self.counters}
+
+    async def _join_local(self, key: str) -> Optional[Flight]:
+        """
+        Await an identical call already running in this process. Returns None
+        when there is none, or when its leader was cancelled (the caller then
+        takes over).
+        """
+        while True:
+            future = self._flights.get(key)
+            if future is None:
+                return None
+            self.counters["shared"] += 1
+            try:
+                return Flight(leader=False, result=await asyncio.shield(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                self.counters["leader_cancelled"] += 1
+                if self._flights.get(key) is future:
+                    return None
+
+    async def _lock(self, key: str, lookup: Lookup) -> Tuple[Optional[str], Optional[Flight]]:
+        """
+        Take the cross-worker lock. While another worker holds it, poll
+        `lookup` for its result. Gives up waiting after `wait_timeout` and runs
+        the call anyway rather than failing the request.
+        """
+        redis = get_redis()
+        if redis is None:
+            return None, None
+
+        token = uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        waited = False
+        while True:
+            try:
+                if await redis.set(REDIS_PREFIX + key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                    break
+            except Exception as e:
+                print(f"⚠ Single-flight Redis lock failed: {e}")
+                return None, None
+
+            if not waited:
+                self.counters["remote_waits"] += 1
+                waited = True
+            if loop.time() >= deadline:
+                self.counters["remote_wait_timeouts"] += 1
+                return None, None
+            await asyncio.sleep(self.poll_interval)
+            result = await lookup()
+            if result is not None:
+                self.counters["remote_shared"] += 1
+                return None, Flight(leader=False, result=result)
+
+        # The previous holder may have finished between our cache miss and the lock
+        result = await lookup()
+        if result is not None:
+            await self._unlock(key, token)
+            self.counters["remote_shared"] += 1
+            return None, Flight(leader=False, result=result)
+        return token, None
+
+    async def _unlock(self, key: str, token: str) -> None:
+        try:
+            await get_redis().eval(_RELEASE_SCRIPT, 1, REDIS_PREFIX + key, token)
+        except Exception as e:
+            # The lock expires on its own after lock_ttl
+            print(f"⚠ Single-flight Redis unlock failed: {e}")
+
+    @asynccontextmanager
+    async def flight(self, key: str, lookup: Lookup) -> AsyncIterator[Flight]:
+        """
+        Enter a flight for `key`. If `flight.leader` is False, `flight.result`
+        holds the shared result. Otherwise the caller must do the work and call
+        `flight.resolve(result)`; if it raises instead, local followers get the
+        same exception (or take over, if it was cancelled). `lookup` returns
+        the cached result, or None, and is polled while another worker holds
+        the lock.
+        """
+        joined = await self._join_local(key)
+        if joined is not None:
+            yield joined
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        self.counters["leaders"] += 1
+        token = None
+        try:
+            token, shared = await self._lock(key, lookup)
+            if shared is not None:
+                future.set_result(shared.result)
+                yield shared
+                return
+
+            flight = Flight(leader=True, future=future)
+            yield flight
+            if not future.done():
+                raise RuntimeError(f"Single-flight leader for {key} finished without a result")
+        except (asyncio.CancelledError, GeneratorExit):
+            # Cancelled request or closed stream: a follower takes over
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                future.exception()  # retrieved: no "never retrieved" warning without followers
+            raise
+        finally:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+            if token is not None:
+                await self._unlock(key, token)
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]], lookup: Lookup) -> Any:
+        """
+        Return `call()`'s result, sharing one call among identical concurrent
+        requests.
+        """
+        async with self.flight(key, lookup) as flight:
+            if flight.leader:
+                flight.resolve(await call())
+            return flight.result
+
+
+single_flight = SingleFlight()
+
+callback("single_flight_in_flight", "Distinct LLM requests currently in flight", lambda: [((), len(single_flight._flights))])
+callback(
+    "single_flight_events_total", "Requests led, shared in-process or across workers",
+    lambda: [((event,), count) for event, count in single_flight.counters.items()], ("event",), kind="counter",
+)
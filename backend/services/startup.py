@@ -0,0 +1,125 @@
+"""
+Startup warm-up and readiness.
+
+The server accepts connections as soon as the app is imported; everything
+slow happens afterwards in a background task: the migration check (see
+db.migrations), requeueing analyses the in-process task queue lost in a
+restart, building the LLM client and embedder, the first password hash, and
+starting the PDF worker processes. /ready reports 503 until that
+task has finished, so a load balancer only routes traffic to warm workers.
+Each step's duration is printed and exported as process_startup_seconds,
+along with the time from process start to ready and to the first request.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core import security
+from core.metrics import callback, record_error
+from db.migrations import ensure_migrated
+from db.session import engine
+from services import pdf_service
+from services.embedding_service import get_embedder
+from services.llm_client import init_llm_client
+from services.task_queue import queue_backend, requeue_unfinished
+
+_IMPORTED_AT = time.time()
+
+
+def process_started_at() -> float:
+    """
+    Wall-clock time the process started (from /proc on Linux), so the
+    interpreter start and imports count towards startup time.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the command name, which may contain spaces; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        started_after_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return time.time() - uptime + started_after_boot
+    except (OSError, IndexError, ValueError):
+        return _IMPORTED_AT
+
+
+class StartupState:
+    def __init__(self):
+        self.started_at = process_started_at()
+        self.ready = False
+        self.migrations: Optional[str] = None
+        self.timings: Dict[str, float] = {"import": round(_IMPORTED_AT - self.started_at, 3)}
+        self.errors: Dict[str, str] = {}
+        self.first_request_seconds: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self.migrations == "pending":
+            return "migrations pending"
+        if "migrations" in self.errors:
+            return "migrations failed"
+        return "ready" if self.ready else "starting"
+
+    def details(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "migrations": self.migrations,
+            "timings": self.timings,
+            "errors": self.errors,
+            "first_request_seconds": self.first_request_seconds,
+        }
+
+
+state = StartupState()
+
+
+async def _step(name: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+    started = time.perf_counter()
+    try:
+        return await fn()
+    except Exception as e:
+        # A failed warm-up step is retried lazily by the first request that needs it
+        record_error("startup", e)
+        state.errors[name] = str(e)
+        print(f"⚠ Warning: startup step '{name}' failed: {e}")
+    finally:
+        state.timings[name] = round(time.perf_counter() - started, 3)
+
+
+async def warm_up() -> None:
+    state.migrations = await _step("migrations", lambda: ensure_migrated(engine))
+    if state.migrations == "pending":
+        print("⚠ Database schema is behind head; run `python -m db.migrations`. /ready will fail until then.")
+    elif "migrations" in state.errors:
+        return
+    elif queue_backend() == "local":
+        await _step("requeue_analyses", requeue_unfinished)
+
+    await asyncio.gather(
+        _step("llm_client", init_llm_client),
+        _step("embedder", lambda: asyncio.to_thread(get_embedder)),
+        _step("password_hash", security.warm_up),
+        _step("pdf_workers", pdf_service.warm_up),
+    )
+    if state.migrations == "pending":
+        return
+    state.ready = True
+    state.timings["ready"] = round(time.time() - state.started_at, 3)
+    print(f"✓ Ready in {state.timings['ready']:.2f}s since process start")
+
+
+def record_first_request() -> None:
+    state.first_request_seconds = round(time.time() - state.started_at, 3)
+    print(f"✓ First request {state.first_request_seconds:.2f}s after process start")
+
+
+def _startup_samples():
+    samples = [((phase,), seconds) for phase, seconds in state.timings.items()]
+    if state.first_request_seconds is not None:
+        samples.append((("first_request",), state.first_request_seconds))
+    return samples
+
+
+callback("process_startup_seconds", "Startup phase durations, and time from process start to ready", _startup_samples, ("phase",))
+callback("process_ready", "1 once startup warm-up has finished", lambda: [((), int(state.ready))])
@@ -0,0 +1,109 @@
+"""
+Content-addressed file storage for uploads.
+
+Files are streamed to disk in chunks while their SHA-256 is computed, then
+renamed to <root>/<hash[:2]>/<hash><ext>, so the content is written once.
+Identical uploads share one file.
+"""
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator
+
+from fastapi import UploadFile
+
+from core.config import settings
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+@dataclass
+class StoredFile:
+    path: str
+    sha256: str
+    size: int
+
+
+async def save_stream(
+    chunks: AsyncIterable[bytes],
+    root: str,
+    extension: str = "",
+    max_bytes: int = settings.UPLOAD_MAX_BYTES,
+    chunk_size: int = settings.UPLOAD_CHUNK_BYTES,
+) -> StoredFile:
+    """
+    Stream content to content-addressed storage, hashing on write and writing
+    in blocks of chunk_size. Raises UploadTooLargeError as soon as the content
+    passes max_bytes.
+    """
+    os.makedirs(root, exist_ok=True)
+    partial_path = os.path.join(root, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    pending = bytearray()
+
+    out = await asyncio.to_thread(open, partial_path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(f"File exceeds the {max_bytes} byte limit")
+            digest.update(chunk)
+            pending += chunk
+            if len(pending) >= chunk_size:
+                await asyncio.to_thread(out.write, bytes(pending))
+                pending.clear()
+        if pending:
+            await asyncio.to_thread(out.write, bytes(pending))
+    except BaseException:
+        out.close()
+        os.remove(partial_path)
+        raise
+    await asyncio.to_thread(out.close)
+
+    return _place(partial_path, digest.hexdigest(), size, root, extension)
+
+
+async def _read(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def save_upload(
+    file: UploadFile,
+    root: str,
+    extension: str = "",
+    max_bytes: int = settings.UPLOAD_MAX_BYTES,
+    chunk_size: int = settings.UPLOAD_CHUNK_BYTES,
+) -> StoredFile:
+    """
+    Store an UploadFile (already received by Starlette) with save_stream.
+    """
+    return await save_stream(_read(file, chunk_size), root, extension, max_bytes, chunk_size)
+
+
+def save_bytes(data: bytes, root: str, extension: str = "") -> StoredFile:
+    """
+    Store an in-memory file (e.g. a zip member) the same way. Blocking; run
+    it in a thread from async code.
+    """
+    os.makedirs(root, exist_ok=True)
+    partial_path = os.path.join(root, f".{uuid.uuid4().hex}.part")
+    with open(partial_path, "wb") as out:
+        out.write(data)
+    return _place(partial_path, hashlib.sha256(data).hexdigest(), len(data), root, extension)
+
+
+def _place(partial_path: str, sha256: str, size: int, root: str, extension: str) -> StoredFile:
+    directory = os.path.join(root, sha256[:2])
+    path = os.path.join(directory, sha256 + extension)
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(partial_path)
+    else:
+        os.replace(partial_path, path)
+    return StoredFile(path=path, sha256=sha256, size=size)
@@ -0,0 +1,153 @@
+"""
+Task queue for resume analysis.
+
+With Redis configured, jobs go to Celery (see worker.py). Without it, an
+in-process pool of asyncio workers runs them inside the API process. Both
+retry with exponential backoff and dead-letter a resume once retries are
+exhausted (status FAILED, error recorded on the row). The in-process queue
+lives in memory, so at startup requeue_unfinished() puts back whatever a
+restart dropped.
+"""
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.metrics import callback, record_error
+from db.session import async_session
+from models.resume import Resume
+from services.resume_pipeline import PermanentTaskError, mark_failed, process_resume
+
+
+def queue_backend() -> str:
+    if settings.TASK_QUEUE_BACKEND == "auto":
+        return "celery" if settings.REDIS_URL else "local"
+    return settings.TASK_QUEUE_BACKEND
+
+
+def retry_delay(attempt: int) -> float:
+    return settings.TASK_RETRY_BACKOFF_SECONDS * (2 ** attempt)
+
+
+class LocalTaskQueue:
+    def __init__(self, workers: int, max_retries: int):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.dead_letters = deque(maxlen=1000)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, grace: float = settings.TASK_SHUTDOWN_GRACE_SECONDS) -> None:
+        """
+        Let the workers finish queued analyses for up to `grace` seconds, then
+        cancel them along with any retries still waiting out their backoff (those
+        rows stay RETRYING and are picked up again by requeue_unfinished).
+        """
+        if not self._tasks:
+            return
+        if grace > 0:
+            try:
+                # Returns at once when nothing is queued or running
+                await asyncio.wait_for(self._queue.join(), timeout=grace)
+            except asyncio.TimeoutError:
+                print(f"⚠ Cancelling resume analyses still running at shutdown ({self.depth} queued).")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        retries, self._retries = self._retries, set()
+        for task in retries:
+            task.cancel()
+        await asyncio.gather(*retries, return_exceptions=True)
+
+    async def enqueue(self, resume_id: int, attempt: int = 0) -> None:
+        await self.start()
+        await self._queue.put((resume_id, attempt))
+
+    async def _requeue_later(self, resume_id: int, attempt: int) -> None:
+        await asyncio.sleep(retry_delay(attempt - 1))
+        await self.enqueue(resume_id, attempt)
+
+    async def _worker(self) -> None:
+        while True:
+            resume_id, attempt = await self._queue.get()
+            try:
+                await process_resume(resume_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                record_error("task_queue", e)
+                final = isinstance(e, PermanentTaskError) or attempt >= self.max_retries
+                try:
+                    await mark_failed(resume_id, str(e), final=final)
+                except Exception as mark_error:
+                    print(f"Could not record failure for resume {resume_id}: {mark_error}")
+                if final:
+                    print(f"Resume {resume_id} dead-lettered after {attempt + 1} attempt(s): {e}")
+                    self.dead_letters.append({
+                        "resume_id": resume_id,
+                        "error": str(e),
+                        "attempts": attempt + 1,
+                        "failed_at": datetime.now(timezone.utc).isoformat(),
+                    })
+                else:
+                    retry = asyncio.create_task(self._requeue_later(resume_id, attempt + 1))
+                    self._retries.add(retry)
+                    retry.add_done_callback(self._retries.discard)
+            finally:
+                self._queue.task_done()
+
+
+local_queue = LocalTaskQueue(workers=settings.TASK_WORKERS, max_retries=settings.TASK_MAX_RETRIES)
+
+
+UNFINISHED_STATUSES = ("PENDING", "PROCESSING", "RETRYING")
+
+
+async def requeue_unfinished(session_factory: Callable[[], AsyncSession] = async_session) -> int:
+    """
+    Put analyses that a restart dropped from the in-process queue back on it:
+    every resume still PENDING, PROCESSING or RETRYING. Returns how many.
+    """
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Resume.id).where(Resume.analysis_status.in_(UNFINISHED_STATUSES)).order_by(Resume.id)
+        )
+        resume_ids = result.scalars().all()
+    for resume_id in resume_ids:
+        await local_queue.enqueue(resume_id)
+    if resume_ids:
+        print(f"Requeued {len(resume_ids)} unfinished resume analyses.")
+    return len(resume_ids)
+
+
+async def enqueue_resume_analysis(resume_id: int) -> None:
+    if queue_backend() == "celery":
+        from worker import analyze_resume_task
+
+        # Publishing talks to the broker synchronously
+        await asyncio.to_thread(analyze_resume_task.delay, resume_id)
+    else:
+        await local_queue.enqueue(resume_id)
+
+
+callback("task_queue_depth", "Resume analyses waiting in the in-process queue", lambda: [((), local_queue.depth)])
+callback(
+    "task_queue_dead_letters", "Resume analyses that failed permanently (last 1000)",
+    lambda: [((), len(local_queue.dead_letters))],
+)
@@ -0,0 +1,137 @@
+"""
+Cache for the JWT -> User lookup done by api.deps on every authenticated request.
+
+Decoded tokens are memoized until they expire, and user rows are cached by id
+for a short TTL (in-process, plus Redis when configured). Cached users are
+column snapshots without the password hash; they are attached to the request's
+session with merge(load=False), which issues no SQL.
+"""
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.cache import TTLCache
+from core.config import settings
+from core.redis import get_redis
+from models.user import User
+
+REDIS_PREFIX = "user:"
+SNAPSHOT_COLUMNS = ("id", "email", "full_name", "is_active", "is_superuser", "created_at", "updated_at")
+DATETIME_COLUMNS = ("created_at", "updated_at")
+
+_tokens = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_users = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+def get_token_subject(token: str) -> Optional[str]:
+    return _tokens.get(token)
+
+
+def remember_token(token: str, subject: str, exp: Optional[float]) -> None:
+    """
+    Memoize a verified token's subject until the token's own expiry.
+    """
+    ttl = (exp - time.time()) if exp else None
+    if ttl is None or ttl > 0:
+        _tokens.set(token, subject, ttl=ttl)
+
+
+def snapshot(user: User) -> Dict[str, Any]:
+    return {column: getattr(user, column) for column in SNAPSHOT_COLUMNS}
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps({
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in data.items()
+    })
+
+
+def _loads(raw: Any) -> Dict[str, Any]:
+    data = json.loads(raw)
+    for column in DATETIME_COLUMNS:
+        if data.get(column):
+            data[column] = datetime.fromisoformat(data[column])
+    return data
+
+
+async def _get_snapshot(user_id: int) -> Optional[Dict[str, Any]]:
+    data = _users.get(user_id)
+    if data is not None:
+        return data
+
+    redis = get_redis()
+    if redis is not None:
+        try:
+            raw = await redis.get(f"{REDIS_PREFIX}{user_id}")
+        except Exception as e:
+            print(f"⚠ User cache Redis read failed: {e}")
+            raw = None
+        if raw is not None:
+            data = _loads(raw)
+            _users.set(user_id, data)
+            return data
+    return None
+
+
+async def _set_snapshot(data: Dict[str, Any]) -> None:
+    _users.set(data["id"], data)
+
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.set(f"{REDIS_PREFIX}{data['id']}", _dumps(data), ex=settings.USER_CACHE_TTL_SECONDS)
+        except Exception as e:
+            print(f"⚠ User cache Redis write failed: {e}")
+
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """
+    Load a user by id, serving from the cache when possible. The returned
+    instance belongs to `db` either way, so callers can modify and commit it.
+    """
+    data = await _get_snapshot(user_id)
+    if data is not None:
+        user = User(**data)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    user = await db.get(User, user_id)
+    if user is not None:
+        await _set_snapshot(snapshot(user))
+    return user
+
+
+async def load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """
+    Load a user from the database, bypassing the cache. A cached instance
+    already in `db` is refreshed in place, password hash included.
+    """
+    return await db.get(User, user_id, populate_existing=True)
+
+
+async def invalidate_user(user_id: int) -> None:
+    """
+    Drop a user from every cache tier. Call after committing any change to a
+    user, from the request that made it.
+    """
+    _users.delete(user_id)
+
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.delete(f"{REDIS_PREFIX}{user_id}")
+        except Exception as e:
+            print(f"⚠ User cache Redis delete failed: {e}")
+
+
+@event.listens_for(User, "after_update")
+def _forget_updated_user(mapper, connection, target: User) -> None:
+    # Backstop for this process only; the Redis copy is dropped by the
+    # invalidate_user call that each path changing a user makes after commit.
+    _users.delete(target.id)
@@ -0,0 +1,107 @@
+"""
+In-memory cosine-similarity index over a user's job embeddings.
+
+On PostgreSQL, search_jobs instead scans the user's rows exactly in SQL
+(pgvector's <=> distance); there is deliberately no HNSW index, see
+search_jobs. Elsewhere (SQLite) each user's job matrix is cached in process,
+keyed by a fingerprint of their job rows: count, highest id, latest
+updated_at and how many have an embedding. Adding, deleting or editing a job,
+or embedding one (which leaves updated_at alone), from any worker rebuilds it.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from models.job import Job
+
+
+class VectorIndex:
+    def __init__(self, ids: Sequence[int], vectors: Sequence[Sequence[float]]):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.size:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        if not len(self):
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm:
+            q = q / norm
+        scores = self.matrix @ q
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+
+job_indexes = TTLCache(maxsize=1000, ttl=600)
+
+
+def invalidate_job_index(user_id: int) -> None:
+    job_indexes.delete(user_id)
+
+
+async def _job_index(db: AsyncSession, user_id: int) -> VectorIndex:
+    result = await db.execute(
+        select(func.count(Job.id), func.max(Job.id), func.max(Job.updated_at), func.count(Job.embedding))
+        .where(Job.user_id == user_id)
+    )
+    fingerprint = tuple(result.one())
+    cached = job_indexes.get(user_id)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    result = await db.execute(
+        select(Job.id, Job.embedding).where(Job.user_id == user_id, Job.embedding.is_not(None))
+    )
+    rows = result.all()
+    index = VectorIndex([row.id for row in rows], [row.embedding for row in rows])
+    job_indexes.set(user_id, (fingerprint, index))
+    return index
+
+
+async def search_jobs(
+    db: AsyncSession, user_id: int, query: Sequence[float], k: int
+) -> List[Tuple[Job, float]]:
+    """
+    Return a user's k jobs closest to query by cosine similarity, best first.
+    """
+    if db.bind.dialect.name == "postgresql":
+        # Exact nearest neighbours among this user's jobs, found through
+        # ix_job_user_created. An HNSW index would cover every user: it
+        # returns hnsw.ef_search candidates (40 by default) and the user
+        # filter is applied after, so a user with few jobs gets fewer than k,
+        # often none; migration 9e4c2b7a1d58 dropped it. A user's jobs number
+        # in the thousands at most, which a sequential distance computation
+        # handles in milliseconds. MATERIALIZED keeps the planner from ever
+        # ordering through a vector index instead.
+        mine = (
+            select(Job.id, Job.embedding.op("<=>", return_type=Float)(query).label("distance"))
+            .where(Job.user_id == user_id, Job.embedding.is_not(None))
+            .cte("user_jobs")
+            .prefix_with("MATERIALIZED")
+        )
+        result = await db.execute(
+            select(Job, (1 - mine.c.distance).label("score"))
+            .join(mine, Job.id == mine.c.id)
+            .order_by(mine.c.distance, Job.id)
+            .limit(k)
+        )
+        return [(job, float(score)) for job, score in result.all()]
+
+    hits = (await _job_index(db, user_id)).search(query, k)
+    if not hits:
+        return []
+    result = await db.execute(select(Job).where(Job.id.in_([job_id for job_id, _ in hits])))
+    jobs = {job.id: job for job in result.scalars().all()}
+    return [(jobs[job_id], score) for job_id, score in hits if job_id in jobs]
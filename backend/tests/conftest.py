@@ -0,0 +1,80 @@
+"""
+Test setup: a scratch SQLite database migrated to head, the fake LLM backend,
+no Redis, and the in-process task queue. Settings are read at import time, so
+the environment is set before anything from the app is imported.
+"""
+import os
+import tempfile
+import uuid
+
+WORKDIR = tempfile.mkdtemp(prefix="backend_tests_")
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(WORKDIR, "test.db")
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["REDIS_URL"] = ""
+os.environ["TASK_QUEUE_BACKEND"] = "local"
+os.environ["LOGIN_IP_BURST"] = "0"
+os.environ["MIGRATIONS_ON_STARTUP"] = "check"
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(WORKDIR)
+
+import httpx
+import pytest
+
+from core import security
+from db import migrations
+from db.session import async_session, engine
+from main import app
+from models.user import User
+from services.llm_client import FakeBackend, LLMClient, set_llm_client
+from services.task_queue import local_queue
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    migrations.upgrade()
+    yield
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+async def fresh_loop_state(anyio_backend):
+    # Each test runs on its own event loop; nothing loop-bound may carry over
+    set_llm_client(LLMClient(FakeBackend()))
+    yield
+    await local_queue.stop(grace=0)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db():
+    async with async_session() as session:
+        yield session
+
+
+@pytest.fixture
+async def user(db):
+    user = User(
+        email=f"{uuid.uuid4().hex[:12]}@example.com",
+        hashed_password=security.get_password_hash("secret-password"),
+        is_active=True,
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def headers(user):
+    return {"Authorization": f"Bearer {security.create_access_token(user.id)}"}
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+        yield client
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from core.config import settings
+from db.session import engine, engine_options
+
+
+def test_engine_does_not_echo_and_pools_by_backend():
+    sqlite = engine_options("sqlite+aiosqlite:///./app.db")
+    assert sqlite["echo"] is False
+    assert sqlite["pool_size"] == settings.DB_POOL_SIZE and sqlite["pool_recycle"] == settings.DB_POOL_RECYCLE
+    assert "pool_pre_ping" not in sqlite and "connect_args" not in sqlite
+
+    assert engine_options("sqlite+aiosqlite:///:memory:") == {"echo": False}
+
+    postgres = engine_options("postgresql+asyncpg://user:pw@db/app")
+    assert postgres["pool_pre_ping"] is True
+    assert postgres["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert postgres["connect_args"] == {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    assert "connect_args" not in engine_options("postgresql+psycopg://user:pw@db/app")
+
+
+async def test_sqlite_connections_get_the_pragmas():
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1 # NORMAL
+        assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+
+
+async def test_slow_queries_are_logged_without_parameters(monkeypatch, caplog):
+    query = text("WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000) SELECT count(*) FROM n WHERE :secret")
+    async with engine.connect() as conn:
+        monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 10_000.0)
+        with caplog.at_level(logging.WARNING, logger="db.slow_query"):
+            await conn.execute(query, {"secret": "hunter2"})
+        assert caplog.records == []
+
+        monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.001)
+        with caplog.at_level(logging.WARNING, logger="db.slow_query"):
+            await conn.execute(query, {"secret": "hunter2"})
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Slow query") and "WITH RECURSIVE" in message
+    assert "hunter2" not in message
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_SAMPLE_RATE", 0.0)
+    async with engine.connect() as conn:
+        with caplog.at_level(logging.WARNING, logger="db.slow_query"):
+            await conn.execute(query, {"secret": "hunter2"})
+    assert caplog.records == []
+
+
+async def test_failed_statements_leave_no_timing_state(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.001)
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT * FROM no_such_table"))
+        assert "query_start_time" not in conn.sync_connection.info
+
+        with caplog.at_level(logging.WARNING, logger="db.slow_query"):
+            await conn.execute(text("SELECT 1"))
+    assert [record.getMessage().endswith("SELECT 1") for record in caplog.records] == [True]
@@ -0,0 +1,108 @@
+import uuid
+
+from core import security
+from models.user import User
+from services.llm_client import FAKE_RESPONSES, LLMClient, get_llm_client, set_llm_client
+
+
+def llm_calls(operation):
+    return get_llm_client().usage.get(operation, {}).get("calls", 0)
+
+
+async def start_session(client, headers):
+    response = await client.post("/interviews/sessions", headers=headers, json={"job_title": f"Engineer {uuid.uuid4().hex}"})
+    assert response.status_code == 200
+    session = response.json()
+    assert len(session["questions"]) == 5 and session["status"] == "IN_PROGRESS"
+    return session
+
+
+async def test_answers_are_evaluated_in_one_batch_and_persisted(client, headers):
+    session = await start_session(client, headers)
+    answers = [{"question_index": i, "answer": f"answer {i} {uuid.uuid4().hex}"} for i in range(5)]
+
+    response = await client.post(f"/interviews/sessions/{session['id']}/evaluate", headers=headers, json={"answers": answers})
+    assert response.status_code == 200
+    evaluated = response.json()
+    assert llm_calls("evaluate_interview_answers") == 1
+    assert llm_calls("evaluate_interview_answer") == 0
+    assert evaluated["status"] == "EVALUATED" and evaluated["overall_score"] == 75
+    assert [e["score"] for e in evaluated["evaluations"]] == [75] * 5
+
+    stored = (await client.get(f"/interviews/sessions/{session['id']}", headers=headers)).json()
+    assert stored["answers"] == [a["answer"] for a in answers]
+    assert stored["evaluations"] == evaluated["evaluations"]
+
+
+async def test_only_changed_answers_are_re_evaluated(client, headers):
+    session = await start_session(client, headers)
+    url = f"/interviews/sessions/{session['id']}"
+    answers = [{"question_index": i, "answer": f"answer {i} {uuid.uuid4().hex}"} for i in range(2)]
+    await client.post(f"{url}/evaluate", headers=headers, json={"answers": answers})
+    assert llm_calls("evaluate_interview_answers") == 1
+
+    response = await client.put(f"{url}/answers", headers=headers, json={"answers": [{"question_index": 1, "answer": "changed"}]})
+    saved = response.json()
+    assert saved["status"] == "IN_PROGRESS"
+    assert saved["evaluations"][0] is not None and saved["evaluations"][1] is None
+
+    evaluated = (await client.post(f"{url}/evaluate", headers=headers)).json()
+    assert llm_calls("evaluate_interview_answers") == 2
+    assert evaluated["evaluations"][1]["score"] == 75
+
+    # Nothing changed: no calls at all
+    await client.post(f"{url}/evaluate", headers=headers)
+    assert llm_calls("evaluate_interview_answers") == 2
+
+
+async def test_failed_evaluations_are_not_saved_as_scores(client, headers, monkeypatch):
+    session = await start_session(client, headers)
+    url = f"/interviews/sessions/{session['id']}"
+    answers = [{"question_index": i, "answer": f"answer {i} {uuid.uuid4().hex}"} for i in range(2)]
+    monkeypatch.setitem(FAKE_RESPONSES, "evaluate_interview_answers", {"wrong": "shape"})
+    monkeypatch.setitem(FAKE_RESPONSES, "evaluate_interview_answer", {"feedback": "no score"})
+
+    response = await client.post(f"{url}/evaluate", headers=headers, json={"answers": answers})
+    assert response.status_code == 502
+    stored = (await client.get(url, headers=headers)).json()
+    assert stored["status"] == "IN_PROGRESS" and stored["overall_score"] is None
+    assert stored["answers"][:2] == [a["answer"] for a in answers]
+    assert stored["evaluations"] == [None] * 5
+
+    monkeypatch.undo()
+    evaluated = (await client.post(f"{url}/evaluate", headers=headers)).json()
+    assert evaluated["status"] == "EVALUATED" and evaluated["overall_score"] == 75
+
+
+async def test_evaluation_without_ai_is_unavailable(client, headers):
+    session = await start_session(client, headers)
+    set_llm_client(LLMClient(None))
+    answers = [{"question_index": 0, "answer": "answer"}]
+
+    response = await client.post(f"/interviews/sessions/{session['id']}/evaluate", headers=headers, json={"answers": answers})
+    assert response.status_code == 503
+    stored = (await client.get(f"/interviews/sessions/{session['id']}", headers=headers)).json()
+    assert stored["status"] == "IN_PROGRESS" and stored["evaluations"] == [None] * 5
+
+
+async def test_sessions_are_private_and_listed_without_content(client, headers, db):
+    session = await start_session(client, headers)
+    listed = (await client.get("/interviews/sessions", headers=headers)).json()
+    assert [item["id"] for item in listed] == [session["id"]]
+    assert "questions" not in listed[0] and "answers" not in listed[0]
+
+    stranger = User(email=f"{uuid.uuid4().hex[:12]}@example.com", hashed_password="x", is_active=True)
+    db.add(stranger)
+    await db.commit()
+    other = {"Authorization": f"Bearer {security.create_access_token(stranger.id)}"}
+    assert (await client.get(f"/interviews/sessions/{session['id']}", headers=other)).status_code == 404
+    assert (await client.get("/interviews/sessions", headers=other)).json() == []
+
+    url = f"/interviews/sessions/{session['id']}"
+    response = await client.put(f"{url}/answers", headers=headers, json={"answers": [{"question_index": 9, "answer": "x"}]})
+    assert response.status_code == 422
+    assert (await client.post(f"{url}/evaluate", headers=headers)).status_code == 422
+
+
+async def test_sessions_require_authentication(client):
+    assert (await client.post("/interviews/sessions", json={"job_title": "Engineer"})).status_code == 401
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+from services import job_io
+
+CSV_IMPORT = """title,company,status,description
+Backend Engineer,Acme,SAVED,"Python, ""SQL"" and
+multi-line text"
+,Missing Title Inc,APPLIED,
+Data Engineer,Globex,,Spark pipelines
+"""
+
+
+async def test_csv_import_reports_bad_rows_and_keeps_the_rest(client, headers):
+    response = await client.post("/jobs/bulk", headers={**headers, "Content-Type": "text/csv"}, content=CSV_IMPORT)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 2 and len(result["ids"]) == 2
+    assert [error["row"] for error in result["errors"]] == [2]
+    assert "title" in result["errors"][0]["error"]
+
+    first = (await client.get(f"/jobs/{result['ids'][0]}", headers=headers)).json()
+    assert first["title"] == "Backend Engineer"
+    assert first["description"] == 'Python, "SQL" and\nmulti-line text'
+    # Empty cells mean "not set", so the default status applies
+    second = (await client.get(f"/jobs/{result['ids'][1]}", headers=headers)).json()
+    assert (second["title"], second["status"]) == ("Data Engineer", "APPLIED")
+
+
+async def test_ndjson_import_reports_invalid_lines(client, headers):
+    body = "\n".join([
+        json.dumps({"title": "One", "company": "A"}),
+        "",
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"title": "Two", "company": "B", "status": None}),
+    ])
+    result = (await client.post("/jobs/bulk?format=ndjson", headers=headers, content=body)).json()
+    assert result["created"] == 2
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+    assert result["errors"][0]["error"].startswith("invalid JSON")
+
+
+async def test_ids_follow_row_order_across_chunks(db, user):
+    user_id = user.id
+    body = "\n".join(json.dumps({"title": f"Job {i}", "company": "Acme"}) for i in range(7))
+    result = await job_io.import_jobs(db, user_id, body, "ndjson", chunk_size=3)
+    await db.commit()
+
+    assert result["created"] == 7 and result["errors"] == []
+    ids = result["ids"]
+    assert len(set(ids)) == 7
+    exported = [json.loads(line) async for chunk in job_io.export_jobs(user_id, "ndjson") for line in chunk.splitlines()]
+    titles = {row["id"]: row["title"] for row in exported}
+    assert [titles[job_id] for job_id in ids] == [f"Job {i}" for i in range(7)]
+
+
+async def test_too_many_rows_imports_nothing(client, headers, monkeypatch):
+    # chunk_size=2, max_rows=3: the first chunk is inserted before the limit is hit
+    monkeypatch.setattr(job_io.import_jobs, "__defaults__", (2, 3))
+    body = "\n".join(json.dumps({"title": f"Job {i}", "company": "Acme"}) for i in range(4))
+    response = await client.post("/jobs/bulk?format=ndjson", headers=headers, content=body)
+    assert response.status_code == 413
+    assert (await client.get("/jobs/export?format=ndjson", headers=headers)).text == ""
+
+
+async def test_csv_export_round_trips_through_import(client, headers):
+    await client.post("/jobs/bulk", headers={**headers, "Content-Type": "text/csv"}, content=CSV_IMPORT)
+
+    response = await client.get("/jobs/export?format=csv", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="jobs.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == list(job_io.EXPORT_COLUMNS)
+    assert sorted(row["title"] for row in rows) == ["Backend Engineer", "Data Engineer"]
+
+    again = await client.post("/jobs/bulk", headers={**headers, "Content-Type": "text/csv"}, content=response.text)
+    assert again.json()["created"] == 2 and again.json()["errors"] == []
+    exported = (await client.get("/jobs/export?format=ndjson", headers=headers)).text.splitlines()
+    descriptions = [json.loads(line)["description"] for line in exported]
+    assert descriptions.count('Python, "SQL" and\nmulti-line text') == 2
@@ -0,0 +1,56 @@
+import json
+from collections import Counter
+
+from sqlalchemy import select
+
+from models.job import Job
+from models.job_stats import JobStatusEvent
+from services.job_stats import PIPELINE, reached_stages, stage_key
+
+
+async def _recompute(db, user_id):
+    """
+    The aggregates computed from scratch: the job table and each job's status history.
+    """
+    statuses = Counter(stage_key(status) for status in (await db.execute(select(Job.status).where(Job.user_id == user_id))).scalars())
+    history = {}
+    for job_id, to_status in (await db.execute(
+        select(JobStatusEvent.job_id, JobStatusEvent.to_status)
+        .where(JobStatusEvent.user_id == user_id)
+        .order_by(JobStatusEvent.changed_at, JobStatusEvent.id)
+    )).all():
+        history.setdefault(job_id, set()).update(reached_stages(to_status))
+    reached = Counter(stage for stages in history.values() for stage in stages)
+    return statuses, reached
+
+
+async def test_stats_match_a_recomputation_after_changes(client, db, user, headers):
+    user_id = user.id
+    ids = []
+    for title, status in [("A", "SAVED"), ("B", "APPLIED"), ("C", "INTERVIEWING"), ("D", "SAVED"), ("E", None)]:
+        body = {"title": title, "company": "Acme", **({"status": status} if status else {})}
+        ids.append((await client.post("/jobs/", json=body, headers=headers)).json()["id"])
+    await client.put(f"/jobs/{ids[0]}", json={"status": "APPLIED"}, headers=headers)
+    await client.put(f"/jobs/{ids[0]}", json={"status": "INTERVIEWING"}, headers=headers)
+    await client.put(f"/jobs/{ids[1]}", json={"status": "REJECTED"}, headers=headers)
+    await client.put(f"/jobs/{ids[2]}", json={"status": "OFFER"}, headers=headers)
+    await client.put(f"/jobs/{ids[2]}", json={"title": "C2"}, headers=headers) # Not a status change
+    await client.delete(f"/jobs/{ids[3]}", headers=headers)
+    rows = "\n".join(json.dumps({"title": t, "company": "Initech", "status": s}) for t, s in [("F", "OFFER"), ("G", "SAVED")])
+    await client.post("/jobs/bulk", content=rows, headers={**headers, "Content-Type": "application/x-ndjson"})
+
+    response = await client.get("/jobs/stats", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()
+
+    statuses, reached = await _recompute(db, user_id)
+    assert stats["total"] == sum(statuses.values()) == 6
+    assert {row["status"]: row["count"] for row in stats["by_status"] if row["count"]} == dict(statuses)
+    assert {row["status"]: row["reached"] for row in stats["by_status"] if row["reached"]} == dict(reached)
+    assert [step["reached"] for step in stats["funnel"]] == [reached[stage] for stage in PIPELINE]
+    assert stats["funnel"][1]["conversion"] == round(reached["APPLIED"] / reached["SAVED"], 4)
+    # A finished a stay in SAVED and in APPLIED; B in APPLIED; C in INTERVIEWING
+    exited = {row["status"]: row["avg_days_in_stage"] for row in stats["by_status"]}
+    assert exited["SAVED"] is not None and exited["APPLIED"] is not None and exited["OFFER"] is None
+    # Jobs that reached APPLIED this week: A, B, C, F (E defaults to APPLIED too)
+    assert stats["weekly_applications"][-1]["applied"] == reached["APPLIED"]
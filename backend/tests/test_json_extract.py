@@ -0,0 +1,69 @@
+import pytest
+
+from services.ai_service import parse_output
+from services.json_extract import JSONExtractError, JSONExtractor, extract_json
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": 1}', {"a": 1}),
+    ('```json\n{"a": [1, 2]}\n```', {"a": [1, 2]}),
+    ('Here you go:\n{"a": "x"}\nHope this helps! {"b": 2}', {"a": "x"}),
+    ('{"a": "braces } and ] in \\"strings\\""}', {"a": 'braces } and ] in "strings"'}),
+    ('See {broken] then {"a": 1}', {"a": 1}),
+    ('See [1] first', [1]),
+    ('[1, [2, {"b": 3}]]', [1, [2, {"b": 3}]]),
+    ('{note: {"a": 1}}', {"a": 1}),
+    ('[see {"a": "]"}] below', {"a": "]"}),
+])
+def test_extracts_the_first_json_value(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_expected_openers_skip_bracketed_prose():
+    assert extract_json('As noted [in the docs], {"a": 1}', "{") == {"a": 1}
+
+
+@pytest.mark.parametrize("text", ["", "no json here", '{"a": 1', "[1, 2"])
+def test_raises_without_a_complete_value(text):
+    with pytest.raises(JSONExtractError):
+        extract_json(text)
+
+
+def test_incremental_feed_completes_on_the_closing_bracket():
+    extractor = JSONExtractor("{")
+    text = 'Sure! ```json\n{"subject": "Hi {name}", "body": "a\\"b"}\n``` trailing'
+    done_at = None
+    for i in range(0, len(text), 3):
+        if extractor.feed(text[i:i + 3]) and done_at is None:
+            done_at = i
+    assert extractor.done
+    assert extractor.value == {"subject": "Hi {name}", "body": 'a"b'}
+    assert done_at < text.index("```", text.index("}"))
+
+
+def test_failed_spans_are_rescanned_across_chunks():
+    extractor = JSONExtractor("{")
+    chunks = ["Result: {verdict: ", '{"score"', ": 80", "}} done"]
+    assert [extractor.feed(chunk) for chunk in chunks] == [False, False, False, True]
+    assert extractor.value == {"score": 80}
+
+
+def test_output_is_validated_against_the_operations_model():
+    email = parse_output("generate_cold_email", '```json\n{"subject": "Hello", "body": "Text", "extra": 1}\n```')
+    assert email == {"subject": "Hello", "body": "Text"}
+
+    with pytest.raises(ValueError, match="generate_cold_email"):
+        parse_output("generate_cold_email", '{"subject": "Hello"}')
+    with pytest.raises(ValueError):
+        parse_output("evaluate_interview_answer", '{"feedback": "ok", "score": 250}')
+
+
+def test_lenient_models_fill_defaults_and_normalize_shapes():
+    analysis = parse_output("analyze_resume", '{"personal_info": {"name": "Jane", "email": null}, "skills": null}')
+    assert analysis["personal_info"]["name"] == "Jane" and analysis["personal_info"]["email"] == ""
+    assert analysis["skills"] == {"technical": [], "soft": [], "tools": []}
+
+    questions = parse_output("generate_interview_questions", '{"questions": [{"question": "Why?"}, "How?", ""]}')
+    assert questions == ["Why?", "How?"]
+    with pytest.raises(ValueError):
+        parse_output("generate_interview_questions", "[]")
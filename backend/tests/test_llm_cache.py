@@ -0,0 +1,120 @@
+import uuid
+
+from core import cache as cache_module
+from core.cache import TTLCache
+from services import ai_service, llm_cache as llm_cache_module
+from services.llm_cache import POLICIES, REDIS_PREFIX, LLMCache, make_key
+from services.llm_client import FAKE_RESPONSES, get_llm_client
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self, broken=False):
+        self.data = {}
+        self.ttls = {}
+        self.broken = broken
+
+    async def get(self, key):
+        if self.broken:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.broken:
+            raise ConnectionError("redis down")
+        self.data[key] = value
+        self.ttls[key] = ex
+
+
+def test_keys_hash_normalized_content():
+    key = make_key("tailor_resume", "3", "gemini", "Jane  Doe\n\nPython ", "Backend role")
+    assert key == make_key("tailor_resume", "3", "gemini", "Jane Doe Python", "Backend role")
+    assert len(key) == 64
+    for other in (
+        make_key("tailor_resume", "4", "gemini", "Jane Doe Python", "Backend role"),
+        make_key("tailor_resume", "3", "gemini-pro", "Jane Doe Python", "Backend role"),
+        make_key("generate_cold_email", "3", "gemini", "Jane Doe Python", "Backend role"),
+        make_key("tailor_resume", "3", "gemini", "Jane Doe", "Python Backend role"),
+    ):
+        assert other != key
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+
+    clock.now += 10
+    assert cache.get("a") == 1 and cache.get("b") is None
+    clock.now += 60
+    assert cache.get("a") is None and len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+async def test_each_operation_has_its_own_tier_and_policy(monkeypatch):
+    monkeypatch.setattr(llm_cache_module, "get_redis", lambda: None)
+    cache = LLMCache()
+    await cache.set("tailor_resume", "key", {"a": 1})
+
+    assert await cache.get("tailor_resume", "key") == {"a": 1}
+    assert await cache.get("generate_cold_email", "key") is None
+    assert cache._tier("analyze_resume").ttl == POLICIES["analyze_resume"].ttl
+    assert cache.stats()["tailor_resume"] == {"hits": 1, "redis_hits": 0, "misses": 0, "entries": 1, "hit_ratio": 1.0}
+
+
+async def test_redis_is_the_shared_second_tier(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(llm_cache_module, "get_redis", lambda: redis)
+    writer, reader = LLMCache(), LLMCache()
+    await writer.set("tailor_resume", "key", {"a": 1})
+    assert redis.ttls[REDIS_PREFIX + "key"] == POLICIES["tailor_resume"].ttl
+
+    assert await reader.get("tailor_resume", "key") == {"a": 1}
+    redis.data.clear()
+    # Copied into the reader's own tier on the first hit
+    assert await reader.get("tailor_resume", "key") == {"a": 1}
+    assert reader.stats()["tailor_resume"]["redis_hits"] == 1 and reader.stats()["tailor_resume"]["hits"] == 1
+
+
+async def test_redis_failures_degrade_to_the_local_tier(monkeypatch):
+    monkeypatch.setattr(llm_cache_module, "get_redis", lambda: FakeRedis(broken=True))
+    cache = LLMCache()
+    await cache.set("tailor_resume", "key", {"a": 1})
+    assert await cache.get("tailor_resume", "key") == {"a": 1}
+    assert await cache.get("tailor_resume", "other") is None
+
+
+async def test_repeated_requests_are_served_from_the_cache():
+    resume = f"Jane Doe {uuid.uuid4().hex}"
+    first = await ai_service.tailor_resume(resume, "Backend role")
+    again = await ai_service.tailor_resume(resume.replace(" ", "  "), "Backend role ")
+
+    assert first == again
+    assert get_llm_client().usage["tailor_resume"]["calls"] == 1
+
+
+async def test_failures_are_not_cached(monkeypatch):
+    resume = f"Jane Doe {uuid.uuid4().hex}"
+    monkeypatch.setitem(FAKE_RESPONSES, "tailor_resume", {"wrong": "shape"})
+    assert "error" in await ai_service.tailor_resume(resume, "Backend role")
+
+    monkeypatch.setitem(FAKE_RESPONSES, "tailor_resume", {"tailored_summary": "Fits the role"})
+    assert (await ai_service.tailor_resume(resume, "Backend role"))["tailored_summary"] == "Fits the role"
+    assert get_llm_client().usage["tailor_resume"]["calls"] == 2
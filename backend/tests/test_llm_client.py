@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+import pytest
+
+from core.config import settings
+from core.metrics import llm_call_seconds
+from services import ai_service, llm_client
+from services.llm_client import LLMClient, LLMError, LLMResponse, LLMTimeoutError, get_llm_client, init_llm_client, set_llm_client
+
+
+class TrackingBackend:
+    """
+    Sleeps for `delay` per call and records how many calls overlap.
+    """
+
+    model_name = "tracking"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    async def generate(self, prompt, operation, json_mode=False):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        return LLMResponse(text="{}", model=self.model_name, input_tokens=1, output_tokens=1)
+
+
+async def test_concurrent_calls_are_capped():
+    backend = TrackingBackend()
+    llm = LLMClient(backend, max_concurrency=3)
+
+    results = await asyncio.gather(*[llm.generate(f"prompt {i}", "tailor_resume") for i in range(12)])
+
+    assert len(results) == 12
+    assert backend.peak == 3
+    assert llm.in_flight == 0 and llm.stats()["usage"]["tailor_resume"]["calls"] == 12
+
+
+async def test_slow_calls_do_not_block_the_event_loop():
+    llm = LLMClient(TrackingBackend(delay=0.2), max_concurrency=50)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.ensure_future(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*[llm.generate(f"prompt {i}", "tailor_resume") for i in range(50)])
+    elapsed = time.perf_counter() - started
+    ticking.cancel()
+
+    # 50 calls of 0.2 s overlap instead of queueing, and other work keeps running
+    assert elapsed < 1.0
+    assert ticks >= 10
+
+
+async def test_each_attempt_times_out_and_cancels_the_upstream_call(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    backend = TrackingBackend(delay=10)
+    llm = LLMClient(backend)
+    errors = llm_call_seconds.count("tailor_resume", "error")
+
+    with pytest.raises(LLMTimeoutError):
+        await llm.generate("prompt", "tailor_resume", timeout=0.05)
+    await asyncio.sleep(0)
+
+    assert backend.cancelled == settings.LLM_RETRY_ATTEMPTS and backend.active == 0
+    assert llm.resilience.snapshot()["retries"] == settings.LLM_RETRY_ATTEMPTS - 1
+    assert llm.in_flight == 0
+    assert llm_call_seconds.count("tailor_resume", "error") == errors + 1
+
+
+async def test_cancelling_the_caller_cancels_the_upstream_call():
+    backend = TrackingBackend(delay=10)
+    llm = LLMClient(backend, max_concurrency=1)
+    caller = asyncio.ensure_future(llm.generate("prompt", "tailor_resume"))
+    await asyncio.sleep(0.01)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    assert backend.cancelled == 1 and llm.in_flight == 0
+    # The slot was released
+    backend.delay = 0
+    await asyncio.wait_for(llm.generate("prompt", "tailor_resume"), 1)
+
+
+async def test_without_a_backend_calls_fail_and_ai_service_degrades():
+    llm = LLMClient(None)
+    assert not llm.enabled
+    with pytest.raises(LLMError):
+        await llm.generate("prompt", "tailor_resume")
+
+    set_llm_client(llm)
+    assert await ai_service.tailor_resume("resume", "job") == {"error": "AI not configured"}
+    assert (await ai_service.analyze_resume("resume"))["education"] == []
+
+
+async def test_the_client_is_built_once_at_startup(monkeypatch):
+    monkeypatch.setattr(llm_client, "build_backend", TrackingBackend)
+    set_llm_client(None)
+
+    first, second = await asyncio.gather(init_llm_client(), init_llm_client())
+    assert first is second is get_llm_client() and first.model_name == "tracking"
+    assert await init_llm_client() is first
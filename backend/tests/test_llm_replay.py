@@ -0,0 +1,65 @@
+import os
+import random
+import time
+
+import pytest
+
+from conftest import WORKDIR
+from services.llm_client import FakeBackend, LLMError
+from services.llm_replay import RecordingBackend, ReplayBackend, parse_latency
+
+
+def cassette_path(name):
+    path = os.path.join(WORKDIR, name)
+    if os.path.exists(path):
+        os.remove(path)
+    return path
+
+
+async def test_recorded_responses_replay_by_prompt():
+    path = cassette_path("record.jsonl")
+    recorder = RecordingBackend(FakeBackend(), path)
+    recorded = await recorder.generate("tailor this resume", "tailor_resume", json_mode=True)
+    streamed = [chunk async for chunk in recorder.stream("write an email", "cold_email")]
+
+    replay = ReplayBackend.from_file(path, latency="fixed:0", strict=True)
+    replayed = await replay.generate("tailor this resume", "tailor_resume")
+    assert replayed.text == recorded.text
+    assert (replayed.input_tokens, replayed.output_tokens) == (recorded.input_tokens, recorded.output_tokens)
+    # Streams come back in the chunks they were recorded in
+    assert [chunk async for chunk in replay.stream("write an email", "cold_email")] == streamed
+
+
+async def test_unknown_prompts_round_robin_unless_strict():
+    entries = [
+        {"operation": "tailor_resume", "prompt_sha256": "a", "text": "first"},
+        {"operation": "tailor_resume", "prompt_sha256": "b", "text": "second"},
+    ]
+    replay = ReplayBackend(entries, latency="fixed:0")
+    texts = [(await replay.generate(f"new prompt {i}", "tailor_resume")).text for i in range(3)]
+    assert texts == ["first", "second", "first"]
+
+    with pytest.raises(LLMError):
+        await replay.generate("anything", "cold_email")
+    with pytest.raises(LLMError):
+        await ReplayBackend(entries, latency="fixed:0", strict=True).generate("new prompt", "tailor_resume")
+
+
+async def test_replay_waits_for_the_simulated_latency():
+    replay = ReplayBackend([{"operation": "op", "prompt_sha256": "", "text": "{}", "latency_ms": 100}], latency="scale:0.5")
+    started = time.perf_counter()
+    await replay.generate("prompt", "op")
+    assert 0.045 <= time.perf_counter() - started < 0.5
+
+
+def test_latency_specs():
+    entry = {"latency_ms": 400}
+    rng = random.Random(1)
+    assert parse_latency("recorded")(entry) == 0.4
+    assert parse_latency("scale:0.5")(entry) == 0.2
+    assert parse_latency("fixed:800")(entry) == 0.8
+    assert all(0.2 <= parse_latency("uniform:200:1500", rng)(entry) <= 1.5 for _ in range(100))
+    assert parse_latency("lognormal:800:0.5", rng)(entry) > 0
+    for spec in ("bogus", "fixed", "uniform:1", "scale:x", "fixed:1:2"):
+        with pytest.raises(ValueError):
+            parse_latency(spec)
@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+from core.config import settings
+from services import llm_resilience
+from services.llm_client import LLMClient, LLMResponse, LLMTimeoutError
+from services.llm_resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ResilienceStats, hedged
+
+
+class SlowCalls:
+    """
+    call() coroutines that sleep for the next of `delays`, recording outcomes.
+    """
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.started = 0
+        self.cancelled = 0
+
+    async def call(self):
+        delay = self.delays[self.started]
+        self.started += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return delay
+
+
+async def test_hedge_wins_and_the_slow_call_is_cancelled():
+    stats = ResilienceStats()
+    calls = SlowCalls(10, 0.01)
+
+    assert await hedged(calls.call, 0.02, stats) == 0.01
+    await asyncio.sleep(0)
+
+    assert calls.cancelled == 1
+    assert stats.snapshot() == {"hedges": 1, "hedges_won": 1}
+
+
+@pytest.mark.parametrize("hedge_after", [0, 5])
+async def test_cancelling_the_caller_cancels_the_first_call(hedge_after):
+    calls = SlowCalls(10)
+    caller = asyncio.ensure_future(hedged(calls.call, hedge_after, ResilienceStats()))
+    await asyncio.sleep(0.01)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert calls.started == 1 and calls.cancelled == 1
+
+
+async def test_cancelling_the_caller_cancels_both_hedged_calls():
+    calls = SlowCalls(10, 10)
+    caller = asyncio.ensure_future(hedged(calls.call, 0.01, ResilienceStats()))
+    await asyncio.sleep(0.05)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert calls.started == 2 and calls.cancelled == 2
+
+
+def test_breaker_opens_then_half_opens_for_one_probe(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, stats=ResilienceStats())
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure(asyncio.TimeoutError())
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 30
+    breaker.before_call() # The probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call() # Only one probe at a time
+    breaker.record_failure(asyncio.TimeoutError())
+    assert breaker.state == OPEN
+
+    now[0] += 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_request_errors_do_not_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30, stats=ResilienceStats())
+    breaker.before_call()
+    breaker.record_failure(ValueError("invalid prompt"))
+    assert breaker.state == CLOSED
+
+
+class HangingBackend:
+    model_name = "hanging"
+
+    def __init__(self):
+        self.hang = True
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, prompt, operation, json_mode=False):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(10 if self.hang else 0)
+        finally:
+            self.active -= 1
+        return LLMResponse(text="{}", model=self.model_name)
+
+    async def stream(self, prompt, operation, json_mode=False):
+        yield "{"
+        await asyncio.sleep(10 if self.hang else 0)
+        yield "}"
+
+
+@pytest.fixture
+def client_settings(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_ATTEMPTS", 1)
+    monkeypatch.setattr(settings, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    monkeypatch.setattr(settings, "LLM_BREAKER_FAILURE_THRESHOLD", 3)
+    monkeypatch.setattr(settings, "LLM_BREAKER_RECOVERY_SECONDS", 0.05)
+    monkeypatch.setattr(llm_resilience.retrying, "__defaults__", (1,))
+
+
+async def test_timeouts_open_the_breaker(client_settings):
+    llm = LLMClient(HangingBackend())
+    for _ in range(3):
+        with pytest.raises(LLMTimeoutError):
+            await llm.generate("prompt", "op", timeout=0.01)
+    assert llm.breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        await llm.generate("prompt", "op", timeout=0.01)
+
+
+async def test_a_probe_that_times_out_or_is_cancelled_does_not_wedge_the_breaker(client_settings):
+    backend = HangingBackend()
+    llm = LLMClient(backend)
+    for _ in range(3):
+        with pytest.raises(LLMTimeoutError):
+            await llm.generate("prompt", "op", timeout=0.01)
+
+    await asyncio.sleep(0.06)
+    with pytest.raises(LLMTimeoutError):
+        await llm.generate("prompt", "op", timeout=0.01)  # Probe times out: open again
+    assert llm.breaker.state == OPEN
+
+    await asyncio.sleep(0.06)
+    probe = asyncio.ensure_future(llm.generate("prompt", "op", timeout=5))
+    await asyncio.sleep(0.01)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert llm.breaker.state == OPEN
+
+    backend.hang = False
+    await asyncio.sleep(0.06)
+    await llm.generate("prompt", "op", timeout=1)
+    assert llm.breaker.state == CLOSED
+
+
+async def test_a_stream_closed_during_the_probe_releases_it(client_settings):
+    backend = HangingBackend()
+    llm = LLMClient(backend)
+    for _ in range(3):
+        with pytest.raises(LLMTimeoutError):
+            await llm.generate("prompt", "op", timeout=0.01)
+    await asyncio.sleep(0.06)
+
+    stream = llm.stream("prompt", "op", timeout=5)
+    assert await stream.__anext__() == "{"
+    assert llm.breaker.state == HALF_OPEN
+    await stream.aclose()  # The client went away
+    assert llm.in_flight == 0
+
+    backend.hang = False
+    assert [chunk async for chunk in llm.stream("prompt", "op", timeout=1)] == ["{", "}"]
+    assert llm.breaker.state == CLOSED
+
+
+async def test_hedged_requests_take_their_own_slot(client_settings, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_AFTER_SECONDS", 0.01)
+    backend = HangingBackend()
+    llm = LLMClient(backend, max_concurrency=2)
+
+    calls = [asyncio.ensure_future(llm.generate(f"prompt {i}", "op", timeout=5)) for i in range(2)]
+    await asyncio.sleep(0.05)
+
+    # Both slots are taken by the first requests; their hedges wait for a slot
+    assert backend.peak == 2 and llm.in_flight == 2
+    for call in calls:
+        call.cancel()
+    await asyncio.gather(*calls, return_exceptions=True)
+    assert llm.in_flight == 0
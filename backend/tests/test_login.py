@@ -0,0 +1,40 @@
+import pytest
+
+from api.v1.endpoints import login
+from core.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def account_limiter(monkeypatch):
+    limiter = RateLimiter(capacity=3, per_minute=0.001)
+    monkeypatch.setattr(login, "login_account_limiter", limiter)
+    return limiter
+
+
+async def _login(client, email, password):
+    return await client.post("/login/access-token", data={"username": email, "password": password})
+
+
+async def test_successful_logins_are_not_limited(client, user, account_limiter):
+    for _ in range(6):
+        assert (await _login(client, user.email, "secret-password")).status_code == 200
+
+
+async def test_failed_logins_lock_the_account(client, user, account_limiter):
+    for _ in range(3):
+        assert (await _login(client, user.email.upper(), "wrong")).status_code == 400
+
+    response = await _login(client, user.email, "secret-password")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+async def test_success_resets_the_failure_count(client, user, account_limiter):
+    for _ in range(2):
+        assert (await _login(client, user.email, "wrong")).status_code == 400
+    assert (await _login(client, user.email, "secret-password")).status_code == 200
+
+    for _ in range(3):
+        assert (await _login(client, user.email, "wrong")).status_code == 400
+    assert (await _login(client, user.email, "wrong")).status_code == 429
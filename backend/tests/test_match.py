@@ -0,0 +1,84 @@
+import json
+from collections import Counter
+
+import pytest
+from sqlalchemy import insert, select
+
+from models.job import Job
+from models.job_term import JobTermStat
+from models.resume import Resume
+from services.embedding_service import job_text
+from services.job_terms import ALL_JOBS
+from services.match_service import get_engine
+
+
+async def _stored_frequencies(db, user_id):
+    result = await db.execute(select(JobTermStat.term, JobTermStat.job_count).where(JobTermStat.user_id == user_id))
+    return {term: count for term, count in result.all() if count}
+
+
+async def _recomputed_frequencies(db, user_id):
+    db.expire_all()
+    jobs = (await db.execute(select(Job).where(Job.user_id == user_id))).scalars().all()
+    counts = Counter()
+    for job in jobs:
+        assert job.skill_terms == dict(get_engine().term_counts(job_text(job)))
+        counts[ALL_JOBS] += 1
+        counts.update(job.skill_terms)
+    return dict(counts)
+
+
+async def test_term_statistics_follow_job_changes(client, db, user, headers):
+    user_id = user.id
+    created = []
+    for title, description in [
+        ("Backend engineer", "Python, Django and PostgreSQL"),
+        ("Data engineer", "Python, Spark, Airflow"),
+        ("Frontend engineer", "React and TypeScript"),
+    ]:
+        response = await client.post("/jobs/", json={"title": title, "company": "Acme", "description": description}, headers=headers)
+        created.append(response.json()["id"])
+    await client.put(f"/jobs/{created[0]}", json={"description": "Golang and Kubernetes"}, headers=headers)
+    await client.put(f"/jobs/{created[1]}", json={"status": "INTERVIEWING"}, headers=headers)
+    await client.delete(f"/jobs/{created[2]}", headers=headers)
+    rows = "\n".join(json.dumps({"title": "ML engineer", "company": "Initech", "description": d})
+                     for d in ("PyTorch and Python", "no skills here"))
+    response = await client.post("/jobs/bulk", content=rows, headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert response.json()["created"] == 2
+
+    assert await _stored_frequencies(db, user_id) == await _recomputed_frequencies(db, user_id)
+
+
+async def test_scores_index_old_jobs_and_match_a_recomputation(client, db, user, headers):
+    user_id = user.id
+    # Jobs saved before term vectors existed have no skill_terms
+    texts = ["Python and Django developer", "Java, Spring Boot, Kubernetes", "Python data engineer, Spark, AWS"]
+    await db.execute(insert(Job), [{"user_id": user_id, "title": "Engineer", "company": "Acme", "description": t} for t in texts])
+    resume = Resume(
+        user_id=user_id, file_path="cv.pdf", filename="cv.pdf", content_type="application/pdf",
+        is_analyzed=True, analysis_status="COMPLETED", raw_text="Jane",
+        parsed_content={"skills": {"technical": ["Python", "Spark"], "tools": ["AWS"]}},
+    )
+    db.add(resume)
+    await db.commit()
+    resume_id = resume.id
+
+    response = await client.get("/jobs/scores", params={"resume_id": resume_id}, headers=headers)
+    assert response.status_code == 200
+    scores = {item["job_id"]: item for item in response.json()}
+
+    assert await _stored_frequencies(db, user_id) == await _recomputed_frequencies(db, user_id)
+    engine = get_engine()
+    jobs = (await db.execute(select(Job).where(Job.user_id == user_id).order_by(Job.id))).scalars().all()
+    job_terms = [engine.term_counts(job_text(job)) for job in jobs]
+    idf = engine.idf(Counter(term for terms in job_terms for term in terms), len(jobs))
+    expected = engine.score([["python", "spark", "aws"]], job_terms, idf)[0]
+    for job, score in zip(jobs, expected):
+        assert scores[job.id]["score"] == pytest.approx(score, abs=1e-4)
+    best = max(scores.values(), key=lambda item: item["score"])
+    assert best["job_id"] == jobs[2].id
+    assert set(best["matched_skills"]) == {"python", "spark", "aws"}
+
+    # Indexed once: a second request finds nothing left to count
+    await client.get("/jobs/scores", params={"resume_id": resume_id}, headers=headers)
+    assert await _stored_frequencies(db, user_id) == await _recomputed_frequencies(db, user_id)
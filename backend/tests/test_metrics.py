@@ -0,0 +1,69 @@
+import re
+
+from core import metrics
+from core.metrics import Histogram, db_query_seconds, http_request_seconds, llm_call_seconds
+from services.llm_client import get_llm_client
+
+
+def sample(text, line_prefix):
+    match = re.search("^" + re.escape(line_prefix) + r" (\S+)$", text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+async def scrape(client):
+    response = await client.get("http://test/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+async def test_requests_are_labelled_by_route_template(client, headers):
+    route = ("GET", "/api/v1/jobs/{id}", "404")
+    before = http_request_seconds.count(*route)
+    selects = db_query_seconds.count("SELECT")
+
+    for job_id in (123456, 654321):
+        assert (await client.get(f"/jobs/{job_id}", headers=headers)).status_code == 404
+    assert (await client.get("/no-such-route")).status_code == 404
+
+    assert http_request_seconds.count(*route) == before + 2
+    assert db_query_seconds.count("SELECT") > selects
+    text = await scrape(client)
+    labels = 'method="GET",route="/api/v1/jobs/{id}",status="404"'
+    assert sample(text, f"http_request_duration_seconds_count{{{labels}}}") == before + 2
+    assert "/jobs/123456" not in text
+    assert 'route="unmatched"' in text
+
+
+async def test_llm_calls_record_latency_and_tokens(client):
+    before = llm_call_seconds.count("tailor_resume", "ok")
+    await get_llm_client().generate("a prompt", "tailor_resume")
+
+    assert llm_call_seconds.count("tailor_resume", "ok") == before + 1
+    text = await scrape(client)
+    assert sample(text, 'llm_tokens_count{operation="tailor_resume",direction="input"}') >= 1
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'a"b')
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="a\\"b",le="0.1"} 2',
+        'test_seconds_bucket{stage="a\\"b",le="1"} 3',
+        'test_seconds_bucket{stage="a\\"b",le="+Inf"} 4',
+        'test_seconds_sum{stage="a\\"b"} 3.65',
+        'test_seconds_count{stage="a\\"b"} 4',
+    ]
+
+
+def test_failing_callbacks_are_left_out_of_the_scrape():
+    def broken():
+        raise RuntimeError("gone")
+
+    registry = metrics.Registry()
+    registry.register(metrics.CallbackMetric("test_broken", "Broken", broken))
+    assert registry.render() == "# HELP test_broken Broken\n# TYPE test_broken gauge\n"
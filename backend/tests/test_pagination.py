@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select, text
+
+from api.pagination import NEXT_CURSOR_HEADER, encode_cursor, paginate
+from models.job import Job
+
+
+async def _add_jobs(db, user, count, created_at):
+    await db.execute(insert(Job), [
+        {"user_id": user.id, "title": f"Job {i}", "company": "Acme", "created_at": created_at}
+        for i in range(count)
+    ])
+    await db.commit()
+
+
+async def _page_all(client, headers, limit, cursor=None):
+    ids = []
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/jobs/", params=params, headers=headers)
+        assert response.status_code == 200
+        ids += [job["id"] for job in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids
+
+
+async def test_pages_across_equal_created_at(client, db, user, headers):
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    await _add_jobs(db, user, 7, now - timedelta(days=1))
+    await _add_jobs(db, user, 7, now)
+
+    ids = await _page_all(client, headers, limit=3)
+
+    result = await db.execute(
+        select(Job.id).where(Job.user_id == user.id).order_by(Job.created_at.desc(), Job.id.desc())
+    )
+    assert ids == list(result.scalars())
+    assert len(ids) == len(set(ids)) == 14
+
+
+async def test_cursor_without_created_at_still_pages(client, db, user, headers):
+    await _add_jobs(db, user, 5, datetime.now(timezone.utc))
+    ids = await _page_all(client, headers, limit=10)
+
+    # Cursors issued before created_at was carried only hold the id
+    assert await _page_all(client, headers, limit=2, cursor=encode_cursor(ids[1])) == ids[2:]
+
+
+async def test_keyset_predicate_seeks_the_listing_index(db, user):
+    query = select(Job).where(Job.user_id == user.id)
+
+    class Headers:
+        headers = {}
+
+    await _add_jobs(db, user, 3, datetime.now(timezone.utc))
+    await paginate(db, query, Job, Headers, limit=1)
+    cursor = Headers.headers[NEXT_CURSOR_HEADER]
+
+    statements = []
+    execute = db.execute
+
+    async def capture(statement, *args, **kwargs):
+        statements.append(statement)
+        return await execute(statement, *args, **kwargs)
+
+    db.execute = capture
+    await paginate(db, query, Job, Headers, cursor=cursor, limit=1)
+    compiled = statements[-1].compile(db.bind, compile_kwargs={"literal_binds": True})
+    plan = (await execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+    detail = " ".join(row[-1] for row in plan)
+    assert "ix_job_user_created" in detail
+    assert "(user_id=? AND created_at<?)" in detail or "(user_id=? AND (created_at,id)<(?,?))" in detail
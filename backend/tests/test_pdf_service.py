@@ -0,0 +1,60 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from benchmarks.corpus import make_pdf
+from core.config import settings
+from services import pdf_service
+
+
+@pytest.fixture(autouse=True)
+def small_pool(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_WORKERS", 1)
+    pdf_service.shutdown_executor()
+    yield
+    pdf_service.shutdown_executor()
+
+
+def _die_once(marker: str) -> int:
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return os.getpid()
+
+
+def _hang(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def test_broken_pool_is_replaced_and_retried(tmp_path):
+    marker = str(tmp_path / "died")
+    broken = pdf_service.get_executor()
+
+    pid = await pdf_service.run_in_pool(_die_once, marker)
+
+    assert os.path.exists(marker) and pid != os.getpid()
+    assert pdf_service.get_executor() is not broken
+
+
+async def test_stuck_parse_times_out_and_frees_the_pool(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_TIMEOUT_SECONDS", 0.5)
+    stuck = pdf_service.get_executor()
+
+    with pytest.raises(pdf_service.PDFTimeoutError):
+        await pdf_service.run_in_pool(_hang, 60)
+
+    # The stuck worker was ended, so the next call doesn't queue behind it
+    assert pdf_service.get_executor() is not stuck
+    assert await asyncio.wait_for(pdf_service.run_in_pool(os.getpid), 5) != os.getpid()
+
+
+async def test_extracts_pages_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PAGES_PER_CHUNK", 1)
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(make_pdf([["Jane Doe"], ["Experience"], ["Python developer"]]))
+
+    text = await pdf_service.extract_text_async(str(path))
+
+    assert [line for line in text.splitlines() if line] == ["Jane Doe", "Experience", "Python developer"]
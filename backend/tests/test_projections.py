@@ -0,0 +1,90 @@
+import re
+from contextlib import contextmanager
+
+from sqlalchemy import event, update
+
+from db.session import engine
+from models.resume import Resume
+
+
+@contextmanager
+def captured_sql():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def _resume(db, user):
+    resume = Resume(
+        user_id=user.id, file_path="unused.pdf", filename="cv.pdf", content_type="application/pdf",
+        raw_text="Jane Doe " * 1000, parsed_content={"skills": {"technical": ["Python"]}},
+        is_analyzed=True, analysis_status="COMPLETED",
+    )
+    db.add(resume)
+    await db.commit()
+    return resume.id
+
+
+def _list_query(statements, table):
+    return next(s for s in statements if s.lstrip().upper().startswith("SELECT") and re.search(rf"FROM {table}\b", s))
+
+
+async def test_resume_list_leaves_out_the_heavy_columns(client, db, user, headers):
+    resume_id = await _resume(db, user)
+
+    with captured_sql() as statements:
+        response = await client.get("/resumes/", headers=headers)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [resume_id]
+    assert "raw_text" not in response.json()[0] and "parsed_content" not in response.json()[0]
+    query = _list_query(statements, "resume")
+    assert "raw_text" not in query and "parsed_content" not in query and "embedding" not in query
+
+
+async def test_job_list_leaves_out_the_description(client, headers):
+    await client.post("/jobs/", headers=headers, json={"title": "Engineer", "company": "Acme", "description": "Long " * 500})
+
+    with captured_sql() as statements:
+        response = await client.get("/jobs/", headers=headers)
+    assert "description" not in response.json()[0]
+    assert "description" not in _list_query(statements, "job")
+
+
+async def test_resume_detail_is_revalidated_with_its_etag(client, db, user, headers):
+    resume_id = await _resume(db, user)
+    url = f"/resumes/{resume_id}"
+
+    response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["parsed_content"] == {"skills": {"technical": ["Python"]}}
+    etag = response.headers["etag"]
+
+    with captured_sql() as statements:
+        cached = await client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    # Answered from the version columns alone
+    assert not any("raw_text" in statement for statement in statements)
+
+    await db.execute(update(Resume).where(Resume.id == resume_id).values(analysis_status="PROCESSING"))
+    await db.commit()
+    changed = await client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+async def test_job_detail_etag_changes_on_update(client, headers):
+    job_id = (await client.post("/jobs/", headers=headers, json={"title": "Engineer", "company": "Acme"})).json()["id"]
+    etag = (await client.get(f"/jobs/{job_id}", headers=headers)).headers["etag"]
+    assert (await client.get(f"/jobs/{job_id}", headers={**headers, "If-None-Match": etag})).status_code == 304
+
+    await client.put(f"/jobs/{job_id}", headers=headers, json={"description": "Now with a description"})
+    response = await client.get(f"/jobs/{job_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["description"] == "Now with a description"
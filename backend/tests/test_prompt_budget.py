@@ -0,0 +1,76 @@
+from services.prompt_budget import (
+    BUDGETS, clean_text, count_tokens, fit_resume, fit_text, split_sections, truncate_to_tokens,
+)
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567
+
+Interests
+{interests}
+
+Experience
+- Built payment APIs in Python and PostgreSQL at Acme
+- Led the migration to Kubernetes
+
+Education
+BSc Computer Science, State University
+
+Skills
+Python, SQL, Kubernetes, Terraform
+"""
+
+
+def resume(interest_lines=1):
+    return RESUME.format(interests="\n".join(f"Hiking and chess, reading {i}" for i in range(interest_lines)))
+
+
+def test_count_tokens_counts_words_punctuation_and_long_words():
+    assert count_tokens("") == 0
+    assert count_tokens("Hello, world!") == 4
+    assert count_tokens("internationalization") == 1 + (20 - 1) // 6
+
+
+def test_clean_text_drops_pdf_noise():
+    text = "Jane Doe\n• Built APIs(cid:3)\nPage 1 of 2\n\x0cJane Doe\n\n\n\n▪  Led   teams\n2"
+    assert clean_text(text) == "Jane Doe\n- Built APIs\n\n- Led teams"
+
+
+def test_sections_split_on_known_headings():
+    assert [s.name for s in split_sections(clean_text(resume()))] == [
+        "header", "interests", "experience", "education", "skills",
+    ]
+
+
+def test_a_resume_within_budget_is_only_cleaned():
+    text = resume()
+    assert fit_resume(text, "tailor_resume") == clean_text(text)
+
+
+def test_low_priority_sections_go_first_and_order_is_kept():
+    text = resume(interest_lines=200)
+    fitted = fit_resume(text, "tailor_resume", budget=80)
+
+    assert count_tokens(fitted) <= 80
+    for kept in ("Jane Doe", "Built payment APIs", "BSc Computer Science", "Terraform"):
+        assert kept in fitted
+    # Interests are cut to what's left; the sections keep their original order
+    assert fitted.count("Hiking") < 200
+    assert fitted.index("Experience") < fitted.index("Education") < fitted.index("Skills")
+
+
+def test_focus_ranks_unlisted_sections_by_overlap():
+    text = "Jane Doe\n\nInterests\nchess chess chess\n\nPublications\nkubernetes scheduling paper"
+    fitted = fit_resume(text, "tailor_resume", budget=12, focus="Kubernetes platform engineer")
+    assert "kubernetes scheduling" in fitted and "chess" not in fitted
+
+
+def test_truncation_keeps_whole_lines_or_words():
+    assert truncate_to_tokens("one two\nthree four\nfive six seven", 6) == "one two\nthree four"
+    assert truncate_to_tokens("one two three four five", 3) == "one two three"
+    assert truncate_to_tokens("anything", 0) == ""
+
+
+def test_fit_text_uses_the_operation_budget():
+    description = "word " * 5000
+    fitted = fit_text(description, "tailor_resume", "job_description")
+    assert count_tokens(fitted) == BUDGETS["tailor_resume"]["job_description"]
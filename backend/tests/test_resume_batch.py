@@ -0,0 +1,107 @@
+import io
+import uuid
+import zipfile
+
+from sqlalchemy import update
+
+from core.config import settings
+from models.resume import Resume
+from services import resume_batch
+from services.resume_batch import BatchItem
+from services.storage import save_bytes
+
+
+async def test_batch_enqueues_only_new_files(db, user, monkeypatch):
+    queued = []
+
+    async def enqueue(resume_id):
+        queued.append(resume_id)
+
+    monkeypatch.setattr(resume_batch, "enqueue_resume_analysis", enqueue)
+
+    known = save_bytes(b"%PDF-1.4 known resume", "uploads")
+    db.add(Resume(
+        user_id=user.id, file_path=known.path, filename="known.pdf", content_type="application/pdf",
+        content_hash=known.sha256, raw_text="Jane Doe", is_analyzed=True, analysis_status="COMPLETED",
+    ))
+    await db.commit()
+
+    items = [
+        BatchItem("new-1.pdf", save_bytes(b"%PDF-1.4 first new resume", "uploads")),
+        BatchItem("known.pdf", known),
+        BatchItem("new-2.pdf", save_bytes(b"%PDF-1.4 second new resume", "uploads")),
+        BatchItem("broken.zip", error="not a zip file"),
+    ]
+    result = await resume_batch.create_batch(db, user.id, items)
+
+    assert result["total"] == 3
+    assert result["errors"] == [{"filename": "broken.zip", "error": "not a zip file"}]
+    rows = {resume.id: resume for resume in [await db.get(Resume, resume_id) for resume_id in result["resume_ids"]]}
+    assert sorted(queued) == sorted(i for i, resume in rows.items() if not resume.is_analyzed)
+    assert {rows[i].filename for i in queued} == {"new-1.pdf", "new-2.pdf"}
+    reused = next(resume for resume in rows.values() if resume.filename == "known.pdf")
+    assert reused.is_analyzed and reused.raw_text == "Jane Doe"
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def _batch_files(count):
+    return [("files", (f"cv-{i}.pdf", f"%PDF-1.4 candidate {uuid.uuid4().hex}".encode(), "application/pdf")) for i in range(count)]
+
+
+async def test_batch_upload_reports_progress(client, db, headers, monkeypatch):
+    queued = []
+
+    async def enqueue(resume_id):
+        queued.append(resume_id)
+
+    monkeypatch.setattr(resume_batch, "enqueue_resume_analysis", enqueue)
+    archive = _zip({
+        "folder/a.pdf": f"%PDF-1.4 a {uuid.uuid4().hex}",
+        "folder/b.PDF": f"%PDF-1.4 b {uuid.uuid4().hex}",
+        "folder/notes.txt": "skipped",
+        "__MACOSX/folder/._a.pdf": "skipped",
+    })
+    files = _batch_files(2) + [
+        ("files", ("folder.zip", archive, "application/zip")),
+        ("files", ("cv.docx", b"not a pdf", "application/octet-stream")),
+        ("files", ("broken.zip", b"not a zip", "application/zip")),
+    ]
+
+    response = await client.post("/resumes/batch", headers=headers, files=files)
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["total"] == 4 and sorted(queued) == sorted(batch["resume_ids"])
+    assert {error["filename"] for error in batch["errors"]} == {"cv.docx", "broken.zip"}
+
+    url = f"/resumes/batches/{batch['batch_id']}"
+    progress = (await client.get(url, headers=headers)).json()
+    assert (progress["pending"], progress["completed"], progress["done"]) == (4, 0, False)
+
+    first, second, *rest = batch["resume_ids"]
+    await db.execute(update(Resume).where(Resume.id.in_(rest)).values(analysis_status="COMPLETED", is_analyzed=True))
+    await db.execute(update(Resume).where(Resume.id == first).values(analysis_status="PROCESSING"))
+    await db.execute(update(Resume).where(Resume.id == second).values(analysis_status="FAILED"))
+    await db.commit()
+    progress = (await client.get(url, headers=headers)).json()
+    assert (progress["processing"], progress["completed"], progress["failed"], progress["done"]) == (1, 2, 1, False)
+
+    await db.execute(update(Resume).where(Resume.id == first).values(analysis_status="COMPLETED"))
+    await db.commit()
+    assert (await client.get(url, headers=headers)).json()["done"] is True
+    assert (await client.get("/resumes/batches/unknown", headers=headers)).status_code == 404
+
+
+async def test_batch_limits(client, headers, monkeypatch):
+    monkeypatch.setattr(resume_batch.store_files, "__defaults__", (2, settings.UPLOAD_MAX_BYTES))
+    response = await client.post("/resumes/batch", headers=headers, files=_batch_files(3))
+    assert response.status_code == 413
+
+    response = await client.post("/resumes/batch", headers=headers, files=[("files", ("cv.docx", b"x", "text/plain"))])
+    assert response.status_code == 400
@@ -0,0 +1,40 @@
+import pytest
+
+from models.resume import Resume
+
+ENDPOINTS = [
+    ("/resumes/tailor", {"job_description": "Backend engineer, Python"}),
+    ("/resumes/tailor/stream", {"job_description": "Backend engineer, Python"}),
+    ("/resumes/cold-email", {"recipient_name": "Sam", "company_name": "Acme", "job_title": "Engineer"}),
+    ("/resumes/cold-email/stream", {"recipient_name": "Sam", "company_name": "Acme", "job_title": "Engineer"}),
+]
+
+
+async def _resume(db, user, analyzed):
+    resume = Resume(
+        user_id=user.id, file_path="unused.pdf", filename="cv.pdf", content_type="application/pdf",
+        raw_text="Jane Doe, Python developer" if analyzed else None, is_analyzed=analyzed,
+        analysis_status="COMPLETED" if analyzed else "PENDING",
+    )
+    db.add(resume)
+    await db.commit()
+    return resume.id
+
+
+@pytest.mark.parametrize("path,body", ENDPOINTS)
+async def test_generation_waits_for_analysis(client, db, user, headers, path, body):
+    resume_id = await _resume(db, user, analyzed=False)
+    response = await client.post(path, json={"resume_id": resume_id, **body}, headers=headers)
+    assert response.status_code == 409
+
+
+@pytest.mark.parametrize("path,body", ENDPOINTS)
+async def test_generation_from_analyzed_resume(client, db, user, headers, path, body):
+    resume_id = await _resume(db, user, analyzed=True)
+    response = await client.post(path, json={"resume_id": resume_id, **body}, headers=headers)
+    assert response.status_code == 200
+
+
+async def test_generation_for_unknown_resume(client, headers):
+    response = await client.post("/resumes/tailor", json={"resume_id": 10**9, **ENDPOINTS[0][1]}, headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,72 @@
+from api.pagination import NEXT_CURSOR_HEADER
+from models.resume import Resume
+from models.user import User
+
+
+async def _job(client, headers, title, description, company="Acme"):
+    response = await client.post("/jobs/", json={"title": title, "company": company, "description": description}, headers=headers)
+    return response.json()["id"]
+
+
+async def test_search_ranks_highlights_and_stays_within_the_user(client, db, user, headers):
+    other = User(email=f"search-other-{user.id}@example.com", hashed_password="x", is_active=True)
+    db.add(other)
+    await db.flush()
+    db.add(Resume(
+        user_id=other.id, file_path="x.pdf", filename="kubernetes.pdf", content_type="application/pdf",
+        raw_text="Kubernetes operator", is_analyzed=True, analysis_status="COMPLETED",
+    ))
+    db.add(Resume(
+        user_id=user.id, file_path="cv.pdf", filename="cv.pdf", content_type="application/pdf",
+        raw_text="Ran Kubernetes clusters for five years", is_analyzed=True, analysis_status="COMPLETED",
+    ))
+    await db.commit()
+    in_title = await _job(client, headers, "Kubernetes engineer", "Operate clusters")
+    in_body = await _job(client, headers, "Platform engineer", "Some kubernetes experience")
+    await _job(client, headers, "Designer", "Figma")
+
+    response = await client.get("/search", params={"q": "kubernetes"}, headers=headers)
+
+    assert response.status_code == 200
+    hits = response.json()
+    assert {(hit["type"], hit["title"]) for hit in hits} == {
+        ("job", "Kubernetes engineer"), ("job", "Platform engineer"), ("resume", "cv.pdf"),
+    }
+    jobs = [hit["id"] for hit in hits if hit["type"] == "job"]
+    assert jobs == [in_title, in_body] # Title matches weigh more
+    by_id = {hit["id"]: hit for hit in hits if hit["type"] == "job"}
+    assert by_id[in_title]["title_highlight"] == "<mark>Kubernetes</mark> engineer"
+    assert "<mark>kubernetes</mark>" in by_id[in_body]["snippet"]
+
+
+async def test_search_follows_edits_stems_and_prefixes(client, headers):
+    job_id = await _job(client, headers, "Engineer", "Running Postgres databases")
+    assert len((await client.get("/search", params={"q": "run", "type": "job"}, headers=headers)).json()) == 1
+    assert len((await client.get("/search", params={"q": "postg", "type": "job"}, headers=headers)).json()) == 0
+    assert len((await client.get("/search", params={"q": "pos", "type": "job"}, headers=headers)).json()) == 1
+
+    await client.put(f"/jobs/{job_id}", json={"description": "Writing Rust services"}, headers=headers)
+    assert (await client.get("/search", params={"q": "postgres"}, headers=headers)).json() == []
+    assert len((await client.get("/search", params={"q": "rust"}, headers=headers)).json()) == 1
+
+    await client.delete(f"/jobs/{job_id}", headers=headers)
+    assert (await client.get("/search", params={"q": "rust"}, headers=headers)).json() == []
+
+
+async def test_search_pages_with_a_cursor_and_ignores_query_syntax(client, headers):
+    for i in range(5):
+        await _job(client, headers, f"Python developer {i}", "Python")
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "python", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/search", params=params, headers=headers)
+        seen += [hit["id"] for hit in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 5
+
+    response = await client.get("/search", params={"q": 'python" OR user_id : *'}, headers=headers)
+    assert response.status_code == 200
+    assert (await client.get("/search", params={"q": "python", "type": "video"}, headers=headers)).status_code == 400
@@ -0,0 +1,145 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services import ai_service, single_flight as single_flight_module
+from services.llm_client import FakeBackend, LLMClient, get_llm_client, set_llm_client
+from services.single_flight import REDIS_PREFIX, SingleFlight
+
+
+async def nothing_cached():
+    return None
+
+
+class Calls:
+    def __init__(self, delay=0.05, error=None):
+        self.delay = delay
+        self.error = error
+        self.count = 0
+
+    async def __call__(self):
+        self.count += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"call": self.count}
+
+
+async def test_identical_concurrent_calls_share_one_call():
+    flights = SingleFlight()
+    call = Calls()
+
+    results = await asyncio.gather(*[flights.run("key", call, nothing_cached) for _ in range(5)])
+
+    assert call.count == 1
+    assert results == [{"call": 1}] * 5
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "shared": 4}
+    # Finished flights aren't reused
+    assert await flights.run("key", call, nothing_cached) == {"call": 2}
+
+
+async def test_different_keys_run_separately():
+    flights = SingleFlight()
+    call = Calls()
+    await asyncio.gather(flights.run("a", call, nothing_cached), flights.run("b", call, nothing_cached))
+    assert call.count == 2
+
+
+async def test_followers_get_the_leaders_error():
+    flights = SingleFlight()
+    call = Calls(error=ValueError("bad output"))
+
+    results = await asyncio.gather(*[flights.run("key", call, nothing_cached) for _ in range(3)], return_exceptions=True)
+
+    assert call.count == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.stats()["in_flight"] == 0
+
+
+async def test_a_follower_takes_over_when_the_leader_is_cancelled():
+    flights = SingleFlight()
+    call = Calls()
+    leader = asyncio.ensure_future(flights.run("key", call, nothing_cached))
+    await asyncio.sleep(0.01)
+    follower = asyncio.ensure_future(flights.run("key", call, nothing_cached))
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    assert await follower == {"call": 2}
+    assert flights.counters["leader_cancelled"] == 1
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+
+async def test_waits_for_another_workers_result(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight_module, "get_redis", lambda: redis)
+    flights = SingleFlight(lock_ttl=5, wait_timeout=1, poll_interval=0.01)
+    call = Calls()
+    redis.values[REDIS_PREFIX + "key"] = "other-worker"
+    cache = {}
+
+    async def lookup():
+        return cache.get("key")
+
+    waiter = asyncio.ensure_future(flights.run("key", call, lookup))
+    await asyncio.sleep(0.05)
+    cache["key"] = {"call": "remote"}
+
+    assert await waiter == {"call": "remote"}
+    assert call.count == 0
+    assert flights.counters["remote_shared"] == 1
+    assert redis.values == {REDIS_PREFIX + "key": "other-worker"}
+
+
+async def test_runs_anyway_when_the_other_worker_takes_too_long(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight_module, "get_redis", lambda: redis)
+    flights = SingleFlight(lock_ttl=5, wait_timeout=0.05, poll_interval=0.01)
+    redis.values[REDIS_PREFIX + "key"] = "other-worker"
+
+    assert await flights.run("key", Calls(delay=0), nothing_cached) == {"call": 1}
+    assert flights.counters["remote_wait_timeouts"] == 1
+
+
+async def test_releases_its_own_lock(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(single_flight_module, "get_redis", lambda: redis)
+    flights = SingleFlight()
+
+    await flights.run("key", Calls(delay=0), nothing_cached)
+    assert redis.values == {}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+async def test_duplicate_generate_requests_make_one_llm_call(stream):
+    set_llm_client(LLMClient(FakeBackend(latency_ms=50)))
+    job_title = f"Engineer {uuid.uuid4().hex}"
+    prompt = f"questions for {job_title}"
+
+    async def request():
+        if not stream:
+            return await ai_service.generate_json("generate_interview_questions", prompt, [job_title, ""])
+        events = [event async for event in ai_service.stream_json("generate_interview_questions", prompt, [job_title, ""])]
+        return events[-1][1]
+
+    results = await asyncio.gather(*[request() for _ in range(4)])
+
+    assert get_llm_client().usage["generate_interview_questions"]["calls"] == 1
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from services.llm_client import FAKE_RESPONSES, FakeBackend, LLMClient, LLMTimeoutError, get_llm_client, set_llm_client
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def evaluate_stream(client, headers, answer):
+    response = await client.post("/interviews/evaluate/stream", headers=headers, json={"question": "Why us?", "answer": answer})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    return parse_events(response.text)
+
+
+async def test_tokens_then_the_parsed_result(client, headers):
+    events = await evaluate_stream(client, headers, f"Because {uuid.uuid4().hex}")
+
+    names = [name for name, _ in events]
+    assert names[-1] == "result" and set(names[:-1]) == {"token"} and len(names) > 2
+    text = "".join(data["text"] for name, data in events if name == "token")
+    assert json.loads(text)["score"] == events[-1][1]["score"] == 75
+    assert events[-1][1]["suggested_improvement"]
+
+
+async def test_a_cached_result_is_sent_without_tokens(client, headers):
+    answer = f"Because {uuid.uuid4().hex}"
+    await evaluate_stream(client, headers, answer)
+    events = await evaluate_stream(client, headers, answer)
+    assert [name for name, _ in events] == ["result"]
+    assert get_llm_client().usage["evaluate_interview_answer"]["calls"] == 1
+
+
+async def test_streaming_requires_authentication(client):
+    response = await client.post("/interviews/evaluate/stream", json={"question": "Why us?", "answer": "Because"})
+    assert response.status_code == 401
+
+
+class FailingBackend(FakeBackend):
+    async def stream(self, prompt, operation, json_mode=False, chunk_size=16):
+        yield '{"feedback": '
+        raise RuntimeError("connection reset")
+
+
+async def test_failures_after_the_first_token_end_with_an_error_event(client, headers):
+    set_llm_client(LLMClient(FailingBackend()))
+    events = await evaluate_stream(client, headers, f"Because {uuid.uuid4().hex}")
+    assert events == [("token", {"text": '{"feedback": '}), ("error", {"detail": "connection reset"})]
+
+
+async def test_unparseable_output_is_an_error_event(client, headers, monkeypatch):
+    monkeypatch.setitem(FAKE_RESPONSES, "evaluate_interview_answer", {"feedback": "no score"})
+    events = await evaluate_stream(client, headers, f"Because {uuid.uuid4().hex}")
+    assert events[-1][0] == "error" and "expected format" in events[-1][1]["detail"]
+
+
+class StalledBackend(FakeBackend):
+    def __init__(self):
+        super().__init__()
+        self.closed = asyncio.Event()
+
+    async def stream(self, prompt, operation, json_mode=False, chunk_size=16):
+        try:
+            yield "{"
+            await asyncio.sleep(10)
+        finally:
+            self.closed.set()
+
+
+async def test_the_stream_timeout_bounds_the_whole_stream():
+    backend = StalledBackend()
+    llm = LLMClient(backend, timeout=0.05)
+    chunks = []
+    with pytest.raises(LLMTimeoutError):
+        async for chunk in llm.stream("prompt", "tailor_resume"):
+            chunks.append(chunk)
+    assert chunks == ["{"]
+    assert backend.closed.is_set()
+    assert llm.in_flight == 0
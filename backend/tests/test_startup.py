@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import inspect
+
+from core.config import Settings, settings
+from db.migrations import ensure_migrated
+from db.session import create_engine
+from services import pdf_service, startup
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(startup, "state", startup.StartupState())
+    monkeypatch.setattr(settings, "PDF_WORKERS", 1)
+    yield startup.state
+    pdf_service.shutdown_executor()
+
+
+@pytest.fixture
+async def empty_engine(tmp_path):
+    engine = create_engine("sqlite+aiosqlite:///" + str(tmp_path / "empty.db"))
+    yield engine
+    await engine.dispose()
+
+
+def test_startup_only_checks_migrations_by_default(monkeypatch):
+    monkeypatch.delenv("MIGRATIONS_ON_STARTUP")
+    assert Settings(_env_file=None).MIGRATIONS_ON_STARTUP == "check"
+
+
+async def test_check_mode_leaves_an_old_schema_alone(empty_engine):
+    assert await ensure_migrated(empty_engine, mode="check") == "pending"
+    async with empty_engine.connect() as connection:
+        assert await connection.run_sync(lambda sync: inspect(sync).get_table_names()) == []
+
+
+async def test_ready_fails_while_the_schema_is_behind(client, fresh_state, empty_engine, monkeypatch):
+    monkeypatch.setattr(startup, "engine", empty_engine)
+    await startup.warm_up()
+
+    response = await client.get("http://test/ready")
+    assert response.status_code == 503
+    assert response.json()["migrations"] == "pending"
+
+
+async def test_ready_once_warm_and_at_head(client, fresh_state):
+    response = await client.get("http://test/ready")
+    assert response.status_code == 503
+
+    await startup.warm_up()
+
+    response = await client.get("http://test/ready")
+    assert response.status_code == 200
+    assert response.json()["migrations"] == "up to date"
+    assert set(response.json()["timings"]) >= {"migrations", "llm_client", "embedder", "password_hash", "pdf_workers"}
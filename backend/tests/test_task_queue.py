@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from core.config import settings
+from models.resume import Resume
+from services import ai_service, resume_pipeline, task_queue
+from services.task_queue import LocalTaskQueue
+
+
+class Pipeline:
+    """
+    process_resume with a fake PDF reader, and an analysis that fails the
+    first `analysis_failures` times.
+    """
+
+    def __init__(self, monkeypatch, analysis_failures=0, unreadable=False):
+        self.analysis_failures = analysis_failures
+        self.unreadable = unreadable
+        self.analyses = 0
+        analyze = ai_service.analyze_resume
+
+        async def analyze_resume(text):
+            self.analyses += 1
+            if self.analyses <= self.analysis_failures:
+                return {"error": "upstream 503"}
+            return await analyze(text)
+
+        monkeypatch.setattr(ai_service, "analyze_resume", analyze_resume)
+        monkeypatch.setattr(task_queue, "process_resume", self.process)
+        monkeypatch.setattr(settings, "TASK_RETRY_BACKOFF_SECONDS", 0.01)
+
+    async def extract(self, file_path):
+        if self.unreadable:
+            raise ValueError("no text layer")
+        return "Jane Doe\nExperience\nPython developer"
+
+    async def process(self, resume_id):
+        await resume_pipeline.process_resume(resume_id, extract=self.extract)
+
+
+async def _pending_resume(db, user):
+    resume = Resume(
+        user_id=user.id, file_path="cv.pdf", filename="cv.pdf", content_type="application/pdf",
+        is_analyzed=False, analysis_status="PENDING",
+    )
+    db.add(resume)
+    await db.commit()
+    return resume.id
+
+
+async def _wait_for(client, headers, resume_id, statuses=("COMPLETED", "FAILED")):
+    for _ in range(200):
+        status = (await client.get(f"/resumes/{resume_id}/status", headers=headers)).json()
+        if status["analysis_status"] in statuses:
+            return status
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"resume {resume_id} stuck in {status['analysis_status']}")
+
+
+@pytest.fixture
+async def queue():
+    queue = LocalTaskQueue(workers=2, max_retries=2)
+    yield queue
+    await queue.stop(grace=0)
+
+
+async def test_analysis_completes_in_the_background(client, db, user, headers, queue, monkeypatch):
+    Pipeline(monkeypatch)
+    resume_id = await _pending_resume(db, user)
+
+    await queue.enqueue(resume_id)
+    status = await _wait_for(client, headers, resume_id)
+
+    assert status == {
+        "id": resume_id, "is_analyzed": True, "analysis_status": "COMPLETED",
+        "analysis_attempts": 1, "analysis_error": None,
+    }
+    detail = (await client.get(f"/resumes/{resume_id}", headers=headers)).json()
+    assert detail["raw_text"].startswith("Jane Doe") and detail["parsed_content"]["personal_info"]
+
+
+async def test_transient_failures_are_retried(client, db, user, headers, queue, monkeypatch):
+    pipeline = Pipeline(monkeypatch, analysis_failures=2)
+    resume_id = await _pending_resume(db, user)
+
+    await queue.enqueue(resume_id)
+    status = await _wait_for(client, headers, resume_id)
+
+    assert status["analysis_status"] == "COMPLETED" and status["analysis_attempts"] == 3
+    assert pipeline.analyses == 3 and not queue.dead_letters
+
+
+async def test_exhausted_retries_are_dead_lettered(client, db, user, headers, queue, monkeypatch):
+    Pipeline(monkeypatch, analysis_failures=10)
+    resume_id = await _pending_resume(db, user)
+
+    await queue.enqueue(resume_id)
+    status = await _wait_for(client, headers, resume_id, ("FAILED",))
+
+    assert status["analysis_attempts"] == 3 and status["analysis_error"] == "upstream 503"
+    assert [(d["resume_id"], d["attempts"]) for d in queue.dead_letters] == [(resume_id, 3)]
+
+
+async def test_unreadable_pdfs_fail_without_retries_and_can_be_requeued(client, db, user, headers, queue, monkeypatch):
+    pipeline = Pipeline(monkeypatch, unreadable=True)
+    monkeypatch.setattr(task_queue, "local_queue", queue)
+    resume_id = await _pending_resume(db, user)
+
+    await queue.enqueue(resume_id)
+    status = await _wait_for(client, headers, resume_id, ("FAILED",))
+    assert status["analysis_attempts"] == 1 and "no text layer" in status["analysis_error"]
+    assert len(queue.dead_letters) == 1
+
+    pipeline.unreadable = False
+    response = await client.post(f"/resumes/{resume_id}/reanalyze", headers=headers)
+    assert response.status_code == 200 and response.json()["analysis_status"] == "PENDING"
+    status = await _wait_for(client, headers, resume_id)
+    assert status["analysis_status"] == "COMPLETED"
+    assert (await client.post(f"/resumes/{resume_id}/reanalyze", headers=headers)).status_code == 409
+
+
+async def test_unfinished_analyses_are_requeued_after_a_restart(client, db, user, headers, queue, monkeypatch):
+    Pipeline(monkeypatch)
+    monkeypatch.setattr(task_queue, "local_queue", queue)
+    resume_id = await _pending_resume(db, user)
+    # A restart dropped it mid-analysis
+    resume = await db.get(Resume, resume_id)
+    resume.analysis_status = "PROCESSING"
+    await db.commit()
+
+    assert await task_queue.requeue_unfinished() >= 1
+    status = await _wait_for(client, headers, resume_id)
+    assert status["analysis_status"] == "COMPLETED"
+
+
+async def test_stopping_cancels_pending_retries(db, user, queue, monkeypatch):
+    pipeline = Pipeline(monkeypatch, analysis_failures=10)
+    monkeypatch.setattr(settings, "TASK_RETRY_BACKOFF_SECONDS", 0.2)
+    resume_id = await _pending_resume(db, user)
+
+    await queue.enqueue(resume_id)
+    for _ in range(100):
+        if queue._retries:
+            break
+        await asyncio.sleep(0.01)
+    assert queue._retries
+
+    await queue.stop(grace=0)
+    await asyncio.sleep(0.3)
+    # The retry did not restart the queue after shutdown
+    assert not queue._retries and not queue._tasks and pipeline.analyses == 1
@@ -0,0 +1,73 @@
+import hashlib
+import os
+
+from core.config import settings
+from models.resume import Resume
+
+PDF = b"%PDF-1.4\n" + b"resume body " * 1000
+
+
+def _multipart(filename: str, content: bytes, boundary: str = "test-boundary") -> bytes:
+    return (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="note"\r\n\r\n'
+        "ignored\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+
+
+FORM = {"Content-Type": "multipart/form-data; boundary=test-boundary"}
+
+
+async def test_upload_is_stored_by_content_hash(client, db, user, monkeypatch, headers):
+    queued = []
+
+    async def enqueue(resume_id):
+        queued.append(resume_id)
+
+    monkeypatch.setattr("api.v1.endpoints.resumes.enqueue_resume_analysis", enqueue)
+
+    response = await client.post("/resumes/upload", files={"file": ("cv.pdf", PDF, "application/pdf")}, headers=headers)
+
+    assert response.status_code == 200
+    resume = await db.get(Resume, response.json()["id"])
+    sha256 = hashlib.sha256(PDF).hexdigest()
+    assert resume.content_hash == sha256 and resume.filename == "cv.pdf"
+    assert os.path.basename(resume.file_path) == sha256 + ".pdf"
+    with open(resume.file_path, "rb") as stored:
+        assert stored.read() == PDF
+    assert queued == [resume.id]
+    assert not [name for name in os.listdir(os.path.dirname(os.path.dirname(resume.file_path))) if name.endswith(".part")]
+
+
+async def test_upload_skips_other_fields(client, headers):
+    response = await client.post("/resumes/upload", content=_multipart("cv.pdf", PDF), headers={**headers, **FORM})
+    assert response.status_code == 200
+    assert response.json()["filename"] == "cv.pdf"
+
+
+async def test_oversized_upload_refused_from_content_length(client, headers):
+    body = _multipart("big.pdf", b"x" * (settings.UPLOAD_MAX_BYTES + 1))
+    response = await client.post("/resumes/upload", content=body, headers={**headers, **FORM})
+    assert response.status_code == 413
+
+
+async def test_oversized_upload_refused_while_streaming(client, headers):
+    body = _multipart("big.pdf", b"x" * (settings.UPLOAD_MAX_BYTES + 1))
+
+    async def chunks():
+        # No Content-Length: the body is sent chunked
+        for start in range(0, len(body), 64 * 1024):
+            yield body[start:start + 64 * 1024]
+
+    response = await client.post("/resumes/upload", content=chunks(), headers={**headers, **FORM})
+    assert response.status_code == 413
+
+
+async def test_upload_rejects_non_pdf_and_missing_file(client, headers):
+    response = await client.post("/resumes/upload", content=_multipart("cv.docx", b"PK"), headers={**headers, **FORM})
+    assert response.status_code == 400
+    response = await client.post("/resumes/upload", data={"note": "no file"}, files={}, headers=headers)
+    assert response.status_code == 400
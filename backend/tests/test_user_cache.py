@@ -0,0 +1,81 @@
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import text
+
+from api import deps
+from core import security
+from services import user_cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.deleted = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.deleted.append(key)
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(user_cache, "get_redis", lambda: fake)
+    user_cache._users.clear()
+    yield fake
+    user_cache._users.clear()
+
+
+async def _login(client, email, password):
+    return await client.post("/login/access-token", data={"username": email, "password": password})
+
+
+async def test_profile_update_reads_the_user_fresh_and_clears_both_tiers(client, db, user, headers, redis):
+    user_id, email = user.id, user.email
+    assert (await client.get("/users/me", headers=headers)).status_code == 200
+    assert f"user:{user_id}" in redis.data
+
+    # Changed behind the cache's back (e.g. by another service)
+    await db.execute(text("UPDATE user SET full_name = 'Jane Q' WHERE id = :id"), {"id": user_id})
+    await db.commit()
+
+    response = await client.put("/users/me", json={"password": "new-password"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Jane Q"
+    assert redis.deleted == [f"user:{user_id}"] and user_cache._users.get(user_id) is None
+    assert (await _login(client, email, "secret-password")).status_code == 400
+    assert (await _login(client, email, "new-password")).status_code == 200
+
+
+async def test_login_rehashes_outdated_hashes(client, db, user, redis, monkeypatch):
+    user_id, email = user.id, user.email
+    weaker = CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=8 * 1024, argon2__parallelism=1)
+    old_hash = weaker.hash("secret-password")
+    await db.execute(text("UPDATE user SET hashed_password = :hash WHERE id = :id"), {"hash": old_hash, "id": user_id})
+    await db.commit()
+
+    assert (await _login(client, email, "secret-password")).status_code == 200
+
+    (stored,) = (await db.execute(text("SELECT hashed_password FROM user WHERE id = :id"), {"id": user_id})).one()
+    assert stored != old_hash and not security.pwd_context.needs_update(stored)
+    assert security.verify_password("secret-password", stored)
+    assert redis.deleted == [f"user:{user_id}"]
+
+
+async def test_credential_endpoints_get_the_password_hash(db, user, redis):
+    user_id = user.id
+    await user_cache.get_user(db, user_id) # Populates the cache
+    db.expunge_all()
+    cached = await user_cache.get_user(db, user_id)
+    assert "hashed_password" not in cached.__dict__
+
+    fresh = await deps.get_current_active_user_from_db(db, cached)
+
+    assert security.verify_password("secret-password", fresh.hashed_password)
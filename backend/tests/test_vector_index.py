@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from core.config import settings
+from models.job import Job
+from models.user import User
+from services.embedding_service import embed_missing_jobs
+from services.vector_index import invalidate_job_index, search_jobs
+
+
+def _vector(*head):
+    return list(head) + [0.0] * (settings.EMBEDDING_DIM - len(head))
+
+
+async def test_search_returns_only_the_users_jobs_best_first(db, user):
+    other = User(email=f"other-{user.id}@example.com", hashed_password="x", is_active=True)
+    db.add(other)
+    await db.flush()
+    await db.execute(insert(Job), [
+        {"user_id": user.id, "title": "near", "company": "A", "embedding": _vector(1.0, 0.1)},
+        {"user_id": user.id, "title": "far", "company": "A", "embedding": _vector(0.0, 1.0)},
+        {"user_id": user.id, "title": "middle", "company": "A", "embedding": _vector(1.0, 1.0)},
+        {"user_id": user.id, "title": "unembedded", "company": "A"},
+        {"user_id": other.id, "title": "exact", "company": "B", "embedding": _vector(1.0)},
+    ])
+    await db.commit()
+    invalidate_job_index(user.id)
+
+    hits = await search_jobs(db, user.id, _vector(1.0), k=2)
+
+    assert [job.title for job, _ in hits] == ["near", "middle"]
+    assert hits[0][1] > hits[1][1]
+
+
+async def test_newly_embedded_jobs_rebuild_the_cached_index(db, user):
+    user_id = user.id
+    await db.execute(insert(Job), [{"user_id": user_id, "title": "Python developer", "company": "A"}])
+    await db.commit()
+    invalidate_job_index(user_id)
+    assert await search_jobs(db, user_id, _vector(1.0), k=5) == []
+
+    # Embedding leaves updated_at alone, yet the cached index must not go stale
+    assert await embed_missing_jobs(db, user_id) == 1
+    await db.commit()
+    assert [job.title for job, _ in await search_jobs(db, user_id, _vector(1.0), k=5)] == ["Python developer"]
+
+
+async def test_match_limits_are_bounded(client, headers):
+    for url in ("/jobs/match?resume_id=1&limit=0", "/jobs/match?resume_id=1&limit=1000", "/jobs/scores?resume_id=1&limit=100000"):
+        assert (await client.get(url, headers=headers)).status_code == 422
+
+
+async def test_postgres_scans_the_users_rows_exactly():
+    statements = []
+
+    async def execute(statement):
+        statements.append(statement)
+        return SimpleNamespace(all=lambda: [])
+
+    session = SimpleNamespace(bind=SimpleNamespace(dialect=SimpleNamespace(name="postgresql")), execute=execute)
+    assert await search_jobs(session, 7, _vector(1.0), k=5) == []
+
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    cte, _, outer = sql.partition(")\n SELECT")
+    # Distances come from a materialized scan of the user's rows, never from a vector index
+    assert "AS MATERIALIZED" in cte and "job.user_id =" in cte and "<=>" in cte
+    assert "<=>" not in outer
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+import worker
+from db.session import async_session
+from models.resume import Resume
+
+
+@pytest.fixture
+def worker_process(monkeypatch):
+    loops = []
+
+    async def extract(file_path):
+        loops.append(asyncio.get_running_loop())
+        return f"Jane Doe, Python developer ({file_path})"
+
+    monkeypatch.setattr(worker, "_extract_in_process", extract)
+    worker._init_worker_process()
+    yield loops
+    worker._shutdown_worker_process()
+
+
+async def _pending_resumes(user, count):
+    async with async_session() as db:
+        resumes = [
+            Resume(user_id=user.id, file_path=f"cv-{i}.pdf", filename=f"cv-{i}.pdf",
+                   content_type="application/pdf", is_analyzed=False, analysis_status="PENDING")
+            for i in range(count)
+        ]
+        db.add_all(resumes)
+        await db.commit()
+        return [resume.id for resume in resumes]
+
+
+async def _statuses(ids):
+    async with async_session() as db:
+        return [(await db.get(Resume, resume_id)).analysis_status for resume_id in ids]
+
+
+def test_tasks_share_one_event_loop(user, worker_process):
+    ids = worker.run(_pending_resumes(user, 3))
+    for resume_id in ids:
+        worker.analyze_resume_task.apply(args=[resume_id], throw=True)
+
+    loops = worker_process
+    assert len(loops) == 3 and loops[0] is loops[1] is loops[2]
+    assert not loops[0].is_closed()
+    # The pooled connections the first task opened are still usable afterwards
+    assert worker.run(_statuses(ids)) == ["COMPLETED"] * 3
@@ -0,0 +1,88 @@
+"""
+Celery worker for background tasks.
+
+Run with: celery -A worker worker --loglevel=info
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Optional
+
+from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
+
+import db.base  # noqa: register all models
+from core.config import settings
+from core.redis import close_redis
+from db.session import engine
+from services import pdf_service
+from services.resume_pipeline import PermanentTaskError, mark_failed, process_resume
+from services.task_queue import retry_delay
+
+DEAD_LETTER_KEY = "tasks:dead_letter"
+
+celery_app = Celery("career", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+celery_app.conf.update(
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_serializer="json",
+)
+
+
+# One event loop per worker process, kept for its lifetime: the engine pool,
+# the Redis client and the LLM client's semaphore and channels are bound to
+# the loop they were first used on, and are shared by every task.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run(coro: Awaitable[Any]) -> Any:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs) -> None:
+    # Forked from the parent: never reuse connections it may have pooled
+    engine.sync_engine.dispose(close=False)
+
+
+async def _close_clients() -> None:
+    await engine.dispose()
+    await close_redis()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**kwargs) -> None:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        return
+    run(_close_clients())
+    _loop.close()
+    _loop = None
+
+
+async def _extract_in_process(file_path: str) -> str:
+    # Prefork pool children are daemonic and cannot start a process pool;
+    # the worker process itself is the unit of parallelism here.
+    return pdf_service.extract_text_from_pdf(file_path)
+
+
+@celery_app.task(bind=True, name="resumes.analyze", max_retries=settings.TASK_MAX_RETRIES)
+def analyze_resume_task(self, resume_id: int) -> None:
+    try:
+        run(process_resume(resume_id, extract=_extract_in_process))
+    except Exception as e:
+        final = isinstance(e, PermanentTaskError) or self.request.retries >= self.max_retries
+        run(mark_failed(resume_id, str(e), final=final))
+        if final:
+            celery_app.backend.client.lpush(DEAD_LETTER_KEY, json.dumps({
+                "resume_id": resume_id,
+                "error": str(e),
+                "attempts": self.request.retries + 1,
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+            }))
+            raise
+        raise self.retry(exc=e, countdown=retry_delay(self.request.retries))
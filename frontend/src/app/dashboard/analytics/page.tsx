@@ -8,37 +8,40 @@ import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContaine
 
 export default function AnalyticsPage() {
     const { isAuthenticated } = useAuthStore()
-    const [jobs, setJobs] = useState<any[]>([])
+    const [stats, setStats] = useState<any>(null)
     const [loading, setLoading] = useState(true)
 
     useEffect(() => {
         if (!isAuthenticated) return
-        fetchJobs()
+        fetchStats()
     }, [isAuthenticated])
 
-    const fetchJobs = async () => {
+    const fetchStats = async () => {
         try {
-            const response = await api.get("/jobs/")
-            setJobs(response.data)
+            // Aggregated server-side; no need to download every job
+            const response = await api.get("/jobs/stats")
+            setStats(response.data)
         } catch (error) {
-            console.error("Failed to fetch jobs", error)
+            console.error("Failed to fetch job stats", error)
         } finally {
             setLoading(false)
         }
     }
 
-    // Calculations
-    const totalApplications = jobs.length
-    const interviews = jobs.filter(j => j.status === "INTERVIEWING").length
-    const offers = jobs.filter(j => j.status === "OFFER").length
-    const activeApplications = jobs.filter(j => ["APPLIED", "INTERVIEWING"].includes(j.status)).length
+    const countFor = (status: string) =>
+        stats?.by_status.find((s: any) => s.status === status)?.count ?? 0
+
+    const totalApplications = stats?.total ?? 0
+    const interviews = countFor("INTERVIEWING")
+    const offers = countFor("OFFER")
+    const activeApplications = countFor("APPLIED") + countFor("INTERVIEWING")
 
     const statusData = [
-        { name: "Saved", value: jobs.filter(j => j.status === "SAVED").length },
-        { name: "Applied", value: jobs.filter(j => j.status === "APPLIED").length },
-        { name: "Interview", value: jobs.filter(j => j.status === "INTERVIEWING").length },
-        { name: "Offer", value: jobs.filter(j => j.status === "OFFER").length },
-        { name: "Rejected", value: jobs.filter(j => j.status === "REJECTED").length },
+        { name: "Saved", value: countFor("SAVED") },
+        { name: "Applied", value: countFor("APPLIED") },
+        { name: "Interview", value: countFor("INTERVIEWING") },
+        { name: "Offer", value: countFor("OFFER") },
+        { name: "Rejected", value: countFor("REJECTED") },
     ]
 
     const COLORS = ["#94a3b8", "#3b82f6", "#8b5cf6", "#22c55e", "#ef4444"]
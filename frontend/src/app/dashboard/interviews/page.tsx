@@ -16,14 +16,21 @@ export default function InterviewsPage() {
     const [jobDescription, setJobDescription] = useState("")
     const [isStarted, setIsStarted] = useState(false)
     const [isLoading, setIsLoading] = useState(false)
+    const [sessionId, setSessionId] = useState<number | null>(null)
     const [questions, setQuestions] = useState<string[]>([])
     const [currentQuestionIndex, setCurrentQuestionIndex] = useState(0)
 
-    const [answer, setAnswer] = useState("")
-    const [feedback, setFeedback] = useState<any>(null)
+    const [answers, setAnswers] = useState<string[]>([])
+    const [evaluations, setEvaluations] = useState<any[] | null>(null)
+    const [overallScore, setOverallScore] = useState<number | null>(null)
     const [isEvaluating, setIsEvaluating] = useState(false)
 
-    // Generate Questions
+    const answer = answers[currentQuestionIndex] || ""
+    const setAnswer = (value: string) => {
+        setAnswers(prev => prev.map((a, i) => (i === currentQuestionIndex ? value : a)))
+    }
+
+    // Create a session (generates and stores the questions)
     const startInterview = async () => {
         if (!jobTitle) {
             toast.error("Please enter a job title")
@@ -31,11 +38,15 @@ export default function InterviewsPage() {
         }
         setIsLoading(true)
         try {
-            const res = await api.post("/interviews/generate", {
+            const res = await api.post("/interviews/sessions", {
                 job_title: jobTitle,
                 job_description: jobDescription
             })
-            setQuestions(res.data)
+            setSessionId(res.data.id)
+            setQuestions(res.data.questions)
+            setAnswers(res.data.questions.map(() => ""))
+            setEvaluations(null)
+            setOverallScore(null)
             setIsStarted(true)
             setCurrentQuestionIndex(0)
         } catch (error) {
@@ -46,20 +57,21 @@ export default function InterviewsPage() {
         }
     }
 
-    // Submit Answer
-    const submitAnswer = async () => {
-        if (!answer.trim()) return
+    // Evaluate every answer in one request at the end of the session
+    const finishInterview = async () => {
+        if (!sessionId) return
 
         setIsEvaluating(true)
         try {
-            const res = await api.post("/interviews/evaluate", {
-                question: questions[currentQuestionIndex],
-                answer: answer
-            })
-            setFeedback(res.data)
+            const res = await api.post(`/interviews/sessions/${sessionId}/evaluate`, {
+                answers: answers.map((a, i) => ({ question_index: i, answer: a }))
+            }, { timeout: 120000 })
+            setEvaluations(res.data.evaluations)
+            setOverallScore(res.data.overall_score)
+            toast.success("Interview Completed!")
         } catch (error) {
             console.error(error)
-            toast.error("Failed to evaluate answer")
+            toast.error("Failed to evaluate answers")
         } finally {
             setIsEvaluating(false)
         }
@@ -67,18 +79,22 @@ export default function InterviewsPage() {
 
     // Next Question
     const nextQuestion = () => {
-        setAnswer("")
-        setFeedback(null)
         if (currentQuestionIndex < questions.length - 1) {
             setCurrentQuestionIndex(prev => prev + 1)
         } else {
-            // End Interview
-            setIsStarted(false)
-            setQuestions([])
-            toast.success("Interview Completed!")
+            finishInterview()
         }
     }
 
+    const endSession = () => {
+        setIsStarted(false)
+        setSessionId(null)
+        setQuestions([])
+        setAnswers([])
+        setEvaluations(null)
+        setOverallScore(null)
+    }
+
     return (
         <div className="min-h-screen bg-background p-8">
             <div className="max-w-4xl mx-auto">
@@ -126,73 +142,106 @@ export default function InterviewsPage() {
                         {/* Progress */}
                         <div className="flex items-center justify-between text-sm text-muted-foreground">
                             <span>Question {currentQuestionIndex + 1} of {questions.length}</span>
-                            <Button variant="ghost" size="sm" onClick={() => setIsStarted(false)} className="text-destructive">
+                            <Button variant="ghost" size="sm" onClick={endSession} className="text-destructive">
                                 End Session
                             </Button>
                         </div>
 
-                        {/* Question Card */}
-                        <Card className="border-primary/20 bg-primary/5">
-                            <CardContent className="pt-6">
-                                <h2 className="text-xl font-medium text-foreground">
-                                    {questions[currentQuestionIndex]}
-                                </h2>
-                            </CardContent>
-                        </Card>
-
-                        {/* Answer Section */}
-                        <Card>
-                            <CardContent className="pt-6 space-y-4">
-                                <div className="space-y-2">
-                                    <Label>Your Answer</Label>
-                                    <div className="relative">
-                                        <textarea
-                                            className="flex min-h-[120px] w-full rounded-md border border-input bg-background px-3 py-2 text-sm ring-offset-background placeholder:text-muted-foreground focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-ring focus-visible:ring-offset-2 disabled:cursor-not-allowed disabled:opacity-50"
-                                            placeholder="Type your answer here..."
-                                            value={answer}
-                                            onChange={(e) => setAnswer(e.target.value)}
-                                            disabled={!!feedback}
-                                        />
-                                    </div>
-                                </div>
-
-                                {!feedback ? (
-                                    <div className="flex justify-end">
-                                        <Button onClick={submitAnswer} disabled={isEvaluating || !answer}>
-                                            {isEvaluating ? "Analyzing..." : (
-                                                <>
-                                                    Submit Answer <Send className="ml-2 h-4 w-4" />
-                                                </>
-                                            )}
-                                        </Button>
-                                    </div>
-                                ) : (
-                                    /* Feedback Display */
-                                    <div className="mt-6 space-y-4 bg-muted/50 p-4 rounded-lg">
-                                        <div className="flex items-center justify-between">
-                                            <h3 className="font-semibold text-foreground">AI Feedback</h3>
-                                            <Badge variant={feedback.score >= 70 ? "default" : "destructive"}>
-                                                Score: {feedback.score}/100
+                        {evaluations ? (
+                            /* Results */
+                            <div className="space-y-4">
+                                <Card className="border-primary/20 bg-primary/5">
+                                    <CardContent className="pt-6 flex items-center justify-between">
+                                        <h2 className="text-xl font-medium text-foreground">Session Results</h2>
+                                        {overallScore !== null && (
+                                            <Badge variant={overallScore >= 70 ? "default" : "destructive"}>
+                                                Overall: {overallScore}/100
                                             </Badge>
-                                        </div>
-                                        <p className="text-sm text-foreground">{feedback.feedback}</p>
+                                        )}
+                                    </CardContent>
+                                </Card>
+                                {questions.map((question, i) => {
+                                    const feedback = evaluations[i]
+                                    return (
+                                        <Card key={i}>
+                                            <CardContent className="pt-6 space-y-3">
+                                                <div className="flex items-start justify-between gap-4">
+                                                    <h3 className="font-medium text-foreground">{question}</h3>
+                                                    {feedback && (
+                                                        <Badge variant={feedback.score >= 70 ? "default" : "destructive"}>
+                                                            {feedback.score}/100
+                                                        </Badge>
+                                                    )}
+                                                </div>
+                                                <p className="text-sm text-muted-foreground whitespace-pre-wrap">{answers[i] || "No answer"}</p>
+                                                {feedback && (
+                                                    <div className="space-y-2 bg-muted/50 p-4 rounded-lg">
+                                                        <p className="text-sm text-foreground">{feedback.feedback}</p>
+                                                        {feedback.suggested_improvement && (
+                                                            <div className="pt-2 border-t border-border">
+                                                                <p className="text-xs font-semibold text-muted-foreground mb-1">SUGGESTION</p>
+                                                                <p className="text-sm text-foreground italic">"{feedback.suggested_improvement}"</p>
+                                                            </div>
+                                                        )}
+                                                    </div>
+                                                )}
+                                            </CardContent>
+                                        </Card>
+                                    )
+                                })}
+                                <div className="flex justify-end">
+                                    <Button onClick={endSession}>New Session</Button>
+                                </div>
+                            </div>
+                        ) : (
+                            <>
+                                {/* Question Card */}
+                                <Card className="border-primary/20 bg-primary/5">
+                                    <CardContent className="pt-6">
+                                        <h2 className="text-xl font-medium text-foreground">
+                                            {questions[currentQuestionIndex]}
+                                        </h2>
+                                    </CardContent>
+                                </Card>
 
-                                        {feedback.suggested_improvement && (
-                                            <div className="pt-2 border-t border-border">
-                                                <p className="text-xs font-semibold text-muted-foreground mb-1">SUGGESTION</p>
-                                                <p className="text-sm text-foreground italic">"{feedback.suggested_improvement}"</p>
+                                {/* Answer Section */}
+                                <Card>
+                                    <CardContent className="pt-6 space-y-4">
+                                        <div className="space-y-2">
+                                            <Label>Your Answer</Label>
+                                            <div className="relative">
+                                                <textarea
+                                                    className="flex min-h-[120px] w-full rounded-md border border-input bg-background px-3 py-2 text-sm ring-offset-background placeholder:text-muted-foreground focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-ring focus-visible:ring-offset-2 disabled:cursor-not-allowed disabled:opacity-50"
+                                                    placeholder="Type your answer here..."
+                                                    value={answer}
+                                                    onChange={(e) => setAnswer(e.target.value)}
+                                                    disabled={isEvaluating}
+                                                />
                                             </div>
-                                        )}
+                                        </div>
 
-                                        <div className="flex justify-end pt-2">
-                                            <Button onClick={nextQuestion}>
-                                                {currentQuestionIndex < questions.length - 1 ? "Next Question" : "Finish Interview"}
+                                        <div className="flex justify-between">
+                                            <Button
+                                                variant="ghost"
+                                                onClick={() => setCurrentQuestionIndex(prev => prev - 1)}
+                                                disabled={currentQuestionIndex === 0 || isEvaluating}
+                                            >
+                                                Previous
+                                            </Button>
+                                            <Button onClick={nextQuestion} disabled={isEvaluating || !answer}>
+                                                {isEvaluating ? "Analyzing..." : currentQuestionIndex < questions.length - 1 ? (
+                                                    "Next Question"
+                                                ) : (
+                                                    <>
+                                                        Finish Interview <Send className="ml-2 h-4 w-4" />
+                                                    </>
+                                                )}
                                             </Button>
                                         </div>
-                                    </div>
-                                )}
-                            </CardContent>
-                        </Card>
+                                    </CardContent>
+                                </Card>
+                            </>
+                        )}
                     </div>
                 )}
             </div>
@@ -32,20 +32,22 @@ export default function DashboardPage() {
 
         const fetchData = async () => {
             try {
-                const [resumesRes, jobsRes] = await Promise.all([
+                const [resumesRes, jobsRes, statsRes] = await Promise.all([
                     api.get("/resumes/"),
-                    api.get("/jobs/"),
+                    api.get("/jobs/", { params: { limit: 5 } }),
+                    api.get("/jobs/stats"),
                 ])
 
-                const jobs = jobsRes.data
+                const countFor = (status: string) =>
+                    statsRes.data.by_status.find((s: any) => s.status === status)?.count ?? 0
                 setStats({
                     resumes: resumesRes.data.length,
-                    applications: jobs.length,
-                    interviews: jobs.filter((j: any) => j.status === "INTERVIEWING").length,
-                    offers: jobs.filter((j: any) => j.status === "OFFER").length,
+                    applications: statsRes.data.total,
+                    interviews: countFor("INTERVIEWING"),
+                    offers: countFor("OFFER"),
                     loading: false
                 })
-                setRecentApplications(jobs.slice(0, 5))
+                setRecentApplications(jobsRes.data)
             } catch (error) {
                 console.error("Failed to fetch data", error)
                 setStats(prev => ({ ...prev, loading: false }))
@@ -146,6 +146,7 @@ export default function ResumesPage() {
 function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void }) {
     const [showMenu, setShowMenu] = useState(false)
     const [showAnalysis, setShowAnalysis] = useState(false)
+    const [details, setDetails] = useState<any>(null)
 
     const handleDelete = async () => {
         if (!confirm("Are you sure you want to delete this resume?")) return
@@ -158,16 +159,24 @@ function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void })
         }
     }
 
-    // Debug: Log resume data
-    console.log("Resume data:", resume)
+    // The list only has summaries - load text and analysis when opened
+    const openAnalysis = async () => {
+        setShowAnalysis(true)
+        if (details) return
+        try {
+            const response = await api.get(`/resumes/${resume.id}`)
+            setDetails(response.data)
+        } catch (error) {
+            console.error("Failed to load resume details", error)
+        }
+    }
 
-    // Handle different possible structures for parsed_content
-    const parsedContent = typeof resume.parsed_content === 'string'
-        ? JSON.parse(resume.parsed_content)
-        : (resume.parsed_content || {})
+    const fullResume = details || resume
 
-    console.log("Parsed content:", parsedContent)
-    console.log("Raw text available:", !!resume.raw_text)
+    // Handle different possible structures for parsed_content
+    const parsedContent = typeof fullResume.parsed_content === 'string'
+        ? JSON.parse(fullResume.parsed_content)
+        : (fullResume.parsed_content || {})
 
     return (
         <>
@@ -192,7 +201,7 @@ function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void })
                             {showMenu && (
                                 <div className="absolute right-0 mt-2 w-48 bg-popover rounded-lg shadow-xl border border-border py-1 z-10 transform transition-all">
                                     <button
-                                        onClick={() => { setShowAnalysis(true); setShowMenu(false); }}
+                                        onClick={() => { openAnalysis(); setShowMenu(false); }}
                                         className="w-full px-4 py-2 text-left text-sm text-foreground hover:bg-muted hover:text-foreground transition-colors flex items-center gap-2"
                                     >
                                         <Eye className="h-4 w-4" />
@@ -230,8 +239,14 @@ function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void })
                                 </div>
                             </>
                         )}
+                        {!parsedContent.personal_info?.name && resume.analysis_status && (
+                            <div className="flex items-center justify-between p-3 bg-muted/50 rounded-lg hover:bg-muted transition-colors">
+                                <span className="text-xs font-medium text-muted-foreground">Analysis</span>
+                                <span className="text-sm font-semibold text-foreground">{resume.analysis_status}</span>
+                            </div>
+                        )}
                         <Button
-                            onClick={() => setShowAnalysis(true)}
+                            onClick={openAnalysis}
                             variant="outline"
                             className="w-full border-border hover:bg-muted transition-all hover:shadow-sm"
                         >
@@ -260,9 +275,9 @@ function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void })
                                 <p className="font-mono">Debug Info:</p>
                                 <p className="font-mono">- Resume ID: {resume.id}</p>
                                 <p className="font-mono">- Filename: {resume.filename}</p>
-                                <p className="font-mono">- Has raw_text: {resume.raw_text ? 'Yes' : 'No'}</p>
-                                <p className="font-mono">- Has parsed_content: {resume.parsed_content ? 'Yes' : 'No'}</p>
-                                <p className="font-mono">- Parsed content type: {typeof resume.parsed_content}</p>
+                                <p className="font-mono">- Has raw_text: {fullResume.raw_text ? 'Yes' : 'No'}</p>
+                                <p className="font-mono">- Has parsed_content: {fullResume.parsed_content ? 'Yes' : 'No'}</p>
+                                <p className="font-mono">- Parsed content type: {typeof fullResume.parsed_content}</p>
                             </div>
 
                             {/* Note if AI analysis unavailable - show first */}
@@ -378,19 +393,19 @@ function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void })
                             )}
 
                             {/* Raw text - always show if available */}
-                            {resume.raw_text && resume.raw_text.length > 0 && (
+                            {fullResume.raw_text && fullResume.raw_text.length > 0 && (
                                 <div>
                                     <h3 className="text-lg font-semibold text-foreground mb-3">Extracted Text</h3>
                                     <div className="p-4 bg-muted/50 rounded-lg max-h-96 overflow-y-auto border border-border">
                                         <pre className="text-xs text-muted-foreground whitespace-pre-wrap font-mono">
-                                            {resume.raw_text}
+                                            {fullResume.raw_text}
                                         </pre>
                                     </div>
                                 </div>
                             )}
 
                             {/* Show raw JSON if nothing else works */}
-                            {!resume.raw_text && resume.parsed_content && (
+                            {!fullResume.raw_text && fullResume.parsed_content && (
                                 <div>
                                     <h3 className="text-lg font-semibold text-foreground mb-3">Resume Data (JSON)</h3>
                                     <div className="p-4 bg-muted/50 rounded-lg max-h-96 overflow-y-auto border border-border">
@@ -402,7 +417,7 @@ function ResumeCard({ resume, onDelete }: { resume: any; onDelete: () => void })
                             )}
 
                             {/* Fallback if truly no data */}
-                            {!resume.raw_text && !resume.parsed_content && (
+                            {!fullResume.raw_text && !fullResume.parsed_content && (
                                 <div className="p-8 text-center">
                                     <p className="text-muted-foreground mb-2">No resume data available</p>
                                     <p className="text-xs text-muted-foreground">The resume may not have been processed correctly.</p>
@@ -57,6 +57,18 @@ export function ResumeUpload({ onSuccess, onUploadComplete }: ResumeUploadProps)
             })
 
             console.log("Upload successful:", response.data)
+
+            // Analysis runs in the background - wait for it to finish
+            let status = response.data.analysis_status
+            while (status === "PENDING" || status === "PROCESSING" || status === "RETRYING") {
+                await new Promise((resolve) => setTimeout(resolve, 1500))
+                const statusResponse = await api.get(`/resumes/${response.data.id}/status`)
+                status = statusResponse.data.analysis_status
+                if (status === "FAILED") {
+                    throw new Error(statusResponse.data.analysis_error || "Resume analysis failed")
+                }
+            }
+
             setSuccess(true)
             setTimeout(() => {
                 if (onSuccess) onSuccess()